@@ -0,0 +1,79 @@
+import sys
+from pathlib import Path
+from typing import Optional
+
+import click
+from loguru import logger
+
+from src.browser_pool import create_chrome_driver
+from src.browser_profile import BROWSER_PROFILES, get_browser_profile
+from src.contact_form_automator import ContactFormAutomator
+from src.fill_strategies import FILL_STRATEGIES, get_fill_strategy
+from src.fixture_farm import FixtureFarm, build_corpus
+from src.form_benchmark import find_regressions, load_baseline, run_benchmark, save_report
+
+
+@click.command()
+@click.option('--sites', type=int, default=None, help="Number of generated sites (default: 3 of every kind).")
+@click.option('--seed', type=int, default=0, show_default=True, help="Corpus seed; keep it fixed to compare runs.")
+@click.option('--profile', 'profile_name', type=click.Choice(list(BROWSER_PROFILES)), default='performance', show_default=True)
+@click.option('--fill-strategy', type=click.Choice(list(FILL_STRATEGIES)), default='in_page', show_default=True)
+@click.option('--baseline', type=click.Path(dir_okay=False, path_type=Path), default=Path('output/benchmark_baseline.json'),
+              show_default=True, help="Report to compare against; the run fails on regressions.")
+@click.option('--save-baseline', is_flag=True, help="Store this run's report as the new baseline.")
+@click.option('--tolerance', type=float, default=0.15, show_default=True,
+              help="Allowed relative drop in throughput / rise in p90 latency.")
+@click.option('--output', type=click.Path(dir_okay=False, path_type=Path), default=Path('output/benchmark_report.json'),
+              show_default=True)
+def main(sites: Optional[int], seed: int, profile_name: str, fill_strategy: str, baseline: Path, save_baseline: bool,
+         tolerance: float, output: Path):
+    """
+    End-to-end benchmark of ContactFormAutomator against a local fixture farm of
+    generated contact pages (WPCF7, Gravity Forms, custom, asterisk-required,
+    country selects, JS-rendered forms, CAPTCHA and CAPTCHA decoys).
+    """
+    profile = get_browser_profile(profile_name)
+    farm = FixtureFarm(build_corpus(sites, seed)).start()
+    driver = create_chrome_driver(profile_name)
+    try:
+        automator = ContactFormAutomator(
+            driver, fill_strategy=get_fill_strategy(fill_strategy),
+            wait_policy_config={'min_ready_state': 'interactive'} if profile['page_load_strategy'] == 'eager' else None,
+            collect_page_metrics=profile['block_resources'], defer_captchas=True
+        )
+        report = run_benchmark(farm, automator)
+    finally:
+        driver.quit()
+        farm.stop()
+
+    report['config'] = {'sites': report['sites'], 'seed': seed, 'profile': profile_name, 'fill_strategy': fill_strategy}
+    save_report(report, output)
+    logger.info(f"{report['sites']} sites in {report['wall_seconds']}s -> {report['sites_per_hour']} sites/hour")
+    logger.info(f"Latency p50/p90/p99 per site: {report['latency']['total']}")
+    logger.info(f"Accuracy: {report['accuracy']}")
+    for row in report['results']:
+        if not (row['form_type_ok'] and row['outcome_ok'] and row['fields_ok']):
+            logger.warning(f"  {row['site']} ({row['kind']}): {row['outcome']}, wrong fields {row['field_errors']}, "
+                           f"{row['error'] or ''}")
+
+    if save_baseline:
+        save_report(report, baseline)
+        logger.info(f"Baseline saved to {baseline}")
+        return
+
+    reference = load_baseline(baseline)
+    if reference is None:
+        logger.info(f"No baseline at {baseline}; run with --save-baseline to create one")
+        return
+    if reference.get('config') != report['config']:
+        logger.warning(f"Baseline was recorded with {reference.get('config')}; comparing anyway")
+    regressions = find_regressions(report, reference, tolerance)
+    for regression in regressions:
+        logger.error(f"Regression: {regression}")
+    if regressions:
+        sys.exit(1)
+    logger.info("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
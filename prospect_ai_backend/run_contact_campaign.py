@@ -4,18 +4,28 @@ import sys
 import yaml
 import click
 import jsonschema
+from functools import partial
 from pathlib import Path
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+from typing import Optional
 from selenium.common.exceptions import WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
 from src.contact_form_manager import ContactFormManager
 from src.contact_form_bot_facade import ContactFormBotFacade
+from src.fill_strategies import FILL_STRATEGIES
+from src.browser_profile import BROWSER_PROFILES
+from src.browser_pool import BrowserPool, create_chrome_driver
+from src.captcha_queue import ManualCaptchaSolver
+from src.target_source import check_targets_file
 # from src.llm.llm_manager import GPTAnswerer  # Adapted from original
 from src.llm.llm_manager import B2BMessagePersonalizer  # Adapted for B2B
 from loguru import logger
 
+# Top-level config keys that apply to the whole campaign run
+CAMPAIGN_LEVEL_KEYS = ('delay_between_submissions', 'max_submissions_per_hour', 'max_retries', 'user_agent')
+
+# selenium: one WebDriver per worker thread; playwright: asyncio pages in one Chromium
+BROWSER_BACKENDS = ('selenium', 'playwright')
+
+
 class ConfigError(Exception):
     pass
 
@@ -55,7 +65,6 @@ class ConfigValidator:
         nested_required_keys = {
             'name': str,  # Nested under 'contact_campaign'
             'email': str,
-            'websites': list,
             'llm_model_type': str,
             'llm_model': str,
             'llm_api_key': str,
@@ -80,8 +89,31 @@ class ConfigValidator:
         if not ConfigValidator.validate_email(contact_params['email']):
             raise ConfigError(f"Invalid email in config file {config_yaml_path}")
         
-        if not all(isinstance(site, str) for site in contact_params['websites']):
+        # Targets: an inline 'websites' list and/or a 'targets_file' (CSV, JSONL or txt).
+        # The file is only checked here; its rows are read and validated as the campaign streams them.
+        websites = contact_params.get('websites')
+        targets_file = contact_params.get('targets_file')
+        if websites is None and not targets_file:
+            raise ConfigError(f"Missing 'websites' or 'targets_file' under 'contact_campaign' in config file {config_yaml_path}")
+        if websites is not None and (not isinstance(websites, list) or not all(isinstance(site, str) for site in websites)):
             raise ConfigError(f"'websites' must be a list of strings in config file {config_yaml_path}")
+        if targets_file:
+            try:
+                check_targets_file(Path(targets_file))
+            except ValueError as e:
+                raise ConfigError(f"{e} (config file {config_yaml_path})")
+        
+        fill_strategy = contact_params.get('fill_strategy')
+        if fill_strategy is not None and fill_strategy not in FILL_STRATEGIES:
+            raise ConfigError(f"'fill_strategy' must be one of {list(FILL_STRATEGIES)} in config file {config_yaml_path}")
+        
+        browser_profile = contact_params.get('browser_profile')
+        if browser_profile is not None and browser_profile not in BROWSER_PROFILES:
+            raise ConfigError(f"'browser_profile' must be one of {list(BROWSER_PROFILES)} in config file {config_yaml_path}")
+        
+        browser_backend = contact_params.get('browser_backend')
+        if browser_backend is not None and browser_backend not in BROWSER_BACKENDS:
+            raise ConfigError(f"'browser_backend' must be one of {list(BROWSER_BACKENDS)} in config file {config_yaml_path}")
         
         if 'contact_us' not in contact_params['form_types'] or 'request_quote' not in contact_params['form_types']:
             raise ConfigError(f"'form_types' must include 'contact_us' and 'request_quote' in config file {config_yaml_path}")
@@ -108,26 +140,17 @@ class FileManager:
             raise FileNotFoundError(f"Config file not found: {config_path}")
         return config_path
 
-def setup_chrome_driver():
-    """Setup Chrome WebDriver (adapted from original init_browser)"""
-    chrome_options = Options()
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36")
+def setup_chrome_driver(profile_name: Optional[str] = None, profile_options: Optional[dict] = None,
+                        user_agent: Optional[str] = None):
+    """Setup Chrome WebDriver (adapted from original init_browser) with the given browser profile.
+    The chromedriver path is resolved once and cached on disk."""
+    return create_chrome_driver(profile_name, profile_options, user_agent)
 
-   
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-    return driver
 
-
-def setup_and_run_campaign(config: dict, scrape_only: bool):
+def setup_and_run_campaign(config: dict, scrape_only: bool, resolve_captchas: bool = False):
     """Initializes components and runs the specified campaign."""
     driver = None
+    browser_pool = None
     try:
         output_dir = Path(config['outputFileDirectory'])
         output_dir.mkdir(exist_ok=True)
@@ -140,14 +163,39 @@ def setup_and_run_campaign(config: dict, scrape_only: bool):
         message_personalizer = B2BMessagePersonalizer(config['contact_campaign'], llm_api_key)
         logger.info("B2B message personalizer initialized")
 
-        driver = setup_chrome_driver()
-        logger.info("Chrome WebDriver initialized")
+        contact_params = config['contact_campaign']
+        browser_options = contact_params.get('browser_options') or {}
+        if resolve_captchas:
+            # An operator solves the parked CAPTCHAs, so the browser has to be visible
+            browser_options = {**browser_options, 'headless': False}
+        driver_factory = partial(setup_chrome_driver, contact_params.get('browser_profile'),
+                                 browser_options, config.get('user_agent'))
+        # The playwright backend launches its own browser; CAPTCHA solving always uses Selenium
+        use_webdriver = resolve_captchas or contact_params.get('browser_backend', 'selenium') == 'selenium'
+        # Worker sessions start in the background while the first browser and the LLM come up
+        max_workers = int(contact_params.get('max_workers', 1) or 1)
+        if use_webdriver and max_workers > 1 and not resolve_captchas:
+            browser_pool = BrowserPool(driver_factory, size=max_workers - 1)
+        if use_webdriver:
+            driver = driver_factory()
+            logger.info(f"Chrome WebDriver initialized (browser profile: {contact_params.get('browser_profile') or 'standard'})")
+
+        # Campaign-wide pacing lives at the top level of the config; the manager reads it
+        # alongside the contact_campaign section
+        campaign_params = {key: config[key] for key in CAMPAIGN_LEVEL_KEYS if key in config}
+        campaign_params.update(config['contact_campaign'])
 
         facade = ContactFormBotFacade(driver)
-        facade.set_parameters(config['contact_campaign'], output_dir)
+        facade.set_parameters(campaign_params, output_dir)
         facade.set_gpt_answerer(message_personalizer)
-
-        if scrape_only:
+        facade.set_driver_factory(driver_factory)
+        if browser_pool:
+            facade.set_browser_pool(browser_pool)
+
+        if resolve_captchas:
+            timeout = (contact_params.get('captcha') or {}).get('manual_timeout', 300)
+            facade.resolve_deferred_captchas(ManualCaptchaSolver(timeout=timeout))
+        elif scrape_only:
             logger.info("Running in scrape-only mode. Data will be collected but not submitted.")
             # In the future, you would call a dedicated scraping method here.
             # facade.start_scraping_campaign() 
@@ -158,6 +206,8 @@ def setup_and_run_campaign(config: dict, scrape_only: bool):
         logger.info("Campaign completed successfully.")
     
     finally:
+        if browser_pool:
+            browser_pool.close()
         if driver:
             driver.quit()
             logger.info("Chrome WebDriver closed")
@@ -166,7 +216,8 @@ def setup_and_run_campaign(config: dict, scrape_only: bool):
 @click.command()
 @click.argument('config_path', type=click.Path(exists=True, dir_okay=False, path_type=Path))
 @click.option('--scrape-only', is_flag=True, help="Only collects prospect data without contacting them.")
-def main(config_path: Path, scrape_only: bool):
+@click.option('--resolve-captchas', is_flag=True, help="Revisit sites parked on a CAPTCHA and solve them in a visible browser.")
+def main(config_path: Path, scrape_only: bool, resolve_captchas: bool):
     """
     Runs the ProspectAI Navigator bot to automate B2B outreach campaigns.
 
@@ -175,7 +226,7 @@ def main(config_path: Path, scrape_only: bool):
     try:
         config = ConfigValidator.validate_config(config_path)
         logger.info(f"Loaded and validated configuration from {config_path}")
-        setup_and_run_campaign(config, scrape_only)
+        setup_and_run_campaign(config, scrape_only, resolve_captchas)
 
     except (ConfigError, ValueError, FileNotFoundError) as e:
         logger.error(f"Configuration or setup error: {str(e)}")
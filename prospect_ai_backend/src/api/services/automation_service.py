@@ -1,33 +1,70 @@
 from fastapi import BackgroundTasks
-from typing import Dict, Any
+from pathlib import Path
+from typing import Dict, Any, List
+import json
 import uuid
 import os
 
 from ..schemas.automation import RunCampaignIn, RunResultOut
-from src.captcha_handler import CaptchaHandler
+from src.browser_pool import BrowserPool, get_shared_browser_pool
 from src.contact_form_manager import ContactFormManager
 from .llm_service import LLMService
-from .mcp_client import MCPClient
 
 class AutomationService:
     def __init__(self) -> None:
         self._llm = LLMService()
-        self._captcha = CaptchaHandler()
-        self._mcp = MCPClient(server_url=os.getenv("MCP_SERVER_URL", "http://localhost:8765"))
+        self._output_dir = Path(os.getenv("CONTACT_OUTPUT_DIR", "data_folder/output/contact_submissions"))
+        self._discovery_cache = os.getenv("CONTACT_DISCOVERY_CACHE", "data_folder/output/contact_discovery_cache.json")
+        self._browser_profile = os.getenv("BROWSER_PROFILE", "performance")
+        self._browser_pool_size = int(os.getenv("BROWSER_POOL_SIZE", "2"))
 
     async def enqueue_campaign(self, payload: RunCampaignIn, bg: BackgroundTasks) -> RunResultOut:
         job_id = str(uuid.uuid4())
         bg.add_task(self._run_sync, job_id, payload.dict())
         return RunResultOut(job_id=job_id, status="queued")
 
+    def _browsers(self) -> BrowserPool:
+        # Started on the first job, not per request: get_automation_service() builds a service for every call.
+        # Shared across jobs for the life of the process, so later jobs get an already running browser.
+        return get_shared_browser_pool(self._browser_profile, size=self._browser_pool_size)
+
     def _run_sync(self, job_id: str, data: Dict[str, Any]) -> None:
-        mgr = ContactFormManager(llm_manager=self._llm._mgr, captcha_handler=self._captcha)
-        # Minimal call; adapt to your manager API
-        mgr.run_campaign(
-            targets=[t for t in data["targets"]],
-            message_template=data["message_template"],
-            campaign_id=data.get("campaign_id"),
-        )
+        output_dir = self._output_dir / job_id
+        output_dir.mkdir(parents=True, exist_ok=True)
+        campaign_id = data.get("campaign_id")
+        parameters = {
+            "message": data["message_template"],
+            "targets_file": self._write_targets(data["targets"], output_dir / "targets.jsonl"),
+            # Domain-only targets are resolved to their contact page by the manager
+            "contact_discovery": {"enabled": True, "cache_path": self._discovery_cache},
+            "delay_between_submissions": int(os.getenv("CONTACT_DELAY_SECONDS", "30")),
+            "max_submissions_per_hour": int(os.getenv("MAX_SUBMISSIONS_PER_HOUR", "20")),
+            "browser_profile": self._browser_profile,
+            # Jobs of the same campaign share its progress, so a re-run skips what is done
+            "campaign_state": {"enabled": bool(campaign_id), "campaign_id": campaign_id,
+                               "path": self._output_dir / "campaign_state.sqlite3"},
+        }
+
+        browsers = self._browsers()
+        driver = browsers.acquire()
+        try:
+            mgr = ContactFormManager(driver)
+            mgr.set_parameters(parameters, output_dir)
+            mgr.set_gpt_answerer(self._llm._mgr._personalizer)
+            mgr.set_browser_pool(browsers)
+            mgr.start_contact_campaign()
+        finally:
+            browsers.release(driver)
+
+    @staticmethod
+    def _write_targets(targets: List[Dict[str, Any]], path: Path) -> Path:
+        """Job targets as a JSONL targets file: the contact URL if known, else the bare domain, plus metadata."""
+        with open(path, "w", encoding="utf-8") as f:
+            for t in targets:
+                row = {"website": t.get("contact_url") or t["domain"],
+                       **{k: v for k, v in t.items() if k not in ("contact_url", "domain") and v}}
+                f.write(json.dumps(row) + "\n")
+        return path
 
 def get_automation_service() -> AutomationService:
-    return AutomationService()
\ No newline at end of file
+    return AutomationService()
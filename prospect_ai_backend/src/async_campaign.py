@@ -0,0 +1,371 @@
+import asyncio
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from src.browser_backend import PlaywrightBackend
+from src.browser_profile import DEFAULT_USER_AGENT, ESTIMATED_BYTES, PAGE_METRICS_SCRIPT, blocked_category
+from src.captcha_handler import CAPTCHA_SELECTORS, DETECT_SCRIPT, describe_detection
+from src.captcha_queue import STORAGE_SCRIPT
+from src.page_signals import PAGE_STATE_SCRIPT, classify_page_state, page_verdict, submission_verdict
+from src.phase_timer import PhaseTimer
+from src.site_context import SITE_CONTEXT_SCRIPT, build_site_context, site_context_args
+from src.target_source import metadata_lines
+from src.wait_policy import EVIDENCE_SCRIPT, INSTRUMENT_SCRIPT, STATE_SCRIPT, WaitPolicy
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:  # optional: pip install playwright && playwright install chromium
+    async_playwright = None
+
+# Values are set inside the page (IN_PAGE_FILL_SCRIPT): per-keystroke typing over the
+# protocol would serialize the event loop on one site
+SUPPORTED_FILL_STRATEGIES = ('in_page',)
+
+
+def selenium_cookies(cookies: List[Dict]) -> List[Dict]:
+    """Playwright cookies in the shape WebDriver.add_cookie accepts, for the CAPTCHA queue."""
+    converted = []
+    for cookie in cookies:
+        entry = {key: cookie[key] for key in ('name', 'value', 'domain', 'path', 'httpOnly', 'secure', 'sameSite')
+                 if key in cookie}
+        if cookie.get('expires', -1) > 0:
+            entry['expiry'] = int(cookie['expires'])
+        converted.append(entry)
+    return converted
+
+
+class AsyncContactCampaign:
+    """
+    Submits contact forms on many sites from one asyncio event loop: one Chromium
+    process, an isolated browser context per site and at most `concurrency` sites
+    in flight. While one page waits on the network the loop drives the others.
+
+    Form selection, waits and verdicts are the Selenium path's: `planner` is a
+    ContactFormAutomator (without a driver) whose plan_submission picks form,
+    fields and submit button, and the WaitPolicy predicates decide when to move on.
+    """
+
+    def __init__(self, planner, concurrency: int = 4, profile: Optional[Dict] = None,
+                 wait_policy_config: Optional[Dict] = None, user_agent: Optional[str] = None,
+                 rate_limiter=None, on_result: Optional[Callable[[Dict], None]] = None,
+                 defer_captchas: bool = True, on_start: Optional[Callable[[str], None]] = None,
+                 retry_policy=None, metadata_for: Optional[Callable[[str], Optional[Dict]]] = None):
+        fill_strategy = getattr(planner.fill_strategy, 'name', None)
+        if fill_strategy not in SUPPORTED_FILL_STRATEGIES:
+            raise ValueError(f"The playwright backend cannot use the '{fill_strategy}' fill strategy; "
+                             f"set fill_strategy to one of: {', '.join(SUPPORTED_FILL_STRATEGIES)}")
+        self.planner = planner
+        self.fill_strategy = fill_strategy
+        self.matcher = planner.signal_matcher
+        self.concurrency = max(1, concurrency)
+        self.profile = profile or {'headless': True, 'block_resources': False, 'disable_images': False}
+        self.wait_policy_config = wait_policy_config or {}
+        self.user_agent = user_agent or DEFAULT_USER_AGENT
+        self.rate_limiter = rate_limiter
+        self.on_result = on_result
+        self.on_start = on_start
+        # RetryPolicy: transient failures are retried after a backoff, off the semaphore
+        self.retry_policy = retry_policy
+        # Extra fields of a target's row (company, contact name, ...) for its personalization prompt
+        self.metadata_for = metadata_for or (lambda website_url: None)
+        self.defer_captchas = defer_captchas
+        self.emulate_keystrokes = getattr(planner.fill_strategy, 'emulate_keystrokes', False)
+
+    def run(self, websites: Iterable[str], contact_data: Dict[str, str]) -> int:
+        """Blocking entry point; results go to `on_result` as sites finish, the number of sites is returned."""
+        if async_playwright is None:
+            raise RuntimeError("The playwright browser backend needs `pip install playwright` "
+                               "and `playwright install chromium`")
+        return asyncio.run(self.run_async(websites, contact_data))
+
+    async def run_async(self, websites: Iterable[str], contact_data: Dict[str, str]) -> int:
+        """
+        Websites are pulled one at a time (in a thread: a streamed target list may
+        probe its next chunk) and at most twice `concurrency` sites are alive at once,
+        so sites backing off for a retry leave room for fresh ones. Finished results
+        are not kept here: `on_result` records each one.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        targets = enumerate(websites)
+        processed = 0
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(headless=self.profile['headless'])
+            logger.info(f"Async campaign: {self.concurrency} concurrent pages")
+            tasks = set()
+            try:
+                while True:
+                    target = await asyncio.to_thread(next, targets, None)
+                    if target is None:
+                        break
+                    i, website_url = target
+                    if len(tasks) >= self.concurrency * 2:
+                        done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                        processed += self._reap(done)
+                    tasks.add(asyncio.create_task(self._process(browser, semaphore, i, website_url, contact_data)))
+                if tasks:
+                    done, tasks = await asyncio.wait(tasks)
+                    processed += self._reap(done)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await browser.close()
+        return processed
+
+    @staticmethod
+    def _reap(done) -> int:
+        """Retrieve each finished task's outcome, so a failure (e.g. in on_result) is logged, not lost."""
+        for task in done:
+            try:
+                task.result()
+            except Exception as e:
+                logger.error(f"Site task failed: {type(e).__name__}: {e}")
+        return len(done)
+
+    async def _process(self, browser, semaphore: asyncio.Semaphore, i: int, website_url: str,
+                       contact_data: Dict[str, str]) -> Dict:
+        attempt = 0
+        while True:
+            await self._wait_for_budget(website_url)
+            async with semaphore:
+                result = await self._attempt(browser, i, website_url, contact_data)
+            delay = self.retry_policy.delay_for(result, attempt) if self.retry_policy else None
+            if delay is None:
+                break
+            logger.info(f"🔁 {website_url} failed transiently ({result.get('error')}); "
+                        f"retry {attempt + 1}/{self.retry_policy.max_retries} in {delay:.0f}s")
+            # Back off outside the semaphore, so fresh sites use the slot meanwhile
+            await asyncio.sleep(delay)
+            attempt += 1
+        result['attempts'] = attempt + 1
+        if self.on_result:
+            self.on_result(result)
+        return result
+
+    async def _wait_for_budget(self, website_url: str):
+        """Wait out the domain's budget and most of the global one before a page is opened, off the semaphore."""
+        if not self.rate_limiter:
+            return
+        wait = max(self.rate_limiter.domain_wait(website_url), self.rate_limiter.preparation_wait())
+        if wait > 0:
+            logger.info(f"⏳ {website_url}: waiting {wait:.0f}s for submission budget before loading it")
+            await asyncio.sleep(wait)
+
+    async def _attempt(self, browser, i: int, website_url: str, contact_data: Dict[str, str]) -> Dict:
+        logger.info(f"Processing website {i+1}: {website_url}")
+        if self.on_start:
+            self.on_start(website_url)
+        blocked: Dict[str, int] = {}
+        timer = PhaseTimer()
+        context = await browser.new_context(user_agent=self.user_agent, viewport={'width': 1280, 'height': 900})
+        try:
+            await self._prepare_context(context, blocked)
+            backend = PlaywrightBackend(await context.new_page(), emulate_keystrokes=self.emulate_keystrokes,
+                                        round_trip_hook=timer.note_round_trip)
+            # Each site gets its own copy, so personalization never leaks between sites
+            return await self.submit(backend, context, website_url, dict(contact_data), blocked, timer)
+        except Exception as e:
+            logger.error(f"Unexpected error processing {website_url}: {str(e)}")
+            # Failures after the submit click are caught in submit(), so this one came before it
+            return {'success': False, 'error': str(e), 'website': website_url, 'submission_time': time.time(),
+                    'last_phase': timer.last_phase, 'submit_clicked': False}
+        finally:
+            await context.close()
+
+    async def _prepare_context(self, context, blocked: Dict[str, int]):
+        """Wait instrumentation on every document, plus the profile's resource blocking."""
+        await context.add_init_script(INSTRUMENT_SCRIPT)
+        if not (self.profile.get('block_resources') or self.profile.get('disable_images')):
+            return
+
+        async def route(route):
+            request = route.request
+            category = None
+            if self.profile.get('disable_images') and request.resource_type == 'image':
+                category = 'image'
+            elif self.profile.get('block_resources'):
+                category = blocked_category(request.url)
+                if category == 'other':
+                    category = request.resource_type if request.resource_type in ('media', 'font') else None
+            if category:
+                blocked[category] = blocked.get(category, 0) + 1
+                await route.abort('blockedbyclient')
+            else:
+                await route.continue_()
+
+        await context.route('**/*', route)
+
+    async def submit(self, backend: PlaywrightBackend, context, website_url: str, contact_data: Dict[str, str],
+                     blocked: Optional[Dict[str, int]] = None, timer: Optional[PhaseTimer] = None) -> Dict:
+        """One site: the async counterpart of ContactFormAutomator.submit_contact_form."""
+        policy = WaitPolicy(None, **self.wait_policy_config)
+        timer = timer or PhaseTimer()
+        evidence = None
+        with timer.phase('navigate'):
+            await backend.navigate(website_url)
+            await self._wait(backend, policy, 'navigate', 'settled', policy.is_settled)
+            page_load = await self._page_load(backend, blocked or {})
+
+        with timer.phase('detect'):
+            page = await self._read_page(backend)
+            form_type = self.matcher.form_type(page['signals'])
+            logger.info(f"Detected form type: {form_type}")
+            captcha = None
+            if self.defer_captchas:
+                captcha = describe_detection(await backend.evaluate(DETECT_SCRIPT, list(CAPTCHA_SELECTORS)))
+
+        def finish(outcome: Dict) -> Dict:
+            return {'website': website_url, 'form_type': form_type, 'submission_time': time.time(),
+                    'browser_backend': backend.name, 'fill_strategy': self.fill_strategy,
+                    'wait_times': list(policy.timings), 'total_wait': policy.total_wait(),
+                    'page_load': page_load, 'submission_evidence': evidence,
+                    'phase_timings': timer.breakdown(), 'last_phase': timer.last_phase,
+                    'submit_clicked': False, **outcome}
+
+        if captcha and captcha['blocking']:
+            return finish({'success': False, 'deferred': True, 'captcha': captcha,
+                           'browser_state': await self._browser_state(backend, context),
+                           'error': f"{captcha['kind']} CAPTCHA present, deferred"})
+
+        with timer.phase('personalize'):
+            contact_data['message'] = await self._personalize(backend, page['text'], contact_data.get('message', ''),
+                                                              self.metadata_for(website_url))
+
+        with timer.phase('find_form'):
+            snapshot = await backend.snapshot()
+            plan = self.planner.plan_submission(snapshot, contact_data)
+        if not plan['success']:
+            return finish({'success': False, 'error': plan['error']})
+        if not plan['submit_button']:
+            return finish({'success': False, 'error': 'Submit button not found'})
+
+        with timer.phase('fill'):
+            elements = await backend.resolve(snapshot, list(plan['fields'].values()) + [plan['submit_button']])
+            field_elements, submit_button = elements[:-1], elements[-1]
+            filled_fields = {}
+            for (field_type, record), element in zip(plan['fields'].items(), field_elements):
+                if element is None:
+                    continue
+                try:
+                    await backend.fill(element, contact_data[field_type], field_type, record['tag'])
+                    filled_fields[field_type] = contact_data[field_type]
+                except Exception as e:
+                    logger.warning(f"Error filling {field_type} field: {e}")
+        if not filled_fields:
+            return finish({'success': False, 'error': 'No form fields could be filled'})
+        if submit_button is None:
+            return finish({'success': False, 'error': 'Submit button not found'})
+
+        if self.rate_limiter:
+            with timer.phase('rate_limit'):
+                await self.rate_limiter.acquire_async(website_url)
+        with timer.phase('submit'):
+            baseline = await backend.evaluate(STATE_SCRIPT) or {}
+        try:
+            verdict, evidence = await self._click_and_verify(backend, policy, timer, submit_button, baseline)
+        except Exception as e:
+            logger.error(f"Error after submitting the form on {website_url}: {str(e)}")
+            return finish({'success': False, 'form_data': contact_data, 'error': str(e), 'submit_clicked': True})
+
+        return finish({
+            'success': verdict['success'],
+            'form_data': contact_data,
+            'error': verdict.get('error'),
+            'confirmation_message': verdict.get('confirmation'),
+            'submit_clicked': True
+        })
+
+    async def _click_and_verify(self, backend: PlaywrightBackend, policy: WaitPolicy, timer: PhaseTimer,
+                                submit_button, baseline: Dict) -> Tuple[Dict, Optional[Dict]]:
+        """Click submit and judge the outcome; (verdict, evidence)."""
+        with timer.phase('submit'):
+            await backend.click(submit_button)
+            await self._wait(backend, policy, 'submit', 'submission', policy.submission_condition(baseline))
+
+        with timer.phase('verify'):
+            verdict, evidence = None, None
+            try:
+                evidence = await backend.evaluate(EVIDENCE_SCRIPT, baseline.get('now', 0))
+            except Exception as e:
+                logger.debug(f"Could not read submission evidence: {e}")
+            if evidence:
+                evidence['url_changed'] = evidence['url'] != baseline.get('url')
+                verdict = submission_verdict(evidence, self.matcher)
+                evidence['decided_by'] = verdict['decided_by'] if verdict else None
+            if verdict is None:
+                await self._wait(backend, policy, 'verify', 'settled', policy.is_settled)
+                page = await self._read_page(backend)
+                form_present = self.planner._find_form_element(await backend.snapshot()) is not None
+                verdict = page_verdict(page, lambda: form_present)
+        return verdict, evidence
+
+    async def _wait(self, backend: PlaywrightBackend, policy: WaitPolicy, step: str, condition: str,
+                    predicate: Callable[[Dict], bool]) -> bool:
+        """WaitPolicy._wait with asyncio.sleep between polls, so other pages progress meanwhile."""
+        timeout = policy.timeouts.get(step, max(policy.DEFAULT_TIMEOUTS.values()))
+        started = time.monotonic()
+        met = False
+        while not met:
+            try:
+                met = bool(predicate(await backend.evaluate(STATE_SCRIPT)))
+            except Exception:
+                # Script errors while a new document loads are retried on the next poll
+                pass
+            if met or time.monotonic() - started >= timeout:
+                break
+            await asyncio.sleep(policy.poll_frequency)
+        if not met:
+            logger.debug(f"Wait '{condition}' for step '{step}' timed out after {timeout}s")
+        policy.record(step, condition, round(time.monotonic() - started, 3), timeout, met)
+        return met
+
+    async def _read_page(self, backend: PlaywrightBackend) -> Dict:
+        try:
+            state = await backend.evaluate(PAGE_STATE_SCRIPT) or {}
+        except Exception as e:
+            logger.warning(f"Could not read page text: {e}")
+            state = {}
+        return classify_page_state(state, self.matcher)
+
+    async def _page_load(self, backend: PlaywrightBackend, blocked: Dict[str, int]) -> Dict:
+        """Same fields as PageLoadMetrics.collect; blocked requests are counted by the route handler."""
+        try:
+            metrics = await backend.evaluate(PAGE_METRICS_SCRIPT) or {}
+        except Exception as e:
+            logger.debug(f"Page metrics unavailable: {e}")
+            metrics = {}
+        metrics['page_load_time'] = round((metrics.get('load_event') or metrics.get('dom_content_loaded') or 0) / 1000, 3)
+        metrics['blocked_requests'] = dict(blocked)
+        metrics['estimated_bytes_saved'] = sum(ESTIMATED_BYTES.get(category, 0) * count for category, count in blocked.items())
+        return metrics
+
+    async def _personalize(self, backend: PlaywrightBackend, page_text: str, original_message: str,
+                           target_metadata: Optional[Dict] = None) -> str:
+        gpt_answerer = self.planner.gpt_answerer
+        if not gpt_answerer:
+            return original_message
+        budget = self.planner.context_token_budget
+        try:
+            raw = await backend.evaluate(SITE_CONTEXT_SCRIPT, *site_context_args(budget))
+        except Exception as e:
+            logger.warning(f"Could not extract site context: {e}")
+            raw = None
+        try:
+            # The LLM call blocks; run it in a thread so the other pages keep going
+            return await asyncio.to_thread(gpt_answerer.personalize_message,
+                                           website_content='\n'.join(metadata_lines(target_metadata) +
+                                                                      [build_site_context(raw, budget, page_text)]),
+                                           original_message=original_message)
+        except Exception as e:
+            logger.warning(f"GPT personalization failed: {e}, falling back to the original message.")
+            return original_message
+
+    @staticmethod
+    async def _browser_state(backend: PlaywrightBackend, context) -> Dict:
+        try:
+            return {'cookies': selenium_cookies(await context.cookies()),
+                    'storage': await backend.evaluate(STORAGE_SCRIPT) or {}}
+        except Exception as e:
+            logger.debug(f"Could not save browser state: {e}")
+            return {'cookies': [], 'storage': {}}
@@ -0,0 +1,183 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from src.fill_strategies import IN_PAGE_FILL_SCRIPT, FillStrategy
+from src.form_snapshot import (BUTTON_QUERY, CONTAINER_QUERY, FIELD_QUERY, SKIPPED_INPUT_TYPES, SNAPSHOT_SCRIPT,
+                               FormSnapshot)
+
+try:
+    from playwright.async_api import Page
+except ImportError:  # optional: only the asyncio backend needs it (pip install playwright)
+    Page = None
+
+
+# Playwright evaluates a function of one argument; our scripts are Selenium-style
+# bodies that read `arguments[n]` and `return` a value, so wrap them once.
+def wrap_script(script: str) -> str:
+    return "(args) => (function () {\n" + script + "\n}).apply(null, args)"
+
+
+# Looks up one element of the last snapshot's registry (see SNAPSHOT_SCRIPT)
+RESOLVE_ONE_SCRIPT = """
+ref => {
+    var el = (window.__prospectAiSnapshot || [])[ref];
+    return el && el.isConnected ? el : null;
+}
+"""
+
+
+class BrowserBackend(ABC):
+    """
+    The browser operations a form submission needs: navigate, evaluate a script,
+    snapshot the forms, turn snapshot records into elements, fill and click.
+    ContactFormAutomator talks to the browser only through these.
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def navigate(self, url: str):
+        pass
+
+    @abstractmethod
+    def evaluate(self, script: str, *args) -> Any:
+        pass
+
+    @abstractmethod
+    def snapshot(self) -> FormSnapshot:
+        pass
+
+    @abstractmethod
+    def resolve(self, snapshot: FormSnapshot, records: List[Optional[Dict]]) -> List[Optional[Any]]:
+        pass
+
+    @abstractmethod
+    def fill(self, element, value: str, field_type: str, tag_name: str):
+        pass
+
+    @abstractmethod
+    def click(self, element):
+        pass
+
+
+class SeleniumBackend(BrowserBackend):
+    """One blocking WebDriver session; every call is a round trip to chromedriver."""
+
+    name = 'selenium'
+
+    def __init__(self, driver, fill_strategy: FillStrategy):
+        self.driver = driver
+        self.fill_strategy = fill_strategy
+
+    def navigate(self, url: str):
+        self.driver.get(url)
+
+    def evaluate(self, script: str, *args) -> Any:
+        return self.driver.execute_script(script, *args)
+
+    def snapshot(self) -> FormSnapshot:
+        return FormSnapshot.capture(self.driver)
+
+    def resolve(self, snapshot: FormSnapshot, records: List[Optional[Dict]]) -> List[Optional[Any]]:
+        return snapshot.resolve(self.driver, records)
+
+    def fill(self, element, value: str, field_type: str, tag_name: str):
+        self.fill_strategy.fill(self.driver, element, value, field_type, tag_name)
+
+    def click(self, element):
+        element.click()
+
+
+class AsyncBrowserBackend(ABC):
+    """Awaitable counterpart of BrowserBackend, for driving many pages from one event loop."""
+
+    name = 'async_base'
+
+    @abstractmethod
+    async def navigate(self, url: str):
+        pass
+
+    @abstractmethod
+    async def evaluate(self, script: str, *args) -> Any:
+        pass
+
+    @abstractmethod
+    async def snapshot(self) -> FormSnapshot:
+        pass
+
+    @abstractmethod
+    async def resolve(self, snapshot: FormSnapshot, records: List[Optional[Dict]]) -> List[Optional[Any]]:
+        pass
+
+    @abstractmethod
+    async def fill(self, element, value: str, field_type: str, tag_name: str):
+        pass
+
+    @abstractmethod
+    async def click(self, element):
+        pass
+
+
+class PlaywrightBackend(AsyncBrowserBackend):
+    """
+    One Playwright page. Runs the same in-page scripts as the Selenium backend;
+    values are always set in the page (IN_PAGE_FILL_SCRIPT), since per-keystroke
+    typing would serialize the event loop on one site.
+    """
+
+    name = 'playwright'
+
+    def __init__(self, page: 'Page', emulate_keystrokes: bool = False, click_timeout: float = 5.0,
+                 round_trip_hook: Optional[Callable[[], None]] = None):
+        self.page = page
+        self.emulate_keystrokes = emulate_keystrokes
+        self.click_timeout = click_timeout
+        # Called once per protocol round trip (see PhaseTimer.note_round_trip)
+        self.round_trip_hook = round_trip_hook or (lambda: None)
+
+    async def navigate(self, url: str):
+        self.round_trip_hook()
+        await self.page.goto(url, wait_until='domcontentloaded')
+
+    async def evaluate(self, script: str, *args) -> Any:
+        self.round_trip_hook()
+        return await self.page.evaluate(wrap_script(script), list(args))
+
+    async def snapshot(self) -> FormSnapshot:
+        try:
+            raw = await self.evaluate(SNAPSHOT_SCRIPT, CONTAINER_QUERY, FIELD_QUERY, BUTTON_QUERY, SKIPPED_INPUT_TYPES)
+            return FormSnapshot(json.loads(raw) if raw else None)
+        except Exception as e:
+            logger.warning(f"Failed to capture form snapshot: {e}")
+            return FormSnapshot()
+
+    async def resolve(self, snapshot: FormSnapshot, records: List[Optional[Dict]]) -> List[Optional[Any]]:
+        elements = []
+        for record in records:
+            element = None
+            if record:
+                try:
+                    self.round_trip_hook()
+                    handle = await self.page.evaluate_handle(RESOLVE_ONE_SCRIPT, record['ref'])
+                    element = handle.as_element()
+                except Exception as e:
+                    logger.warning(f"Failed to resolve snapshot element: {e}")
+            elements.append(element)
+        return elements
+
+    async def fill(self, element, value: str, field_type: str, tag_name: str):
+        await self.evaluate(IN_PAGE_FILL_SCRIPT, element, value, self.emulate_keystrokes)
+
+    async def click(self, element):
+        self.round_trip_hook()
+        await element.scroll_into_view_if_needed(timeout=self.click_timeout * 1000)
+        try:
+            self.round_trip_hook()
+            await element.click(timeout=self.click_timeout * 1000)
+        except Exception as e:
+            # Covered by an overlay or not "stable": fall back to a DOM click, as the Selenium path does
+            logger.debug(f"Native click failed ({e}); using a JavaScript click")
+            await self.evaluate("arguments[0].click();", element)
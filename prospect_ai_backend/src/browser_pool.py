@@ -0,0 +1,193 @@
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+
+from loguru import logger
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+from selenium.webdriver.chrome.service import Service
+
+from src.browser_profile import apply_resource_blocking, build_chrome_options, get_browser_profile
+
+
+DRIVER_CACHE_PATH = Path(os.getenv('CHROMEDRIVER_CACHE', Path.home() / '.cache' / 'prospect_ai' / 'chromedriver.json'))
+
+_driver_path_lock = threading.Lock()
+_driver_path: Optional[str] = None
+
+
+def resolve_chromedriver_path(refresh: bool = False) -> str:
+    """
+    Path of the chromedriver binary, resolved once and cached on disk so later
+    runs start without contacting the webdriver-manager download service.
+    CHROMEDRIVER_PATH overrides everything.
+    """
+    global _driver_path
+    explicit = os.getenv('CHROMEDRIVER_PATH')
+    if explicit:
+        return explicit
+
+    with _driver_path_lock:
+        if _driver_path and not refresh:
+            return _driver_path
+
+        if not refresh and DRIVER_CACHE_PATH.exists():
+            try:
+                cached = json.loads(DRIVER_CACHE_PATH.read_text(encoding='utf-8'))
+                if Path(cached['path']).exists():
+                    _driver_path = cached['path']
+                    return _driver_path
+            except (OSError, KeyError, json.JSONDecodeError) as e:
+                logger.debug(f"Ignoring chromedriver cache {DRIVER_CACHE_PATH}: {e}")
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        _driver_path = ChromeDriverManager().install()
+        try:
+            DRIVER_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            DRIVER_CACHE_PATH.write_text(json.dumps({'path': _driver_path, 'resolved_at': time.time()}), encoding='utf-8')
+        except OSError as e:
+            logger.debug(f"Could not write chromedriver cache: {e}")
+        logger.info(f"Resolved chromedriver at {_driver_path}")
+        return _driver_path
+
+
+def create_chrome_driver(profile_name: Optional[str] = None, profile_options: Optional[dict] = None,
+                         user_agent: Optional[str] = None):
+    """Start a Chrome session with the given browser profile using the cached chromedriver."""
+    profile = get_browser_profile(profile_name, profile_options)
+    chrome_options = build_chrome_options(profile, user_agent)
+    try:
+        driver = webdriver.Chrome(service=Service(resolve_chromedriver_path()), options=chrome_options)
+    except SessionNotCreatedException:
+        # Chrome updated past the cached driver; resolve a matching one and retry once
+        logger.warning("Cached chromedriver does not match the installed Chrome; resolving again")
+        driver = webdriver.Chrome(service=Service(resolve_chromedriver_path(refresh=True)), options=chrome_options)
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    apply_resource_blocking(driver, profile)
+    return driver
+
+
+def reset_session(driver):
+    """Leave the current site and clear cookies and storage, keeping the browser process."""
+    driver.delete_all_cookies()
+    try:
+        driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+    except WebDriverException:
+        pass
+    driver.get('about:blank')
+
+
+def is_session_alive(driver) -> bool:
+    try:
+        driver.execute_script("return 1")
+        return True
+    except WebDriverException:
+        return False
+
+
+class BrowserPool:
+    """
+    Keeps `size` Chrome sessions started ahead of time and hands them out on demand.
+
+    Sessions are warmed in background threads, so acquire() normally returns an
+    already running browser. Every acquire schedules a replacement; released
+    sessions are cleaned and kept while the pool has room, otherwise quit.
+    """
+
+    def __init__(self, factory: Callable, size: int = 1, acquire_timeout: float = 60.0):
+        self.factory = factory
+        self.size = max(0, size)
+        self.acquire_timeout = acquire_timeout
+        self._idle = queue.Queue()
+        self._warming = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max(1, self.size), thread_name_prefix="browser-warm")
+        for _ in range(self.size):
+            self._warm()
+
+    def acquire(self):
+        """A live browser session: a pre-warmed one when available, else a freshly started one."""
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            with self._lock:
+                can_wait = self._warming > 0 or not self._idle.empty()
+            if not can_wait:
+                return self.factory()
+            if time.monotonic() >= deadline:
+                logger.warning("No warm browser available in time; starting one directly")
+                return self.factory()
+            try:
+                driver = self._idle.get(timeout=0.25)
+            except queue.Empty:
+                continue
+            self._warm()
+            if is_session_alive(driver):
+                return driver
+            self._quit(driver)
+
+    def release(self, driver, reusable: bool = True):
+        """Hand a session back; it is cleaned and kept if the pool has room and it still works."""
+        if self._closed or not reusable or self._idle.qsize() >= self.size:
+            self._quit(driver)
+            return
+        try:
+            reset_session(driver)
+        except WebDriverException as e:
+            logger.debug(f"Discarding browser session that failed to reset: {e}")
+            self._quit(driver)
+            return
+        self._idle.put(driver)
+
+    def close(self):
+        self._closed = True
+        self._executor.shutdown(wait=True)
+        while not self._idle.empty():
+            self._quit(self._idle.get_nowait())
+
+    def _warm(self):
+        with self._lock:
+            if self._closed or self._warming + self._idle.qsize() >= self.size:
+                return
+            self._warming += 1
+        self._executor.submit(self._start_session)
+
+    def _start_session(self):
+        started = time.monotonic()
+        try:
+            driver = self.factory()
+            logger.debug(f"Warm browser session ready in {time.monotonic() - started:.1f}s")
+            if self._closed:
+                self._quit(driver)
+            else:
+                self._idle.put(driver)
+        except Exception as e:
+            logger.error(f"Failed to start a warm browser session: {e}")
+        finally:
+            with self._lock:
+                self._warming -= 1
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+_shared_pools = {}
+_shared_pools_lock = threading.Lock()
+
+
+def get_shared_browser_pool(profile_name: Optional[str] = None, size: int = 1) -> BrowserPool:
+    """Process-wide pool per browser profile, for long-lived services that run many jobs."""
+    with _shared_pools_lock:
+        key = profile_name or 'standard'
+        if key not in _shared_pools:
+            _shared_pools[key] = BrowserPool(lambda: create_chrome_driver(profile_name), size=size)
+        return _shared_pools[key]
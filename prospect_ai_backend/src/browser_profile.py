@@ -0,0 +1,168 @@
+import json
+from typing import Dict, List, Optional
+
+from loguru import logger
+from selenium.webdriver.chrome.options import Options
+
+
+# URL patterns blocked through CDP Network.setBlockedURLs, by category.
+# CAPTCHA providers and embedded form vendors are deliberately not listed.
+BLOCKED_URL_PATTERNS = {
+    'media': ['*.mp4', '*.webm', '*.ogg', '*.mp3', '*.wav', '*.mov', '*.avi', '*.m4a', '*.m3u8'],
+    'font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+    'analytics': [
+        '*google-analytics.com*', '*googletagmanager.com*', '*analytics.google.com*', '*hotjar.com*',
+        '*clarity.ms*', '*segment.io*', '*segment.com/analytics*', '*mixpanel.com*', '*fullstory.com*',
+        '*js.hs-analytics.net*', '*bat.bing.com*', '*px.ads.linkedin.com*', '*snap.licdn.com*',
+    ],
+    'ads': [
+        '*doubleclick.net*', '*googlesyndication.com*', '*googleadservices.com*', '*adservice.google.com*',
+        '*connect.facebook.net*', '*facebook.com/tr*', '*amazon-adsystem.com*', '*adnxs.com*', '*criteo.com*',
+        '*taboola.com*', '*outbrain.com*',
+    ],
+}
+
+# Rough median transfer sizes, used only to estimate what blocked requests would have cost
+ESTIMATED_BYTES = {'media': 500_000, 'font': 35_000, 'analytics': 40_000, 'ads': 60_000}
+
+BROWSER_PROFILES = {
+    # The original headed session: loads everything, waits for the full load event
+    'standard': {
+        'headless': False,
+        'page_load_strategy': 'normal',
+        'block_resources': False,
+        'disable_images': False,
+    },
+    # Headless, returns at DOMContentLoaded, no images, media, fonts, analytics or ads
+    'performance': {
+        'headless': True,
+        'page_load_strategy': 'eager',
+        'block_resources': True,
+        'disable_images': True,
+    },
+}
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+
+# One round trip per site: navigation timing plus summed resource timing
+PAGE_METRICS_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0] || {};
+var resources = performance.getEntriesByType('resource');
+var transferred = nav.transferSize || 0, decoded = nav.decodedBodySize || 0;
+for (var i = 0; i < resources.length; i++) {
+    transferred += resources[i].transferSize || 0;
+    decoded += resources[i].decodedBodySize || 0;
+}
+return {
+    dom_content_loaded: nav.domContentLoadedEventEnd || 0,
+    load_event: nav.loadEventEnd || 0,
+    resource_count: resources.length,
+    transferred_bytes: transferred,
+    decoded_bytes: decoded
+};
+"""
+
+
+def get_browser_profile(name: Optional[str] = None, overrides: Optional[Dict] = None) -> Dict:
+    """Profile settings by name ('standard' when not given), with optional per-key overrides."""
+    name = name or 'standard'
+    if name not in BROWSER_PROFILES:
+        raise ValueError(f"Unknown browser profile '{name}'. Choose one of: {', '.join(BROWSER_PROFILES)}")
+    return {'name': name, **BROWSER_PROFILES[name], **(overrides or {})}
+
+
+def build_chrome_options(profile: Dict, user_agent: Optional[str] = None) -> Options:
+    chrome_options = Options()
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument(f"--user-agent={user_agent or DEFAULT_USER_AGENT}")
+    chrome_options.page_load_strategy = profile['page_load_strategy']
+
+    if profile['headless']:
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--window-size=1280,900")
+        chrome_options.add_argument("--disable-gpu")
+    if profile['disable_images']:
+        chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if profile['block_resources']:
+        # Needed to count the requests Chrome refused per page
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return chrome_options
+
+
+def apply_resource_blocking(driver, profile: Dict):
+    """Block media, fonts, analytics and ad URLs for the whole session (Chrome DevTools only)."""
+    if not profile['block_resources']:
+        return
+    patterns = [pattern for category in BLOCKED_URL_PATTERNS.values() for pattern in category]
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        logger.debug(f"Blocking {len(patterns)} URL patterns in profile '{profile['name']}'")
+    except Exception as e:
+        logger.warning(f"Resource blocking unavailable: {e}")
+
+
+def blocked_category(url: str) -> str:
+    """The BLOCKED_URL_PATTERNS category a blocked request falls in ('other' otherwise)."""
+    url = url.lower()
+    for category, patterns in BLOCKED_URL_PATTERNS.items():
+        for pattern in patterns:
+            needle = pattern.strip('*')
+            if (pattern.startswith('*.') and url.split('?')[0].endswith(needle)) or (not pattern.startswith('*.') and needle in url):
+                return category
+    return 'other'
+
+
+class PageLoadMetrics:
+    """
+    Per-site load metrics for the performance profile: load time and bytes from the
+    Navigation/Resource Timing APIs, and the requests Chrome blocked from the
+    DevTools performance log with an estimate of the bytes they would have cost.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def reset(self):
+        """Drop performance log entries left over from the previous site."""
+        self._drain_log()
+
+    def collect(self) -> Dict:
+        try:
+            metrics = self.driver.execute_script(PAGE_METRICS_SCRIPT) or {}
+        except Exception as e:
+            logger.debug(f"Page metrics unavailable: {e}")
+            metrics = {}
+
+        blocked: Dict[str, int] = {}
+        requests: Dict[str, str] = {}
+        for entry in self._drain_log():
+            message = entry.get('message', {})
+            params = message.get('params', {})
+            if message.get('method') == 'Network.requestWillBeSent':
+                requests[params.get('requestId')] = params.get('request', {}).get('url', '')
+            elif message.get('method') == 'Network.loadingFailed' and params.get('blockedReason') == 'inspector':
+                category = blocked_category(requests.get(params.get('requestId'), ''))
+                blocked[category] = blocked.get(category, 0) + 1
+
+        metrics['page_load_time'] = round((metrics.get('load_event') or metrics.get('dom_content_loaded') or 0) / 1000, 3)
+        metrics['blocked_requests'] = blocked
+        metrics['estimated_bytes_saved'] = sum(ESTIMATED_BYTES.get(category, 0) * count for category, count in blocked.items())
+        return metrics
+
+    def _drain_log(self) -> List[Dict]:
+        try:
+            raw_entries = self.driver.get_log('performance')
+        except Exception:
+            return []
+        entries = []
+        for raw in raw_entries:
+            try:
+                entries.append(json.loads(raw['message']))
+            except (KeyError, ValueError):
+                continue
+        return entries
@@ -0,0 +1,100 @@
+from typing import Callable, Dict, Optional
+
+from loguru import logger
+from selenium.common.exceptions import WebDriverException
+
+from src.browser_pool import is_session_alive, reset_session
+
+try:
+    import psutil
+except ImportError:  # optional: without it sessions are only recycled by site count
+    psutil = None
+
+
+def session_rss_mb(driver) -> Optional[float]:
+    """Resident memory of chromedriver plus every Chrome process it started, in MB."""
+    if psutil is None:
+        return None
+    try:
+        process = psutil.Process(driver.service.process.pid)
+        processes = [process] + process.children(recursive=True)
+        return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+    except (AttributeError, psutil.Error):
+        return None
+
+
+class BrowserSession:
+    """
+    One worker's browser: recycles it after `max_sites` sites or once its memory
+    passes `max_rss_mb`, clears cookies and storage between sites otherwise, and
+    replaces it transparently when it dies. The automator is rebuilt whenever the
+    driver changes.
+
+    A driver passed in with owns_driver=False belongs to the caller: the session
+    swaps in a new one when it would recycle it, but never releases or quits it.
+    """
+
+    def __init__(self, driver, acquire: Callable, release: Callable, automator_factory: Callable,
+                 max_sites: int = 0, max_rss_mb: float = 0, clear_state: bool = True, owns_driver: bool = True):
+        self.driver = driver
+        self.owns_driver = owns_driver
+        self.acquire = acquire
+        self.release = release
+        self.automator_factory = automator_factory
+        self.max_sites = max_sites
+        self.max_rss_mb = max_rss_mb
+        self.clear_state = clear_state
+        self.automator = automator_factory(driver)
+        self.sites = 0
+        self.metrics: Dict[str, any] = {'recycles': {}, 'crashes': 0, 'state_resets': 0, 'peak_rss_mb': None}
+
+    def before_site(self):
+        """Recycle or clean the session before the next site."""
+        if self.sites == 0:
+            return
+        if self.max_sites and self.sites >= self.max_sites:
+            self._replace('site_limit')
+            return
+        if self.max_rss_mb:
+            rss = session_rss_mb(self.driver)
+            if rss is not None:
+                self.metrics['peak_rss_mb'] = round(max(rss, self.metrics['peak_rss_mb'] or 0), 1)
+                if rss > self.max_rss_mb:
+                    logger.info(f"Browser session at {rss:.0f} MB (limit {self.max_rss_mb} MB)")
+                    self._replace('memory')
+                    return
+        if self.clear_state:
+            try:
+                reset_session(self.driver)
+                self.metrics['state_resets'] += 1
+            except WebDriverException as e:
+                logger.warning(f"Could not clear browser state, recycling session: {e}")
+                self._replace('reset_failed')
+
+    def after_site(self) -> bool:
+        """Count the site; if the browser died during it, start a new one and return True."""
+        self.sites += 1
+        if is_session_alive(self.driver):
+            return False
+        self.metrics['crashes'] += 1
+        logger.warning("Browser session died; starting a new one")
+        self._replace('crash', reusable=False)
+        return True
+
+    def close(self):
+        """Release the current driver if the session owns it."""
+        if self.owns_driver:
+            self.release(self.driver)
+
+    def _replace(self, reason: str, reusable: bool = False):
+        if self.owns_driver:
+            try:
+                self.release(self.driver, reusable=reusable)
+            except Exception as e:
+                logger.debug(f"Error releasing browser session: {e}")
+        self.driver = self.acquire()
+        self.owns_driver = True
+        self.automator = self.automator_factory(self.driver)
+        self.sites = 0
+        self.metrics['recycles'][reason] = self.metrics['recycles'].get(reason, 0) + 1
+        logger.info(f"Browser session recycled ({reason})")
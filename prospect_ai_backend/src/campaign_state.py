@@ -0,0 +1,153 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaign_targets (
+    campaign_id TEXT NOT NULL,
+    target_hash TEXT NOT NULL,
+    website TEXT NOT NULL,
+    status TEXT NOT NULL,
+    outcome TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (campaign_id, target_hash)
+)
+"""
+
+
+def target_hash(website: str) -> str:
+    return hashlib.sha1(website.strip().encode('utf-8')).hexdigest()
+
+
+def derive_campaign_id(contact_data: Dict) -> str:
+    """Stable id for campaigns without one configured: the same contact data is the same campaign."""
+    return hashlib.sha1(json.dumps(contact_data, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:12]
+
+
+class CampaignState:
+    """
+    Durable per-target progress of a campaign in SQLite, keyed by campaign id and
+    a hash of the target as given in the config. A target is marked in flight
+    when a browser starts on it and done once its result is recorded, whatever
+    the outcome. A restarted campaign skips done targets; in-flight ones were
+    cut off by the crash and run again.
+
+    A finished target is committed at once (with WAL and synchronous=NORMAL that
+    is cheap), so a site that was submitted is never lost and submitted again
+    after a crash. In-flight markers are only batched, every `commit_every`
+    starts or `commit_interval` seconds and on flush(), counts() and close():
+    a lost marker just means the target still counts as not started.
+    """
+
+    def __init__(self, path: Path, campaign_id: str, commit_every: int = 50, commit_interval: float = 2.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.campaign_id = campaign_id
+        self.commit_every = max(1, commit_every)
+        self.commit_interval = commit_interval
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+        self._lock = threading.Lock()
+        # Targets passed over by pending() as done, and interrupted ones handed out again
+        self.resumed_done = 0
+        self.resumed_in_flight = 0
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        # WAL + NORMAL: a commit survives a process crash, which is what resuming needs
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+
+    def pending(self, websites: List[str]) -> List[str]:
+        """The websites still to do, in order; called once per chunk of a streamed target list."""
+        hashes = list({target_hash(url) for url in websites})
+        statuses: Dict[str, str] = {}
+        with self._lock:
+            # Only this chunk's targets, in batches under SQLite's parameter limit
+            for start in range(0, len(hashes), 500):
+                batch = hashes[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT target_hash, status FROM campaign_targets "
+                    f"WHERE campaign_id = ? AND target_hash IN ({','.join('?' * len(batch))})",
+                    (self.campaign_id, *batch)
+                ).fetchall()
+                statuses.update(rows)
+        remaining = [url for url in websites if statuses.get(target_hash(url)) != DONE]
+        in_flight = sum(1 for url in remaining if statuses.get(target_hash(url)) == IN_FLIGHT)
+        self.resumed_done += len(websites) - len(remaining)
+        self.resumed_in_flight += in_flight
+        if len(remaining) < len(websites) or in_flight:
+            logger.debug(f"Campaign {self.campaign_id}: {len(websites) - len(remaining)} targets already done, "
+                         f"{in_flight} interrupted targets retried, {len(remaining)} to go in this chunk")
+        return remaining
+
+    def start(self, website: str):
+        self._write(
+            'INSERT INTO campaign_targets (campaign_id, target_hash, website, status, attempts, updated_at) '
+            'VALUES (?, ?, ?, ?, 1, ?) ON CONFLICT (campaign_id, target_hash) '
+            'DO UPDATE SET status = excluded.status, attempts = attempts + 1, updated_at = excluded.updated_at',
+            (self.campaign_id, target_hash(website), website, IN_FLIGHT, time.time())
+        )
+
+    def finish(self, website: str, outcome: str):
+        self._write(
+            'INSERT INTO campaign_targets (campaign_id, target_hash, website, status, outcome, updated_at) '
+            'VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (campaign_id, target_hash) '
+            'DO UPDATE SET status = excluded.status, outcome = excluded.outcome, updated_at = excluded.updated_at',
+            (self.campaign_id, target_hash(website), website, DONE, outcome, time.time()),
+            commit_now=True
+        )
+
+    def counts(self) -> Dict[str, int]:
+        """Targets per status and per outcome of done targets, for the summary."""
+        with self._lock:
+            self._commit()
+            rows = self._conn.execute(
+                'SELECT status, outcome, COUNT(*) FROM campaign_targets WHERE campaign_id = ? GROUP BY status, outcome',
+                (self.campaign_id,)
+            ).fetchall()
+        counts: Dict[str, int] = {}
+        for status, outcome, count in rows:
+            key = outcome if status == DONE else status
+            counts[key] = counts.get(key, 0) + count
+        return counts
+
+    def status_of(self, website: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status FROM campaign_targets WHERE campaign_id = ? AND target_hash = ?',
+                (self.campaign_id, target_hash(website))
+            ).fetchone()
+        return row[0] if row else None
+
+    def flush(self):
+        with self._lock:
+            self._commit()
+
+    def close(self):
+        with self._lock:
+            self._commit()
+            self._conn.close()
+
+    def _write(self, sql: str, params: tuple, commit_now: bool = False):
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._uncommitted += 1
+            if (commit_now or self._uncommitted >= self.commit_every
+                    or time.monotonic() - self._last_commit >= self.commit_interval):
+                self._commit()
+
+    def _commit(self):
+        self._conn.commit()
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
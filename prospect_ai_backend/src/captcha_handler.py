@@ -1,9 +1,57 @@
-import time
 from typing import Dict, Optional
 
 from loguru import logger
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Selector -> CAPTCHA kind, checked in order by DETECT_SCRIPT
+CAPTCHA_SELECTORS = {
+    'iframe[src*="recaptcha"]': 'recaptcha',  # Google reCAPTCHA
+    'iframe[src*="hcaptcha"]': 'hcaptcha',    # hCaptcha
+    '.cf-turnstile': 'turnstile',             # Cloudflare Turnstile
+    'div.g-recaptcha': 'recaptcha',
+    'div.h-captcha': 'hcaptcha'
+}
+
+# One round trip: the first visible CAPTCHA widget, its kind and site key
+DETECT_SCRIPT = """
+var selectors = arguments[0];
+for (var i = 0; i < selectors.length; i++) {
+    var nodes = document.querySelectorAll(selectors[i]);
+    for (var j = 0; j < nodes.length; j++) {
+        var el = nodes[j];
+        if (!el.getClientRects().length) continue;
+        var style = window.getComputedStyle(el);
+        if (style.visibility === 'hidden' || style.display === 'none') continue;
+        var keyHolder = el.closest('[data-sitekey]') || document.querySelector('[data-sitekey]');
+        return {
+            present: true,
+            selector: selectors[i],
+            site_key: keyHolder ? keyHolder.getAttribute('data-sitekey') : null,
+            invisible: /size=invisible/.test(el.getAttribute('src') || '') || el.getAttribute('data-size') === 'invisible',
+            url: location.href
+        };
+    }
+}
+return {present: false, url: location.href};
+"""
+
+# The response token the widget writes once it has been solved
+TOKEN_SCRIPT = """
+var field = document.querySelector('[name="g-recaptcha-response"], [name="h-captcha-response"], [name="cf-turnstile-response"]');
+return field ? field.value : '';
+"""
+
+
+def describe_detection(detection: Optional[Dict]) -> Dict:
+    """Add the CAPTCHA kind and whether it blocks submission to a DETECT_SCRIPT result."""
+    detection = detection or {'present': False}
+    if detection.get('present'):
+        detection['kind'] = CAPTCHA_SELECTORS.get(detection['selector'], 'unknown')
+    detection['blocking'] = bool(detection.get('present')) and not detection.get('invisible')
+    return detection
+
 
 class CaptchaHandler:
     """
@@ -22,13 +70,7 @@ class CaptchaHandler:
         """
         self.driver = driver
         self.config = config or {}
-        self.captcha_selectors = [
-            'iframe[src*="recaptcha"]',  # Google reCAPTCHA
-            'iframe[src*="hcaptcha"]',   # hCaptcha
-            '.cf-turnstile',             # Cloudflare Turnstile
-            'div.g-recaptcha',
-            'div.h-captcha'
-        ]
+        self.captcha_selectors = list(CAPTCHA_SELECTORS)
         logger.debug("CaptchaHandler initialized.")
 
     def manage_captcha(self) -> bool:
@@ -53,27 +95,39 @@ class CaptchaHandler:
         
         return True
 
-    def _is_captcha_present(self) -> bool:
-        """Checks if a known CAPTCHA element is visible on the page."""
+    def detect(self) -> Dict:
+        """
+        Finds a visible CAPTCHA with one script call. `blocking` is False for
+        invisible reCAPTCHA, which never shows a challenge to solve up front.
+        """
         try:
-            for selector in self.captcha_selectors:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements and elements[0].is_displayed():
-                    return True
-            return False
+            detection = self.driver.execute_script(DETECT_SCRIPT, self.captcha_selectors)
         except Exception as e:
             logger.debug(f"Error while checking for CAPTCHA: {e}")
+            return {'present': False, 'blocking': False}
+        return describe_detection(detection)
+
+    def _is_captcha_present(self) -> bool:
+        """Checks if a known CAPTCHA element is visible on the page."""
+        return self.detect()['present']
+
+    def wait_for_token(self, timeout: float) -> bool:
+        """Poll until the widget holds a response token (solved) or the timeout expires."""
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=1).until(lambda d: d.execute_script(TOKEN_SCRIPT))
+            return True
+        except Exception:
             return False
 
     def _solve_manually(self):
         """
-        Pauses the script to allow for manual CAPTCHA solving.
+        Waits for the CAPTCHA to be solved manually, continuing as soon as it is.
         This is the "human-in-the-loop" pattern.
         """
         pause_duration = self.config.get("manual_captcha_timeout", 60)
-        logger.info(f"Please solve the CAPTCHA manually. Script will pause for {pause_duration} seconds.")
-        time.sleep(pause_duration)
-        logger.info("Resuming script. Attempting to proceed with form submission.")
+        logger.info(f"Please solve the CAPTCHA manually. Waiting up to {pause_duration} seconds.")
+        solved = self.wait_for_token(pause_duration)
+        logger.info(f"Resuming script ({'solved' if solved else 'timed out'}). Attempting to proceed with form submission.")
 
 
     
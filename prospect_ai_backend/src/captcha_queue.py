@@ -0,0 +1,153 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from src.captcha_handler import CaptchaHandler
+
+
+STORAGE_SCRIPT = """
+function dump(storage) {
+    var out = {};
+    try { for (var i = 0; i < storage.length; i++) out[storage.key(i)] = storage.getItem(storage.key(i)); } catch (e) {}
+    return out;
+}
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+RESTORE_STORAGE_SCRIPT = """
+var saved = arguments[0];
+try {
+    Object.keys(saved.local || {}).forEach(function (k) { localStorage.setItem(k, saved.local[k]); });
+    Object.keys(saved.session || {}).forEach(function (k) { sessionStorage.setItem(k, saved.session[k]); });
+} catch (e) {}
+"""
+
+
+class CaptchaSolver(ABC):
+    """Clears the CAPTCHA on the current page; returns True once it is solved."""
+
+    name = 'base'
+
+    @abstractmethod
+    def solve(self, driver, entry: Dict) -> bool:
+        """Solve the CAPTCHA of the parked site `entry`, already restored in `driver`."""
+
+
+class ManualCaptchaSolver(CaptchaSolver):
+    """A human solves it in the (headed) browser; continues as soon as the widget has a token."""
+
+    name = 'manual'
+
+    def __init__(self, timeout: float = 300):
+        self.timeout = timeout
+
+    def solve(self, driver, entry: Dict) -> bool:
+        logger.info(f"Solve the {entry['captcha'].get('kind', '')} CAPTCHA for {entry['website']} in the browser "
+                    f"(waiting up to {self.timeout}s)")
+        return CaptchaHandler(driver).wait_for_token(self.timeout)
+
+
+class TokenCaptchaSolver(CaptchaSolver):
+    """
+    Plugs in any token source (a solving service client, or a local stand-in):
+    `token_provider(entry)` returns a response token, which is written into the page.
+    """
+
+    name = 'token'
+
+    INJECT_SCRIPT = """
+    var token = arguments[0];
+    var fields = document.querySelectorAll('[name="g-recaptcha-response"], [name="h-captcha-response"], [name="cf-turnstile-response"]');
+    fields.forEach(function (field) { field.value = token; field.innerHTML = token; });
+    return fields.length;
+    """
+
+    def __init__(self, token_provider: Callable[[Dict], Optional[str]]):
+        self.token_provider = token_provider
+
+    def solve(self, driver, entry: Dict) -> bool:
+        token = self.token_provider(entry)
+        if not token:
+            return False
+        return bool(driver.execute_script(self.INJECT_SCRIPT, token))
+
+
+class CaptchaDeferralQueue:
+    """
+    Sites that showed a CAPTCHA, parked with the browser state they had (cookies,
+    local/session storage) so the campaign worker can move on immediately.
+    Entries are appended to a JSONL file and cleared later in one batch.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def park(self, website_url: str, driver, captcha: Dict, result: Optional[Dict] = None,
+             browser_state: Optional[Dict] = None):
+        """
+        Save the site and its browser state; the driver is still on the CAPTCHA page.
+        Without a driver (async backend) pass the state as {'cookies', 'storage'}.
+        """
+        entry = {
+            'website': website_url,
+            'page_url': captcha.get('url') or website_url,
+            'captcha': captcha,
+            'form_type': (result or {}).get('form_type'),
+            'parked_at': time.time(),
+            'cookies': [],
+            'storage': {}
+        }
+        if browser_state is not None:
+            entry.update(browser_state)
+        else:
+            try:
+                entry['cookies'] = driver.get_cookies()
+                entry['storage'] = driver.execute_script(STORAGE_SCRIPT) or {}
+            except Exception as e:
+                logger.debug(f"Could not save browser state for {website_url}: {e}")
+
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+        logger.info(f"🅿️  Parked {website_url} ({captcha.get('kind', 'captcha')}) for later CAPTCHA solving")
+
+    def pending(self) -> List[Dict]:
+        if not self.path.exists():
+            return []
+        entries = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entries.append(json.loads(line))
+        return entries
+
+    def replace(self, entries: List[Dict]):
+        """Rewrite the queue with only the given entries (those still unresolved)."""
+        with self._lock:
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + '\n')
+            tmp_path.replace(self.path)
+
+    @staticmethod
+    def restore(driver, entry: Dict):
+        """Put the saved cookies and storage back for the site's origin."""
+        parsed = urlparse(entry['page_url'])
+        driver.get(f"{parsed.scheme}://{parsed.netloc}/")
+        for cookie in entry.get('cookies', []):
+            cookie = {key: value for key, value in cookie.items() if key != 'sameSite' or value in ('Strict', 'Lax', 'None')}
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                logger.debug(f"Skipping cookie {cookie.get('name')}: {e}")
+        if entry.get('storage'):
+            driver.execute_script(RESTORE_STORAGE_SCRIPT, entry['storage'])
@@ -1,16 +1,25 @@
 
 import time
-import random
 import os
 from typing import Dict, List, Optional
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
+from selenium.common.exceptions import NoSuchElementException, ElementClickInterceptedException
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support.ui import Select
 from loguru import logger
 import src.utils as utils  # Leverage existing utilities
+from src.form_snapshot import FormSnapshot, compile_selector
+from src.field_classifier import FieldClassifier
+from src.fill_strategies import FillStrategy, PerCharacterFillStrategy
+from src.wait_policy import WaitPolicy
+from src.page_signals import PageSignalMatcher, page_verdict, read_page_state, submission_verdict
+from src.form_layout_cache import FormLayoutCache, layout_fingerprint
+from src.selector_stats import LABEL_MATCH, SelectorStats
+from src.browser_profile import PageLoadMetrics
+from src.captcha_handler import CaptchaHandler
+from src.browser_backend import SeleniumBackend
+from src.phase_timer import PhaseTimer
+from src.site_context import DEFAULT_TOKEN_BUDGET, read_site_context
+from src.target_source import metadata_lines
 
 class ContactFormAutomator:
     """
@@ -18,10 +27,45 @@ class ContactFormAutomator:
     Adapts ai_job_hunt's logic for form filling, now with dynamic GPT-powered messaging.
     """
 
-    def __init__(self, driver, gpt_answerer=None, output_dir=None):
+    def __init__(self, driver, gpt_answerer=None, output_dir=None, fill_strategy: Optional[FillStrategy] = None,
+                 wait_policy_config: Optional[Dict] = None, layout_cache: Optional[FormLayoutCache] = None,
+                 selector_stats: Optional[SelectorStats] = None, collect_page_metrics: bool = False,
+                 defer_captchas: bool = False, captcha_solver=None,
+                 context_token_budget: int = DEFAULT_TOKEN_BUDGET, rate_limiter=None):
         self.driver = driver
         self.gpt_answerer = gpt_answerer  # GPT integration for personalization
+        # Size cap (in tokens) of the website context sent with each personalization prompt
+        self.context_token_budget = context_token_budget
         self.output_dir = output_dir
+        # How values are typed into fields; per-character typing unless the campaign picks another
+        self.fill_strategy = fill_strategy or PerCharacterFillStrategy()
+        # Every navigate/snapshot/fill/click goes through the browser backend
+        self.backend = SeleniumBackend(driver, self.fill_strategy)
+        # Seconds and WebDriver round trips per phase of each site
+        self.phase_timer = PhaseTimer()
+        if driver is not None:
+            self.phase_timer.count_round_trips(driver)
+        # Event-driven waits instead of fixed sleeps
+        self.wait_policy = WaitPolicy(driver, **(wait_policy_config or {}))
+        # Form layouts that worked on earlier runs, replayed instead of rediscovered
+        self.layout_cache = layout_cache
+        # Which selector found each field, across runs; selectors are evaluated most-hit first
+        self.selector_stats = selector_stats
+        self._website_url = None
+        self._target_metadata = None
+        # Load time, bytes and blocked requests per site (performance browser profile)
+        self.page_metrics = PageLoadMetrics(driver) if collect_page_metrics else None
+        self._page_load = None
+        self._submission_evidence = None
+        # Set right before the submit click is dispatched: from then on the site may have the submission
+        self._submit_clicked = False
+        # CAPTCHA sites are either handed back as deferred right away, or cleared
+        # by a solver before submitting (when resolving the deferred queue)
+        self.captcha_handler = CaptchaHandler(driver)
+        self.defer_captchas = defer_captchas
+        self.captcha_solver = captcha_solver
+        # Shared submission budget (SubmissionRateLimiter); a token is taken right before the submit click
+        self.rate_limiter = rate_limiter
         # check if output directory exists before using it
         if self.output_dir:
             os.makedirs(self.output_dir, exist_ok=True)
@@ -47,7 +91,8 @@ class ContactFormAutomator:
                 'input[type="tel"]', 'input[name*="phone" i]', 'input[name*="mobile" i]',
                 'input[name*="tel" i]', 'input[placeholder*="phone" i]', 'input[id*="phone" i]',
                 '#phone', '#contact-phone', '.phone-input',
-                'input[aria-label*="phone" i]', 'input[aria-describedby*="phone" i]'
+                'input[aria-label*="phone" i]', 'input[aria-describedby*="phone" i]',
+                'input[aria-label*="telephone" i]'
             ],
             'subject': [
                 'input[name*="subject" i]', 'input[name*="topic" i]', 'select[name*="subject" i]',
@@ -86,30 +131,74 @@ class ContactFormAutomator:
                 'button[aria-label*="submit" i]', 'button[aria-label*="send" i]'
             ]
         }
+        # Compiled once; classifies every snapshot field without touching the browser
+        self.field_classifier = FieldClassifier(self.form_selectors, self.selector_stats)
+        # (rank, selector) in evaluation order; the rank still picks between buttons
+        self._submit_order = (self.selector_stats.ordered('submit', self.form_selectors['submit'])
+                              if self.selector_stats else list(enumerate(self.form_selectors['submit'])))
+        # Form-type, success and error keywords in one pass over the visible text
+        self.signal_matcher = PageSignalMatcher()
+        self._page_state = None
         logger.info("ContactFormAutomator initialized with GPT support")
 
-    def submit_contact_form(self, website_url: str, contact_data: Dict[str, str]) -> Dict[str, any]:
-        """Main method with GPT-enhanced personalization."""
+    def submit_contact_form(self, website_url: str, contact_data: Dict[str, str],
+                            target_metadata: Optional[Dict] = None) -> Dict[str, any]:
+        """Main method with GPT-enhanced personalization; target_metadata is the target row's extra fields."""
         logger.info(f"Starting GPT-enhanced contact form submission for: {website_url}")
+        self.wait_policy.reset()
+        self._website_url = website_url
+        self._target_metadata = target_metadata
+        self._page_load = None
+        self._submission_evidence = None
+        self._submit_clicked = False
+        self.phase_timer.reset()
         try:
-            self.driver.get(website_url)
-            time.sleep(random.uniform(2, 4))
-            
-            form_type = self._detect_form_type()
-            logger.info(f"Detected form type: {form_type}")
+            with self.phase_timer.phase('navigate'):
+                if self.page_metrics:
+                    self.page_metrics.reset()
+                self.backend.navigate(website_url)
+                self.wait_policy.wait_for_settle('navigate')
+                self._page_state = None
+                if self.page_metrics:
+                    self._page_load = self.page_metrics.collect()
+            
+            with self.phase_timer.phase('detect'):
+                form_type = self._detect_form_type()
+                logger.info(f"Detected form type: {form_type}")
+                captcha = self.captcha_handler.detect() if (self.defer_captchas or self.captcha_solver) else None
+            
+            if captcha and captcha['blocking'] and not self.captcha_solver:
+                # Don't wait on it: the manager parks the site with its browser state
+                return {'success': False, 'deferred': True, 'captcha': captcha, 'website': website_url,
+                        'form_type': form_type, 'error': f"{captcha['kind']} CAPTCHA present, deferred",
+                        **self._result_metadata()}
             
             # GPT: Personalize data based on website content
             # personalized_data = self._personalize_with_gpt(contact_data, website_url, form_type)
             # Pass only the original message to the personalization method
             original_message = contact_data.get('message', '')
-            personalized_message = self._personalize_with_gpt(original_message)
+            with self.phase_timer.phase('personalize'):
+                personalized_message = self._personalize_with_gpt(original_message)
             contact_data['message'] = personalized_message
 
             form_result = self._find_and_fill_form(contact_data, form_type)
             if not form_result['success']:
-                return {'success': False, 'error': form_result['error'], 'website': website_url, 'form_type': form_type}
-            
-            submit_result = self._submit_form()
+                return {'success': False, 'error': form_result['error'], 'website': website_url, 'form_type': form_type,
+                        **self._result_metadata()}
+            
+            if captcha and captcha['blocking']:
+                with self.phase_timer.phase('captcha'):
+                    solved = self.captcha_solver.solve(self.driver, {'website': website_url, 'captcha': captcha})
+                if not solved:
+                    return {'success': False, 'error': 'CAPTCHA was not solved', 'website': website_url,
+                            'form_type': form_type, 'captcha': captcha, **self._result_metadata()}
+            
+            if self.rate_limiter:
+                with self.phase_timer.phase('rate_limit'):
+                    self.rate_limiter.acquire(website_url)
+            with self.phase_timer.phase('submit'):
+                submit_result = self._submit_form(form_result.get('snapshot'), form_result.get('submit_element'))
+            self._update_layout_cache(website_url, form_result, submit_result['success'])
             return {
                 'success': submit_result['success'],
                 'website': website_url,
@@ -118,12 +207,26 @@ class ContactFormAutomator:
                 'form_type': form_type,
                 'submission_time': time.time(),
                 'error': submit_result.get('error'),
-                'confirmation_message': submit_result.get('confirmation')
+                'confirmation_message': submit_result.get('confirmation'),
+                'layout_cache': form_result.get('layout_cache'),
+                **self._result_metadata()
             }
         except Exception as e:
             logger.error(f"Error submitting contact form for {website_url}: {str(e)}")
-            return {'success': False, 'error': str(e), 'website': website_url}
+            return {'success': False, 'error': str(e), 'website': website_url, **self._result_metadata()}
     
+    def _result_metadata(self) -> Dict[str, any]:
+        """Per-site details attached to every result, successful or not."""
+        return {
+            'fill_strategy': self.fill_strategy.name,
+            'wait_times': list(self.wait_policy.timings),
+            'total_wait': self.wait_policy.total_wait(),
+            'page_load': self._page_load,
+            'submission_evidence': self._submission_evidence,
+            'phase_timings': self.phase_timer.breakdown(),
+            'last_phase': self.phase_timer.last_phase,
+            'submit_clicked': self._submit_clicked
+        }
 
     def _personalize_with_gpt(self, original_message: str) -> str:
         """Personalize the contact message using the B2BMessagePersonalizer."""
@@ -132,8 +235,11 @@ class ContactFormAutomator:
             return original_message
         
         try:
-            # Get website content for context, limiting to a reasonable size
-            website_content = self.driver.find_element(By.TAG_NAME, "body").text[:4000]
+            # Title, description, JSON-LD, headings and about/products sections, within the token budget
+            website_content = read_site_context(self.backend, self.context_token_budget,
+                                                fallback_text=self._read_page()['text'])
+            # What the target list says about the prospect (company, contact name, ...) goes first
+            website_content = '\n'.join(metadata_lines(self._target_metadata) + [website_content])
 
             # Call the new, dedicated personalization method
             personalized_message = self.gpt_answerer.personalize_message(
@@ -197,65 +303,44 @@ class ContactFormAutomator:
             return "the company"
 
 
+    def _read_page(self) -> Dict:
+        """Visible text and keyword signals for the current page state, fetched once until invalidated."""
+        if self._page_state is None:
+            self._page_state = read_page_state(self.driver, self.signal_matcher)
+        return self._page_state
+
     def _detect_form_type(self) -> str:
         """Detect the type of contact form based on page content"""
-        try:
-            page_text = self.driver.page_source.lower()
-            title_text = self.driver.title.lower()
-            
-            # Check for specific form types
-            if any(keyword in page_text or keyword in title_text for keyword in 
-                   ['contact us', 'contact-us', 'get in touch', 'reach us']):
-                return 'contact_us'
-            elif any(keyword in page_text or keyword in title_text for keyword in 
-                     ['request quote', 'quote request', 'get quote', 'rfq']):
-                return 'request_quote'
-            elif any(keyword in page_text or keyword in title_text for keyword in 
-                     ['inquiry', 'send message', 'contact form']):
-                return 'general_inquiry'
-            else:
-                return 'unknown'
-                
-        except Exception as e:
-            logger.warning(f"Error detecting form type: {e}")
-            return 'unknown'
+        return self.signal_matcher.form_type(self._read_page()['signals'])
 
     def _find_and_fill_form(self, contact_data: Dict[str, str], form_type: str) -> Dict[str, any]:
         """Enhanced form finding and filling with required field detection"""
         try:
-            form = self._find_form_element()
-            if not form:
-                return {'success': False, 'error': 'No contact form found'}
-            
-            # Get required fields
-            required_fields = self._get_required_fields(form)
-            logger.info(f"Required fields detected: {required_fields}")
-            
-            # Fill form fields
-            filled_fields = {}
-            missing_required = []
-            
-            for field_type, selectors in self.form_selectors.items():
-                if field_type == 'submit':
-                    continue
-                    
-                field_value = contact_data.get(field_type)
-                if not field_value and field_type in required_fields:
-                    missing_required.append(field_type)
-                    continue
-                
-                if field_value:
-                    field_element = self._find_field_element(form, selectors)
-                    if field_element:
-                        self._fill_field(field_element, field_value, field_type)
-                        filled_fields[field_type] = field_value
-                        time.sleep(random.uniform(0.5, 1.5))
-            
-            if missing_required:
-                return {
-                    'success': False, 
-                    'error': f'Missing required fields: {missing_required}'
-                }
+            replayed = self._replay_cached_layout(contact_data)
+            if replayed:
+                return replayed
+
+            with self.phase_timer.phase('find_form'):
+                # One round trip describes the whole page; matching runs in memory
+                snapshot = self.backend.snapshot()
+                plan = self.plan_submission(snapshot, contact_data)
+            if not plan['success']:
+                return plan
+            form, matched_fields, candidates = plan['form'], plan['fields'], plan['candidates']
+            required_fields = plan['required_fields']
+            
+            with self.phase_timer.phase('fill'):
+                # Only the chosen elements are turned back into WebElements, in one call
+                elements = self.backend.resolve(snapshot, [form] + list(matched_fields.values()))
+                form_element, field_elements = elements[0], elements[1:]
+
+                filled_fields = {}
+                for (field_type, field_record), field_element in zip(matched_fields.items(), field_elements):
+                    if field_element is None:
+                        continue
+                    self._fill_field(field_element, contact_data[field_type], field_type, field_record['tag'])
+                    filled_fields[field_type] = contact_data[field_type]
+                    self.fill_strategy.pause_between_fields()
             
             if not filled_fields:
                 return {'success': False, 'error': 'No form fields could be filled'}
@@ -264,7 +349,10 @@ class ContactFormAutomator:
                 'success': True, 
                 'filled_fields': filled_fields,
                 'required_fields': required_fields,
-                'form_element': form
+                'form_element': form_element,
+                'snapshot': snapshot,
+                'layout': self._describe_layout(snapshot, form, candidates, required_fields),
+                'layout_cache': 'miss' if self.layout_cache else None
             }
             
         except Exception as e:
@@ -272,52 +360,142 @@ class ContactFormAutomator:
             return {'success': False, 'error': str(e)}
     
 
-    def _get_required_fields(self, form: WebElement) -> List[str]:
+    def plan_submission(self, snapshot: FormSnapshot, contact_data: Dict[str, str]) -> Dict[str, any]:
+        """
+        Pick the form, the field for each value and the submit button from a snapshot,
+        without touching the browser. Shared by the Selenium path and the async runner.
+        """
+        form = self._find_form_element(snapshot)
+        if not form:
+            return {'success': False, 'error': 'No contact form found'}
+        
+        # Classify every field of the form once, in memory
+        classified = self.field_classifier.classify_fields(snapshot.fields_in(form))
+
+        # Get required fields
+        required_fields = self._get_required_fields(classified)
+        logger.info(f"Required fields detected: {required_fields}")
+        
+        candidates = self.field_classifier.pick_fields(classified)
+        self._record_selector_hits(classified, candidates)
+        matched_fields = {}
+        missing_required = []
+        
+        for field_type in self.field_classifier.field_types:
+            field_value = contact_data.get(field_type)
+            if not field_value and field_type in required_fields:
+                missing_required.append(field_type)
+                continue
+            
+            if field_value and field_type in candidates:
+                matched_fields[field_type] = candidates[field_type]
+        
+        if missing_required:
+            return {
+                'success': False, 
+                'error': f'Missing required fields: {missing_required}'
+            }
+        
+        return {
+            'success': True,
+            'form': form,
+            'fields': matched_fields,
+            'candidates': candidates,
+            'required_fields': required_fields,
+            'submit_button': self._find_submit_button(snapshot)
+        }
+
+    def _record_selector_hits(self, classified: Dict[str, List], candidates: Dict[str, Dict]):
+        """Count the selector that found each field type on this form, or a miss."""
+        if not self.selector_stats:
+            return
+        for field_type in self.field_classifier.field_types:
+            chosen = candidates.get(field_type)
+            if chosen is None:
+                self.selector_stats.record(field_type, None)
+                continue
+            rank = next(rank for rank, record in classified[field_type] if record is chosen)
+            selectors = self.form_selectors[field_type]
+            self.selector_stats.record(field_type, selectors[rank] if rank < len(selectors) else LABEL_MATCH)
+
+    def _replay_cached_layout(self, contact_data: Dict[str, str]) -> Optional[Dict[str, any]]:
+        """Fill the form straight from a cached layout whose fingerprint still matches the page."""
+        if not self.layout_cache or not self._website_url:
+            return None
+
+        for layout in self.layout_cache.layouts_for(self._website_url):
+            with self.phase_timer.phase('find_form'):
+                found = self.layout_cache.replay(self.driver, layout)
+            if not found:
+                continue
+
+            missing_required = [field_type for field_type in layout['required_fields'] if not contact_data.get(field_type)]
+            if missing_required:
+                return {'success': False, 'error': f'Missing required fields: {missing_required}'}
+
+            logger.info(f"Replaying cached form layout {layout['fingerprint']}")
+            filled_fields = {}
+            with self.phase_timer.phase('fill'):
+                for field_type, field_element in found['fields'].items():
+                    field_value = contact_data.get(field_type)
+                    if not field_value:
+                        continue
+                    self._fill_field(field_element, field_value, field_type, layout['fields'][field_type]['tag'])
+                    filled_fields[field_type] = field_value
+                    self.fill_strategy.pause_between_fields()
+
+            if not filled_fields:
+                continue
+            return {
+                'success': True,
+                'filled_fields': filled_fields,
+                'required_fields': layout['required_fields'],
+                'submit_element': found['submit_element'],
+                'layout': layout,
+                'layout_cache': 'hit'
+            }
+
+        return None
+
+    def _describe_layout(self, snapshot: FormSnapshot, form: Dict, candidates: Dict[str, Dict],
+                         required_fields: List[str]) -> Optional[Dict]:
+        """The cacheable part of a discovered form: fingerprint and CSS paths of form, fields and submit button."""
+        submit_button = self._find_submit_button(snapshot)
+        if not submit_button or 'signature' not in form:
+            return None
+        return {
+            'fingerprint': layout_fingerprint(form['signature']),
+            'form_path': form['path'],
+            'fields': {field_type: {'path': record['path'], 'tag': record['tag']}
+                       for field_type, record in candidates.items()},
+            'submit_path': submit_button['path'],
+            'required_fields': required_fields
+        }
+
+    def _update_layout_cache(self, website_url: str, form_result: Dict, submitted: bool):
+        layout = form_result.get('layout')
+        if not self.layout_cache or not layout:
+            return
+        if form_result.get('layout_cache') == 'hit':
+            if submitted:
+                self.layout_cache.mark_used(website_url, layout['fingerprint'])
+            else:
+                # Rediscover next time rather than replaying a layout that just failed
+                self.layout_cache.forget(website_url, layout['fingerprint'])
+        elif submitted:
+            self.layout_cache.store(website_url, layout)
+
+    def _get_required_fields(self, classified: Dict[str, List]) -> List[str]:
         """Detect required fields by checking for 'required' attributes, asterisks in labels, and parent classes."""
         required_fields = set()
         
         try:
-            # Strategy 1: Find all elements with 'required' or 'aria-required="true"'
-            required_elements = form.find_elements(By.CSS_SELECTOR, '[required], [aria-required="true"]')
-            
-            # Strategy 2: Find labels containing a '*' and get their associated input
-            asterisk_labels = form.find_elements(By.XPATH, ".//label[contains(.,'*')]")
-            for label in asterisk_labels:
-                try:
-                    # Find input associated by 'for' attribute
-                    input_id = label.get_attribute('for')
-                    if input_id:
-                        element = form.find_element(By.ID, input_id)
-                        required_elements.append(element)
-                except NoSuchElementException:
-                    continue
-
-            # Strategy 3: Find parent containers with a 'required' class
-            required_containers = form.find_elements(By.CSS_SELECTOR, '[class*="required"]')
-            for container in required_containers:
-                try:
-                    # Find the first input, textarea, or select within this container
-                    element = container.find_element(By.CSS_SELECTOR, 'input, textarea, select')
-                    required_elements.append(element)
-                except NoSuchElementException:
-                    continue
-            
-             # For each identified required element, determine its field type
-            for element in required_elements:
-                for field_type, selectors in self.form_selectors.items():
-                    if field_type == 'submit':
-                        continue
-                    # Check if the element matches any of the selectors for a given field type
-                    for selector in selectors:
-                        try:
-                            # This is a trick to check if an element matches a selector
-                            if element.get_attribute('outerHTML') == form.find_element(By.CSS_SELECTOR, f'{selector}[outerHTML="{element.get_attribute("outerHTML")}"]').get_attribute('outerHTML'):
-                                required_fields.add(field_type)
-                                break # Move to the next element once type is found
-                        except:
-                            continue
-                    if field_type in required_fields:
-                        break # Already found type for this element
+            # The snapshot already flags 'required'/'aria-required', asterisk labels
+            # and the first input inside a container with a 'required' class
+            for field_type, ranked in classified.items():
+                if any(field['required'] or field['label_asterisk'] or field['required_container']
+                       for _, field in ranked):
+                    required_fields.add(field_type)
 
         except Exception as e:
             logger.warning(f"Error detecting required fields: {e}")
@@ -376,7 +554,7 @@ class ContactFormAutomator:
         
     #     return list(set(required_fields))  # Remove duplicates
 
-    def _find_form_element(self) -> Optional[WebElement]:
+    def _find_form_element(self, snapshot: Optional[FormSnapshot] = None) -> Optional[Dict]:
         """Enhanced form detection with more patterns"""
         form_selectors = [
             'form[action*="contact"]', 'form[action*="submit"]', 'form[action*="send"]',
@@ -387,64 +565,18 @@ class ContactFormAutomator:
             '.wpcf7-form', '.gform_wrapper form',  # Common form plugins
             '.contact-form form', '.quote-form', '.inquiry-form'
         ]
+        snapshot = snapshot or self.backend.snapshot()
         
         for selector in form_selectors:
-            try:
-                if selector.startswith('.'):
-                    forms = self.driver.find_elements(By.CLASS_NAME, selector[1:])
-                elif selector.startswith('#'):
-                    forms = self.driver.find_elements(By.ID, selector[1:])
-                else:
-                    forms = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                
-                if forms:
-                    # Return the form with the most input fields
-                    return max(forms, key=lambda f: len(f.find_elements(By.TAG_NAME, 'input')))
-                    
-            except Exception:
-                continue
+            matcher = compile_selector(selector)
+            forms = [container for container in snapshot.containers if matcher(container, snapshot)]
+            if forms:
+                # Return the form with the most input fields
+                return max(forms, key=lambda f: f['input_count'])
         
         return None
     
 
-    def _find_field_element(self, form: WebElement, selectors: List[str]) -> Optional[WebElement]:
-        """Find a field element by trying CSS selectors first, then by searching for its visible label text."""
-        # Strategy 1: Try direct CSS selectors
-        for selector in selectors:
-            try:
-                element = form.find_element(By.CSS_SELECTOR, selector)
-                if element and element.is_displayed() and element.is_enabled():
-                    return element
-            except NoSuchElementException:
-                continue
-        
-        # Strategy 2: Find by label text (more robust for complex forms)
-        # Extract potential label texts from selectors (e.g., 'name' from 'input[name*="name"]')
-        label_texts = set()
-        for s in selectors:
-            if 'name' in s: label_texts.add('name')
-            if 'email' in s: label_texts.add('email')
-            if 'phone' in s: label_texts.add('phone')
-            if 'company' in s: label_texts.add('company')
-            if 'subject' in s: label_texts.add('subject')
-            if 'message' in s: label_texts.add('message')
-
-        for text in label_texts:
-            try:
-                # Find the label that contains the text, case-insensitive
-                label = form.find_element(By.XPATH, f".//label[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{text}')]")
-                input_id = label.get_attribute('for')
-                if input_id:
-                    element = form.find_element(By.ID, input_id)
-                    if element.is_displayed() and element.is_enabled():
-                        return element
-            except NoSuchElementException:
-                continue
-
-        return None
-    
-    
-
     # def _find_field_element(self, form: WebElement, selectors: List[str]) -> Optional[WebElement]:
     #     """Enhanced field finding with better selector matching"""
     #     for selector in selectors:
@@ -479,171 +611,123 @@ class ContactFormAutomator:
         
     #     return None
 
-    def _fill_field(self, element: WebElement, value: str, field_type: str):
-        """Enhanced field filling with better handling of different input types"""
+    def _fill_field(self, element: WebElement, value: str, field_type: str, tag_name: Optional[str] = None):
+        """Fill a field using the campaign's fill strategy"""
         try:
-            # Clear existing value
-            element.clear()
-            time.sleep(0.2)
-            
-            # Handle select dropdowns
-            if element.tag_name.lower() == 'select':
-                
-                select = Select(element)
-                try:
-                    select.select_by_visible_text(value)
-                    logger.debug(f"Selected dropdown option: {value}")
-                    return
-                except:
-                    # If exact match fails, try partial match
-                    options = [opt.text for opt in select.options]
-                    for opt_text in options:
-                        if value.lower() in opt_text.lower():
-                            select.select_by_visible_text(opt_text)
-                            logger.debug(f"Selected partial match: {opt_text}")
-                            return
-            
-            # Handle text inputs and textareas
-            # Type the value with human-like delays
-            for char in value:
-                element.send_keys(char)
-                time.sleep(random.uniform(0.05, 0.15))
-            
-            logger.debug(f"Filled {field_type} field with: {value}")
+            # Tag is known from the snapshot when available
+            tag_name = (tag_name or element.tag_name).lower()
+            self.backend.fill(element, value, field_type, tag_name)
+            logger.debug(f"Filled {field_type} field ({self.fill_strategy.name}) with: {value}")
             
         except Exception as e:
             logger.warning(f"Error filling {field_type} field: {e}")
 
-    def _submit_form(self) -> Dict[str, any]:
+    def _submit_form(self, snapshot: Optional[FormSnapshot] = None, submit_button: Optional[WebElement] = None) -> Dict[str, any]:
         """Enhanced form submission with multiple submit button strategies"""
         try:
-            # Find submit button
-            submit_button = self._find_submit_button()
-            if not submit_button:
+            if submit_button is None:
+                submit_button = self._locate_submit_button(snapshot)
+            if submit_button is None:
                 return {'success': False, 'error': 'Submit button not found'}
             
             # Scroll to submit button
-            self.driver.execute_script("arguments[0].scrollIntoView(true);", submit_button)
-            time.sleep(1)
+            self.backend.evaluate("arguments[0].scrollIntoView(true);", submit_button)
+            self.wait_policy.wait_for_dom_quiet('scroll')
             
-            # Click submit button
-            submit_button.click()
-            time.sleep(2)
+            # Click submit button, then wait for navigation or for the page to react and settle
+            baseline = self.wait_policy.mark()
+            self._submit_clicked = True
+            self.backend.click(submit_button)
+            self.wait_policy.wait_for_submission(baseline)
             
             # Check for success indicators
-            return self._check_submission_success()
+            return self._check_submission_success(baseline)
             
         except ElementClickInterceptedException:
             logger.warning("Submit button click intercepted, trying JavaScript click")
+            # The intercepted click never reached the button
+            self._submit_clicked = False
             try:
-                self.driver.execute_script("arguments[0].click();", submit_button)
-                time.sleep(2)
-                return self._check_submission_success()
+                baseline = self.wait_policy.mark()
+                self._submit_clicked = True
+                self.backend.evaluate("arguments[0].click();", submit_button)
+                self.wait_policy.wait_for_submission(baseline)
+                return self._check_submission_success(baseline)
             except Exception as e:
                 return {'success': False, 'error': f'JavaScript click failed: {str(e)}'}
                 
         except Exception as e:
             return {'success': False, 'error': str(e)}
 
-    def _find_submit_button(self) -> Optional[WebElement]:
+    def _locate_submit_button(self, snapshot: Optional[FormSnapshot] = None) -> Optional[WebElement]:
+        """Find the submit button in the snapshot and resolve it to a live element"""
+        snapshot = snapshot or self.backend.snapshot()
+        selector, button_record = self._match_submit_button(snapshot)
+        if self.selector_stats:
+            self.selector_stats.record('submit', selector)
+        if not button_record:
+            return None
+        submit_button = self.backend.resolve(snapshot, [button_record])[0]
+        if submit_button is None:
+            # The DOM was re-rendered while filling; look again on a fresh snapshot
+            snapshot = self.backend.snapshot()
+            button_record = self._find_submit_button(snapshot)
+            if button_record:
+                submit_button = self.backend.resolve(snapshot, [button_record])[0]
+        return submit_button
+
+    def _find_submit_button(self, snapshot: FormSnapshot) -> Optional[Dict]:
         """Enhanced submit button detection"""
-        submit_selectors = self.form_selectors['submit']
-        
-        for selector in submit_selectors:
-            try:
-                if ':contains' in selector:
-                    # Handle text-based selectors
-                    button_text = selector.split('"')[1]
-                    buttons = self.driver.find_elements(By.XPATH, f"//button[contains(text(), '{button_text}')]")
-                    if buttons:
-                        return buttons[0]
-                else:
-                    if selector.startswith('#'):
-                        button = self.driver.find_element(By.ID, selector[1:])
-                    elif selector.startswith('.'):
-                        button = self.driver.find_element(By.CLASS_NAME, selector[1:])
-                    else:
-                        button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    
-                    if button.is_displayed() and button.is_enabled():
-                        return button
-                        
-            except NoSuchElementException:
+        return self._match_submit_button(snapshot)[1]
+
+    def _match_submit_button(self, snapshot: FormSnapshot):
+        """
+        The best-ranked submit selector that finds a usable button, and that button.
+        Selectors are tried most-hit first; once one matches, only better-ranked
+        ones are still worth trying.
+        """
+        best_rank, best_selector, best_button = None, None, None
+        for rank, selector in self._submit_order:
+            if best_rank is not None and rank > best_rank:
                 continue
+            matcher = compile_selector(selector)
+            button = next((b for b in snapshot.buttons if matcher(b, snapshot)), None)
+            if button and button['visible'] and button['enabled']:
+                best_rank, best_selector, best_button = rank, selector, button
         
-        return None
+        return best_selector, best_button
 
-    def _check_submission_success(self) -> Dict[str, any]:
-        """Enhanced success detection with more patterns"""
+    def _form_still_present(self) -> bool:
+        """Form disappearance is a common success indicator"""
         try:
-            # Wait for page changes or success messages
-            time.sleep(3)
-            
-            # Check for success indicators
-            success_indicators = [
-                'thank you', 'message sent', 'form submitted', 'success',
-                'confirmation', 'we received your message', 'thank you for contacting',
-                'thank you for your inquiry', 'your request has been submitted',
-                'quote request received', 'we will contact you soon'
-            ]
-            
-            page_text = self.driver.page_source.lower()
-            
-            for indicator in success_indicators:
-                if indicator in page_text:
-                    return {
-                        'success': True,
-                        'confirmation': f"Found success indicator: '{indicator}'"
-                    }
-            
-            # Check if redirected to thank you page
-            current_url = self.driver.current_url.lower()
-            if any(word in current_url for word in ['thank', 'success', 'confirmation', 'submitted']):
-                return {
-                    'success': True,
-                    'confirmation': f"Redirected to success page: {current_url}"
-                }
-            
-            # Check for form disappearance (common success indicator)
-            try:
-                form = self._find_form_element()
-                if not form:
-                    return {
-                        'success': True,
-                        'confirmation': 'Contact form no longer visible (likely submitted successfully)'
-                    }
-            except:
-                pass
-            
-            # Check for specific success elements
+            return self._find_form_element() is not None
+        except:
+            return True
+
+    def _check_submission_success(self, baseline: Optional[Dict] = None) -> Dict[str, any]:
+        """Enhanced success detection with more patterns"""
+        with self.phase_timer.phase('verify'):
             try:
-                success_elements = self.driver.find_elements(By.XPATH, 
-                    "//*[contains(@class, 'success') or contains(@class, 'thank') or contains(@class, 'confirmation')]")
-                if success_elements:
-                    return {
-                        'success': True,
-                        'confirmation': 'Found success/confirmation element on page'
-                    }
-            except:
-                pass
-            
-            # If no clear success indicators, assume success if no error messages
-            error_indicators = ['error', 'failed', 'invalid', 'required', 'please try again', 'field is required']
-            has_errors = any(indicator in page_text for indicator in error_indicators)
-            
-            if not has_errors:
-                return {
-                    'success': True,
-                    'confirmation': 'No error messages found, assuming successful submission'
-                }
-            else:
+                # What the page did after the click: request statuses and text it added
+                evidence = self.wait_policy.submission_evidence(baseline) if baseline else None
+                if evidence:
+                    verdict = submission_verdict(evidence, self.signal_matcher)
+                    self._submission_evidence = {**evidence, 'decided_by': verdict['decided_by'] if verdict else None}
+                    if verdict:
+                        return {key: value for key, value in verdict.items() if key != 'decided_by'}
+
+                # Wait for page changes or success messages
+                self.wait_policy.wait_for_settle('verify')
+            
+                # Check for success indicators
+                self._page_state = None
+                page = self._read_page()
+                if not page.get('url'):
+                    page['url'] = self.driver.current_url
+                return page_verdict(page, self._form_still_present)
+                
+            except Exception as e:
                 return {
                     'success': False,
-                    'error': 'Error messages detected on page'
-                }
-                
-        except Exception as e:
-            return {
-                'success': False,
-                'error': f'Error checking submission success: {str(e)}'
-            }
\ No newline at end of file
+                    'error': f'Error checking submission success: {str(e)}'
+                }
\ No newline at end of file
@@ -49,6 +49,25 @@ class ContactFormBotFacade:
         self.state.gpt_answerer_set = True
         logger.debug("GPT answerer set successfully")
 
+    def set_driver_factory(self, driver_factory):
+        logger.debug("Setting driver factory in facade")
+        if not callable(driver_factory):
+            raise ValueError("Driver factory must be callable.")
+        self.contact_manager.set_driver_factory(driver_factory)
+        logger.debug("Driver factory set successfully")
+
+    def set_browser_pool(self, browser_pool):
+        logger.debug("Setting browser pool in facade")
+        if browser_pool is None:
+            raise ValueError("Browser pool cannot be empty.")
+        self.contact_manager.set_browser_pool(browser_pool)
+        logger.debug("Browser pool set successfully")
+
+    def resolve_deferred_captchas(self, solver):
+        logger.debug("Resolving deferred CAPTCHA sites via facade")
+        self.state.validate_state(['parameters_set'])
+        return self.contact_manager.resolve_deferred_captchas(solver)
+
     def start_contact_campaign(self):
         logger.debug("Starting contact campaign via facade")
         self.state.validate_state(['parameters_set', 'gpt_answerer_set'])
@@ -1,12 +1,30 @@
 import time
 import random
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlparse
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException
 import src.utils as utils
 from src.contact_form_automator import ContactFormAutomator
+from src.fill_strategies import get_fill_strategy
+from src.rate_limiter import SubmissionRateLimiter
+from src.retry_queue import RetryPolicy, RetryQueue
+from src.result_sink import ResultSink, result_status
+from src.site_probe import SiteProbe
+from src.contact_page_discovery import ContactPageDiscovery
+from src.form_layout_cache import FormLayoutCache
+from src.selector_stats import SelectorStats
+from src.browser_profile import get_browser_profile
+from src.browser_session import BrowserSession
+from src.captcha_queue import CaptchaDeferralQueue
+from src.async_campaign import SUPPORTED_FILL_STRATEGIES, AsyncContactCampaign
+from src.site_context import DEFAULT_TOKEN_BUDGET
+from src.campaign_state import CampaignState, derive_campaign_id
+from src.contacted_domains import BloomFilter, ContactedDomainIndex
+from src.target_source import TargetSource
 from loguru import logger
 
 class ContactFormManager:
@@ -22,8 +40,35 @@ class ContactFormManager:
         self.output_file_directory = None
         self.contact_data = {}
         self.websites = []
-        self.submission_results = []
+        self.target_source = TargetSource()
+        self.target_chunk_size = 500
+        # Metadata of targets between ingestion and their recorded result, keyed by target
+        self._target_metadata = {}
         self.form_type_config = {}
+        self.fill_strategy = None
+        self.wait_policy_config = {}
+        self.driver_factory = None
+        self.browser_pool = None
+        self.max_workers = 1
+        self.result_sink = None
+        self.result_sink_config = {}
+        self.campaign_state = None
+        self.contacted_index = None
+        # Discovered contact URL -> the target it was found for, which keys the campaign state
+        self._target_origin = {}
+        self.rate_limiter = None
+        self.retry_policy = RetryPolicy(max_retries=0)
+        self.pre_probe_config = {}
+        self.discovery_config = {}
+        self.layout_cache = None
+        self.selector_stats = None
+        self.browser_profile = get_browser_profile()
+        self.session_config = {}
+        self.session_metrics = []
+        self.captcha_queue = None
+        self.browser_backend = 'selenium'
+        self.user_agent = None
+        self.context_token_budget = DEFAULT_TOKEN_BUDGET
         
         logger.info("Enhanced ContactFormManager initialized")
     
@@ -32,6 +77,14 @@ class ContactFormManager:
         """Set GPT answerer (adapted from original's set_gpt_answerer_and_resume_generator)"""
         self.gpt_answerer = gpt_answerer
 
+    def set_driver_factory(self, driver_factory: Callable):
+        """Set a callable returning a new WebDriver, used to give each parallel worker its own browser"""
+        self.driver_factory = driver_factory
+
+    def set_browser_pool(self, browser_pool):
+        """Set a pool of pre-warmed browser sessions for the parallel workers"""
+        self.browser_pool = browser_pool
+
     def set_parameters(self, parameters: Dict, output_dir: Path):
         """Set enhanced parameters for contact form automation"""
         logger.info("Setting enhanced parameters for ContactFormManager")
@@ -52,7 +105,11 @@ class ContactFormManager:
             'items_needed': parameters.get('items_needed')
         }
         
-        self.websites = parameters.get('websites', [])
+        self.websites = parameters.get('websites') or []
+        # Inline websites and/or a CSV, JSONL or txt targets_file, read lazily and fed
+        # through resume, dedup, discovery and the pre-probe target_chunk_size at a time
+        self.target_source = TargetSource(self.websites, parameters.get('targets_file'))
+        self.target_chunk_size = int(parameters.get('target_chunk_size', 500))
         self.form_types = parameters.get('form_types', {})
 
         self.output_file_directory = output_dir
@@ -61,137 +118,532 @@ class ContactFormManager:
         # Form type configurations
         self.form_type_config = parameters.get('form_types', {})
         
+        # How field values are typed (per_character, chunked or in_page)
+        self.fill_strategy = get_fill_strategy(parameters.get('fill_strategy'), parameters.get('fill_options'))
+        logger.info(f"Fill strategy: {self.fill_strategy.describe()}")
+        
+        # Per-step timeouts for the event-driven waits (navigate, scroll, submit, verify)
+        self.wait_policy_config = dict(parameters.get('wait_policy', {}) or {})
+        
+        # Browser profile the drivers were started with; 'performance' is headless,
+        # eager and blocks heavy resources, so waits may continue at DOMContentLoaded
+        self.browser_profile = get_browser_profile(parameters.get('browser_profile'), parameters.get('browser_options'))
+        if self.browser_profile['page_load_strategy'] == 'eager':
+            self.wait_policy_config.setdefault('min_ready_state', 'interactive')
+        
         # Rate limiting settings
         self.delay_between_submissions = parameters.get('delay_between_submissions', 30)
         self.max_submissions_per_hour = parameters.get('max_submissions_per_hour', 20)
+        # Budget shared by all workers: hourly window (optional burst), spacing and per domain.
+        # Only real submissions take a token, right before the submit click.
+        rate_limits = parameters.get('rate_limits', {}) or {}
+        self.rate_limiter = SubmissionRateLimiter(
+            self.max_submissions_per_hour, self.delay_between_submissions,
+            per_domain_per_hour=rate_limits.get('per_domain_per_hour'), burst=rate_limits.get('burst'),
+            prepare_lead=rate_limits.get('prepare_lead_seconds', 30)
+        )
+
+        # Contact page discovery for domain-only / homepage targets
+        self.discovery_config = parameters.get('contact_discovery', {}) or {}
+
+        # Transient failures (timeouts, crashed sessions, intercepted clicks) go back in
+        # the queue behind the fresh targets, with jittered exponential backoff
+        retry_config = parameters.get('retry', {}) or {}
+        self.retry_policy = RetryPolicy(
+            max_retries=int(parameters.get('max_retries', 3)),
+            base_delay=retry_config.get('base_delay', 30), max_delay=retry_config.get('max_delay', 900)
+        )
+
+        # Append-only JSONL result files: fsync cadence and the legacy JSON array export
+        self.result_sink_config = parameters.get('result_files', {}) or {}
+
+        # Per-target progress in SQLite, so an interrupted campaign resumes where it stopped
+        state_config = parameters.get('campaign_state', {}) or {}
+        if state_config.get('enabled'):
+            self.campaign_state = CampaignState(
+                state_config.get('path', output_dir / 'campaign_state.sqlite3'),
+                state_config.get('campaign_id') or derive_campaign_id(self.contact_data),
+                commit_every=state_config.get('commit_every', 50),
+                commit_interval=state_config.get('commit_interval', 2.0)
+            )
+            logger.info(f"Campaign state: {self.campaign_state.path} (campaign {self.campaign_state.campaign_id})")
+
+        # Domains contacted by any campaign; checked before discovery, probing or a browser
+        contacted_config = parameters.get('contacted_domains', {}) or {}
+        if contacted_config.get('enabled'):
+            self.contacted_index = ContactedDomainIndex(
+                contacted_config.get('path', output_dir / 'contacted_domains.sqlite3'),
+                cooldown_days=contacted_config.get('cooldown_days', 90),
+                expected_domains=contacted_config.get('expected_domains', 1_000_000),
+                outcomes=contacted_config.get('outcomes', ['success'])
+            )
+
+        # Static HTTP pre-probe that filters out sites without a usable form
+        self.pre_probe_config = parameters.get('pre_probe', {}) or {}
+
+        # Form layouts remembered per domain, replayed on later campaigns
+        layout_cache_config = parameters.get('form_layout_cache', {}) or {}
+        if layout_cache_config.get('enabled'):
+            self.layout_cache = FormLayoutCache(
+                layout_cache_config.get('path', output_dir / 'form_layout_cache.json'),
+                layout_cache_config.get('max_layouts_per_domain', 3)
+            )
+
+        # Per-selector hit counts, persisted across runs; selectors are evaluated most-hit first
+        selector_stats_config = parameters.get('selector_stats', {}) or {}
+        if selector_stats_config.get('enabled'):
+            self.selector_stats = SelectorStats(selector_stats_config.get('path', output_dir / 'selector_stats.json'))
+
+        # Recycle each browser after N sites or past an RSS limit, clear cookies/storage in between
+        self.session_config = parameters.get('session_recycling', {}) or {}
+
+        # Park CAPTCHA sites with their browser state instead of blocking a worker on them
+        captcha_config = parameters.get('captcha', {}) or {}
+        if captcha_config.get('defer', True):
+            self.captcha_queue = CaptchaDeferralQueue(
+                captcha_config.get('queue_path', output_dir / 'captcha_deferred.jsonl'))
+
+        # Number of isolated browser sessions working through the websites concurrently
+        # (with the playwright backend: pages in flight on one event loop)
+        self.max_workers = max(1, int(parameters.get('max_workers', 1)))
+        self.browser_backend = parameters.get('browser_backend') or 'selenium'
+        if self.browser_backend == 'playwright' and self.fill_strategy.name not in SUPPORTED_FILL_STRATEGIES:
+            raise ValueError(f"The playwright backend fills values in the page; set fill_strategy to one of: "
+                             f"{', '.join(SUPPORTED_FILL_STRATEGIES)} (got '{self.fill_strategy.name}')")
+        self.user_agent = parameters.get('user_agent')
+
+        # Website context sent to the LLM for personalization, capped at token_budget tokens
+        personalization_config = parameters.get('personalization', {}) or {}
+        self.context_token_budget = int(personalization_config.get('token_budget', DEFAULT_TOKEN_BUDGET))
 
         # This log should report the number of websites to contact
-        logger.info(f"Parameters set: {len(self.websites)} websites to contact")
+        logger.info(f"Parameters set: {self.target_source.describe()} to contact")
 
     def start_contact_campaign(self):
         """Start the enhanced contact form submission campaign"""
         logger.info("Starting enhanced contact form submission campaign")
-        # contact_params = self.parameters.get('contact_campaign', {})
-        # websites = contact_params.get('websites', [])
+        self.campaign_start_time = time.time()
         
-        self.contact_automator = ContactFormAutomator(self.driver, self.gpt_answerer, self.output_file_directory)
+        # Shared by every worker, like the rate limiter
+        self.result_sink = self._create_result_sink()
+        self.session_metrics = []
+
+        try:
+            # Lazy: the browsers start on the first chunk while later rows are still unread
+            websites = self._prepared_websites()
+            if self.browser_backend == 'playwright':
+                self._run_async(websites)
+            else:
+                self._run_selenium(websites)
+        finally:
+            self.result_sink.close()
+            if self.campaign_state:
+                self.campaign_state.flush()
+            if self.contacted_index:
+                self.contacted_index.save()
+
+        if self.layout_cache:
+            self.layout_cache.save()
+        if self.selector_stats:
+            self.selector_stats.save()
         
-        successful_submissions = 0
-        hourly_submissions = 0
-        hour_start_time = time.time()
+        # Generate enhanced campaign summary
+        self._generate_campaign_summary(self.result_sink.successful)
 
-        for i, website_url in enumerate(self.websites):
-            logger.info(f"Processing website {i+1}/{len(self.websites)}: {website_url}")
+    def _create_result_sink(self) -> ResultSink:
+        return ResultSink(
+            self.output_file_directory, fsync_every=self.result_sink_config.get('fsync_every', 50),
+            fsync_interval=self.result_sink_config.get('fsync_interval', 5.0),
+            export_json=self.result_sink_config.get('export_json', False)
+        )
 
-            try:
-                # Check hourly rate limit
-                if hourly_submissions >= self.max_submissions_per_hour:
-                    elapsed_time = time.time() - hour_start_time
-                    if elapsed_time < 3600:
-                        sleep_time = 3600 - elapsed_time
-                        logger.info(f"Hourly limit reached. Sleeping for {sleep_time/60:.1f} minutes")
-                        time.sleep(sleep_time)
-                        hourly_submissions = 0
-                        hour_start_time = time.time()
-                
-                # Submit contact form
-                result = self.contact_automator.submit_contact_form(website_url, self.contact_data)
-                
-                # Record result
-                self.submission_results.append(result)
-                self._write_result_to_file(result)
-                
+    def _create_automator(self, driver, captcha_solver=None) -> ContactFormAutomator:
+        return ContactFormAutomator(
+            driver, self.gpt_answerer, self.output_file_directory, fill_strategy=self.fill_strategy,
+            wait_policy_config=self.wait_policy_config, layout_cache=self.layout_cache,
+            selector_stats=self.selector_stats, collect_page_metrics=self.browser_profile['block_resources'],
+            defer_captchas=self.captcha_queue is not None, captcha_solver=captcha_solver,
+            context_token_budget=self.context_token_budget, rate_limiter=self.rate_limiter
+        )
+
+    def resolve_deferred_captchas(self, solver):
+        """Revisit every parked CAPTCHA site with its saved browser state and let `solver` clear it"""
+        entries = self.captcha_queue.pending() if self.captcha_queue else []
+        logger.info(f"Resolving {len(entries)} deferred CAPTCHA sites with the {solver.name} solver")
+        self.result_sink = self._create_result_sink()
+        automator = self._create_automator(self.driver, captcha_solver=solver)
+        unresolved = []
+        with self.result_sink:
+            for entry in entries:
+                try:
+                    self.captcha_queue.restore(self.driver, entry)
+                    result = automator.submit_contact_form(entry['website'], dict(self.contact_data))
+                except Exception as e:
+                    result = {'success': False, 'error': str(e), 'website': entry['website'],
+                              'submission_time': time.time()}
                 if result['success']:
-                    successful_submissions += 1
-                    hourly_submissions += 1
-                    logger.info(f"✅ Successfully submitted contact form for {website_url}")
-                    logger.info(f"   Form type: {result.get('form_type', 'unknown')}")
-                    logger.info(f"   Confirmation: {result.get('confirmation_message', 'N/A')}")
+                    logger.info(f"✅ Submitted {entry['website']} after solving its CAPTCHA")
                 else:
-                    logger.warning(f"❌ Failed to submit contact form for {website_url}: {result.get('error', 'Unknown error')}")
+                    logger.warning(f"❌ Still unresolved: {entry['website']}: {result.get('error')}")
+                    unresolved.append(entry)
+                self.result_sink.record({**result, 'deferred': False})
+                if self.contacted_index:
+                    self.contacted_index.record(entry['website'], result_status(result))
+        self.captcha_queue.replace(unresolved)
+        if self.contacted_index:
+            self.contacted_index.save()
+        logger.info(f"CAPTCHA batch finished: {len(entries) - len(unresolved)}/{len(entries)} submitted")
+        return {'submitted': len(entries) - len(unresolved), 'unresolved': len(unresolved)}
+
+    def _prepared_websites(self) -> Iterator[str]:
+        """Stream the targets chunk by chunk through resume, dedup, discovery and the pre-probe"""
+        # One fixed-size filter per run: memory does not grow with the number of targets
+        seen_domains = self.contacted_index.seen_filter() if self.contacted_index else None
+        for chunk in self.target_source.chunks(self.target_chunk_size):
+            metadata = {target['website']: target['metadata'] for target in chunk}
+            websites = list(metadata)
+            if self.campaign_state:
+                websites = self.campaign_state.pending(websites)
+            self._target_metadata.update({url: metadata[url] for url in websites if metadata[url]})
+            if self.contacted_index:
+                websites = self._skip_contacted(websites, seen_domains)
+            if self.discovery_config.get('enabled'):
+                websites = self._discover_contact_pages(websites)
+            if self.pre_probe_config.get('enabled'):
+                websites = self._pre_probe(websites)
+            yield from websites
+
+        logger.info(f"All targets read: {self.target_source.read} valid, {self.target_source.invalid} invalid")
+        if self.campaign_state and (self.campaign_state.resumed_done or self.campaign_state.resumed_in_flight):
+            logger.info(f"Resumed campaign {self.campaign_state.campaign_id}: {self.campaign_state.resumed_done} "
+                        f"targets already done, {self.campaign_state.resumed_in_flight} interrupted targets retried")
+
+    def _skip_contacted(self, websites: List[str], seen_domains: Optional[BloomFilter] = None) -> List[str]:
+        """Drop websites whose domain was contacted within the cooldown, or appears twice in this campaign"""
+        started = time.monotonic()
+        keep, skipped = self.contacted_index.filter(websites, seen_domains)
+        for entry in skipped:
+            logger.info(f"⏭️  Skipping {entry['website']}: {entry['reason']}")
+            self._record_result({
+                'success': False,
+                'skipped': True,
+                'skip_reason': 'already_contacted',
+                'error': entry['reason'],
+                'website': entry['website'],
+                'submission_time': time.time()
+            })
+        logger.debug(f"Contacted-domain check: {len(skipped)}/{len(websites)} websites skipped "
+                    f"in {time.monotonic() - started:.3f}s")
+        return keep
+
+    def _discover_contact_pages(self, websites: List[str]) -> List[str]:
+        """Replace bare domains and homepage URLs with their discovered contact page"""
+        targets = [url for url in websites if self._is_domain_only(url)]
+        if not targets:
+            return websites
+
+        options = {key: value for key, value in self.discovery_config.items() if key != 'enabled'}
+        discovery = ContactPageDiscovery(**options)
+        started = time.monotonic()
+        resolved = discovery.resolve(targets)
+        logger.info(
+            f"Contact page discovery resolved {sum(1 for url in resolved.values() if url)}/{len(targets)} "
+            f"domains in {time.monotonic() - started:.1f}s"
+        )
+
+        discovered = []
+        for website_url in websites:
+            if website_url in resolved:
+                contact_url = resolved[website_url]
+                if contact_url:
+                    logger.debug(f"Contact page for {website_url}: {contact_url}")
+                discovered.append(contact_url or self._homepage_url(website_url))
+                self._target_origin[discovered[-1]] = website_url
+            else:
+                discovered.append(website_url)
+        return discovered
+
+    @staticmethod
+    def _is_domain_only(website_url: str) -> bool:
+        """A homepage without a path (targets arrive normalized to https://host), left to discovery"""
+        parsed = urlparse(website_url if '://' in website_url else f"https://{website_url}")
+        return parsed.path in ('', '/')
+
+    @staticmethod
+    def _homepage_url(website_url: str) -> str:
+        return website_url if '://' in website_url else f"https://{website_url.strip('/')}/"
+
+    def _pre_probe(self, websites: List[str]) -> List[str]:
+        """Probe every website over plain HTTP and keep only those worth a browser visit"""
+        options = {key: value for key, value in self.pre_probe_config.items() if key != 'enabled'}
+        if 'skip' in options:
+            options['skip_statuses'] = options.pop('skip')
+        probe = SiteProbe(**options)
+        started = time.monotonic()
+        probe_results = probe.run(list(websites))
+
+        promising = []
+        for website_url in websites:
+            probe_result = probe_results[website_url]
+            if not probe.should_skip(probe_result):
+                promising.append(website_url)
+                continue
+            reason = probe_result['reason'] or probe_result['status']
+            logger.info(f"⏭️  Skipping {website_url}: {reason}")
+            self._record_result({
+                'success': False,
+                'skipped': True,
+                'skip_reason': probe_result['status'],
+                'error': reason,
+                'website': website_url,
+                'submission_time': time.time(),
+                'probe': probe_result
+            })
+
+        logger.info(
+            f"Pre-probe finished in {time.monotonic() - started:.1f}s: "
+            f"{len(promising)}/{len(websites)} websites have a usable form"
+        )
+        return promising
+
+    def _work_through(self, session: BrowserSession, targets: RetryQueue):
+        """Process targets until the queue is done; results are recorded once no retry follows"""
+        while True:
+            target = targets.next_target()
+            if target is None:
+                return
+            i, website_url, attempt = target
+            if self._held_for_budget(targets, i, website_url, attempt):
+                continue
+            result = self._process_website(session, i, website_url, attempt)
+            if targets.report(i, website_url, attempt, result) is None:
+                result['attempts'] = attempt + 1
+                self._record_result(result)
+
+    def _held_for_budget(self, targets: RetryQueue, i: int, website_url: str, attempt: int) -> bool:
+        """
+        Wait out the submission budget before the browser loads anything: a domain out of
+        tokens goes back in the queue until it has one (the worker moves on), and an
+        exhausted global budget is waited for here rather than in front of a filled form.
+        """
+        if not self.rate_limiter:
+            return False
+        domain_wait = self.rate_limiter.domain_wait(website_url)
+        if domain_wait > 0:
+            logger.info(f"⏳ {website_url}: domain submission budget used up; back in the queue for {domain_wait:.0f}s")
+            targets.defer(i, website_url, attempt, domain_wait)
+            return True
+        wait = self.rate_limiter.preparation_wait()
+        if wait > 0:
+            logger.info(f"Submission budget exhausted; waiting {wait:.0f}s before loading {website_url}")
+            time.sleep(wait)
+        return False
+
+    def _run_parallel(self, websites: Iterable[str], workers: int):
+        """Work through the websites with N isolated browser sessions"""
+        logger.info(f"Running campaign with {workers} parallel browser sessions")
+        targets = RetryQueue(websites, self.retry_policy)
+
+        def worker(worker_index: int):
+            # Worker 0 reuses the manager's driver; the others take a warm one from the pool or start their own
+            owns_driver = worker_index > 0 or self.driver is None
+            driver = self._acquire_driver() if owns_driver else self.driver
+            session = self._open_session(driver, owns_driver)
+            try:
+                self._work_through(session, targets)
+            finally:
+                self._close_session(session)
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="contact-worker") as executor:
+                for future in [executor.submit(worker, n) for n in range(workers)]:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Contact worker failed: {str(e)}")
+        finally:
+            targets.close()
+
+    def _run_selenium(self, websites: Iterable[str]):
+        """One WebDriver per worker: sequential on the manager's driver, or N parallel sessions"""
+        workers = self.max_workers
+        if workers > 1 and not (self.driver_factory or self.browser_pool):
+            logger.warning("No driver factory set; running with a single browser session")
+            workers = 1
+
+        if workers > 1:
+            self._run_parallel(websites, workers)
+        else:
+            session = self._open_session(self.driver, owns_driver=False)
+            self.contact_automator = session.automator
+            targets = RetryQueue(websites, self.retry_policy)
+            try:
+                self._work_through(session, targets)
+            finally:
+                targets.close()
+                self._close_session(session)
+
+    def _run_async(self, websites: Iterable[str]):
+        """Drive every website from one asyncio event loop with Playwright pages instead of WebDrivers"""
+        logger.info(f"Running campaign on the playwright backend with {self.max_workers} concurrent pages")
+        campaign = AsyncContactCampaign(
+            self._create_automator(None), concurrency=self.max_workers, profile=self.browser_profile,
+            wait_policy_config=self.wait_policy_config, user_agent=self.user_agent, rate_limiter=self.rate_limiter,
+            on_result=self._record_async_result, defer_captchas=self.captcha_queue is not None,
+            on_start=self._mark_started, retry_policy=self.retry_policy, metadata_for=self._metadata_for
+        )
+        campaign.run(websites, self.contact_data)
+
+    def _record_async_result(self, result: Dict):
+        browser_state = result.pop('browser_state', None)
+        if result.get('deferred'):
+            self.captcha_queue.park(result['website'], None, result['captcha'], result, browser_state=browser_state)
+        else:
+            self._log_result(result['website'], result)
+        self._record_result(result)
+
+    def _mark_started(self, website_url: str):
+        if self.campaign_state:
+            self.campaign_state.start(self._target_origin.get(website_url, website_url))
+
+    def _metadata_for(self, website_url: str) -> Optional[Dict]:
+        return self._target_metadata.get(self._target_origin.get(website_url, website_url))
+
+    def _record_result(self, result: Dict):
+        """Record a site's result, mark its target done and remember the domain if it was contacted"""
+        # The target is finished: drop what was kept for it, so memory stays flat on long target files
+        target = self._target_origin.pop(result['website'], result['website'])
+        metadata = self._target_metadata.pop(target, None)
+        if metadata:
+            result.setdefault('target_metadata', metadata)
+        self.result_sink.record(result)
+        if self.campaign_state:
+            self.campaign_state.finish(target, result_status(result))
+        if self.contacted_index:
+            self.contacted_index.record(target, result_status(result),
+                                        self.campaign_state.campaign_id if self.campaign_state else None)
+
+    def _open_session(self, driver, owns_driver: bool = True) -> BrowserSession:
+        can_respawn = bool(self.driver_factory or self.browser_pool)
+        if not can_respawn and self.session_config:
+            logger.warning("No driver factory set; browser sessions will not be recycled or respawned")
+        return BrowserSession(
+            driver, self._acquire_driver, self._release_driver, self._create_automator,
+            max_sites=self.session_config.get('max_sites_per_session', 0) if can_respawn else 0,
+            max_rss_mb=self.session_config.get('max_rss_mb', 0) if can_respawn else 0,
+            clear_state=self.session_config.get('clear_state_between_sites', True), owns_driver=owns_driver
+        )
+
+    def _close_session(self, session: BrowserSession):
+        """Release the session's driver unless it is still the caller-owned one it started with"""
+        session.close()
+        self.session_metrics.append(session.metrics)
+
+    def _acquire_driver(self):
+        return self.browser_pool.acquire() if self.browser_pool else self.driver_factory()
+
+    def _release_driver(self, driver, reusable: bool = True):
+        if self.browser_pool:
+            self.browser_pool.release(driver, reusable=reusable)
+        else:
+            driver.quit()
+
+    def _process_website(self, session: BrowserSession, i: int, website_url: str, attempt: int = 0) -> Dict:
+        """Submit one website's contact form and return the result; the automator takes the rate-limit token"""
+        retry_note = f" (retry {attempt}/{self.retry_policy.max_retries})" if attempt else ""
+        logger.info(f"Processing website {i+1}: {website_url}{retry_note}")
+        self._mark_started(website_url)
+        result = None
+        try:
+            session.before_site()
+            # Each site gets its own copy, so personalization never leaks between sites
+            metadata = self._metadata_for(website_url)
+            result = session.automator.submit_contact_form(website_url, dict(self.contact_data), metadata)
+            if session.after_site() and not result.get('success'):
+                # The browser died mid-site and was replaced; the retry queue decides whether the site
+                # gets another go (not once the submit click went out)
+                result['error'] = f"Browser session crashed: {result.get('error')}"
+            
+            if result.get('deferred'):
+                self.captcha_queue.park(website_url, session.driver, result['captcha'], result)
+            else:
+                self._log_result(website_url, result)
                 
-                # Delay between submissions
-                if i < len(self.websites) - 1:
-                    logger.info(f"Waiting {self.delay_between_submissions} seconds before next submission")
-                    time.sleep(self.delay_between_submissions)
-                    
-            except Exception as e:
-                logger.error(f"Unexpected error processing {website_url}: {str(e)}")
-                error_result = {
-                    'success': False,
-                    'error': str(e),
-                    'website': website_url,
-                    'submission_time': time.time()
-                }
-                self.submission_results.append(error_result)
-                self._write_result_to_file(error_result)
-        
-        # Generate enhanced campaign summary
-        self._generate_campaign_summary(successful_submissions)
+        except Exception as e:
+            logger.error(f"Unexpected error processing {website_url}: {str(e)}")
+            result = {
+                'success': False,
+                'error': str(e),
+                'website': website_url,
+                'submission_time': time.time()
+            }
+        return result
 
-    def _write_result_to_file(self, result: Dict):
-        """Write submission result to appropriate file with enhanced data"""
-        status = 'success' if result['success'] else 'failed'
-        file_path = self.output_file_directory / f"contact_submissions_{status}.json"
-        
-        # Prepare enhanced data for JSON storage
-        json_data = {
-            'website': result['website'],
-            'success': result['success'],
-            'form_type': result.get('form_type', 'unknown'),
-            'submission_time': result.get('submission_time', time.time()),
-            'contact_data': result.get('form_data', {}),
-            'error': result.get('error'),
-            'confirmation_message': result.get('confirmation_message'),
-            'required_fields_detected': result.get('required_fields', []),
-            'filled_fields': result.get('filled_fields', [])
-        }
-        
-        # Write to file
-        if not file_path.exists():
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump([json_data], f, indent=2)
+    @staticmethod
+    def _log_result(website_url: str, result: Dict):
+        if result['success']:
+            logger.info(f"✅ Successfully submitted contact form for {website_url}")
+            logger.info(f"   Form type: {result.get('form_type', 'unknown')}")
+            logger.info(f"   Confirmation: {result.get('confirmation_message', 'N/A')}")
         else:
-            with open(file_path, 'r+', encoding='utf-8') as f:
-                try:
-                    existing_data = json.load(f)
-                except json.JSONDecodeError:
-                    existing_data = []
-                existing_data.append(json_data)
-                f.seek(0)
-                json.dump(existing_data, f, indent=2)
-                f.truncate()
-        
-        logger.debug(f"Enhanced result written to {file_path}")
+            logger.warning(f"❌ Failed to submit contact form for {website_url}: {result.get('error', 'Unknown error')}")
+
+    def _session_summary(self) -> Dict:
+        recycles = {}
+        for metrics in self.session_metrics:
+            for reason, count in metrics['recycles'].items():
+                recycles[reason] = recycles.get(reason, 0) + count
+        peaks = [metrics['peak_rss_mb'] for metrics in self.session_metrics if metrics['peak_rss_mb'] is not None]
+        return {
+            'sessions': len(self.session_metrics),
+            'recycles': recycles,
+            'crashes': sum(metrics['crashes'] for metrics in self.session_metrics),
+            'state_resets': sum(metrics['state_resets'] for metrics in self.session_metrics),
+            'peak_rss_mb': max(peaks) if peaks else None
+        }
 
     def _generate_campaign_summary(self, successful_submissions: int):
         """Generate enhanced campaign summary with form type analytics"""
-        total_submissions = len(self.submission_results)
+        counts = self.result_sink.counts
+        skipped_websites = counts.get('skipped', 0)
+        deferred_websites = counts.get('deferred', 0)
+        total_submissions = counts.get('success', 0) + counts.get('failed', 0)
         success_rate = (successful_submissions / total_submissions * 100) if total_submissions > 0 else 0
-        
-        # Analyze form types
-        form_type_stats = {}
-        for result in self.submission_results:
-            form_type = result.get('form_type', 'unknown')
-            if form_type not in form_type_stats:
-                form_type_stats[form_type] = {'total': 0, 'successful': 0}
-            form_type_stats[form_type]['total'] += 1
-            if result['success']:
-                form_type_stats[form_type]['successful'] += 1
+        form_type_stats = self.result_sink.form_types
+        page_loads = self.result_sink.page_loads
         
         summary = {
             'campaign_summary': {
-                'total_websites': len(self.websites),
+                'total_websites': self.target_source.read,
+                'invalid_targets': self.target_source.invalid,
                 'total_submissions': total_submissions,
                 'successful_submissions': successful_submissions,
                 'failed_submissions': total_submissions - successful_submissions,
+                'skipped_websites': skipped_websites,
+                'deferred_captcha_websites': deferred_websites,
                 'success_rate': round(success_rate, 2),
                 'campaign_start_time': getattr(self, 'campaign_start_time', time.time()),
                 'campaign_end_time': time.time(),
                 'average_delay': self.delay_between_submissions,
-                'form_type_breakdown': form_type_stats
+                'retried_attempts': self.result_sink.retried_attempts,
+                'rate_limit_wait_seconds': round(self.rate_limiter.total_wait, 1) if self.rate_limiter else 0,
+                'form_type_breakdown': form_type_stats,
+                'selector_hit_rates': self.selector_stats.hit_rates() if self.selector_stats else {},
+                'browser_profile': self.browser_profile['name'],
+                'browser_backend': self.browser_backend,
+                'average_page_load_time': (round(page_loads['page_load_time'] / page_loads['sites'], 3)
+                                           if page_loads['sites'] else None),
+                'transferred_bytes': page_loads['transferred_bytes'],
+                'estimated_bytes_saved': page_loads['estimated_bytes_saved'],
+                'browser_sessions': self._session_summary(),
+                # Seconds (p50/p90/p99) and mean WebDriver round trips per phase of submit_contact_form
+                'phase_timings': self.result_sink.phase_timings.summary(),
+                # Targets of this campaign id across all runs, by outcome (in_flight: cut off mid-site)
+                'campaign_state': ({'campaign_id': self.campaign_state.campaign_id, **self.campaign_state.counts()}
+                                   if self.campaign_state else None)
             },
-            'results': self.submission_results
+            # Per-site results are in the JSONL files, not repeated here
+            'result_files': {status: str(self.result_sink.path_for(status)) for status in counts}
         }
         
         summary_file = self.output_file_directory / "campaign_summary.json"
@@ -204,4 +656,10 @@ class ContactFormManager:
             type_success_rate = (stats['successful'] / stats['total'] * 100) if stats['total'] > 0 else 0
             logger.info(f"  {form_type}: {stats['successful']}/{stats['total']} ({type_success_rate:.1f}%)")
         
+        phase_timings = summary['campaign_summary']['phase_timings']
+        if phase_timings:
+            logger.info("Time per phase (p50 / p90, mean round trips):")
+            for phase, stats in phase_timings.items():
+                logger.info(f"  {phase}: {stats['p50']}s / {stats['p90']}s, {stats['mean_round_trips']}")
+        
         logger.info(f"Enhanced summary saved to {summary_file}")
\ No newline at end of file
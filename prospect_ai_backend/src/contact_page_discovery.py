@@ -0,0 +1,220 @@
+import asyncio
+import json
+import re
+import threading
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urljoin, urlparse
+
+import httpx
+from loguru import logger
+
+from src.site_probe import CAPTCHA, FORM, SiteProbe
+
+
+COMMON_CONTACT_PATHS = [
+    '/contact', '/contact-us', '/contactus', '/contact.html', '/get-in-touch',
+    '/request-a-quote', '/quote', '/kontakt', '/contato', '/contacto',
+]
+
+# Keyword weights for link text and URL paths; higher is more likely the contact/quote page
+CONTACT_KEYWORDS = {
+    'contact us': 12, 'contact-us': 12, 'contactus': 12, 'contact': 10, 'get in touch': 9, 'get-in-touch': 9,
+    'request a quote': 9, 'request-a-quote': 9, 'quote': 7, 'rfq': 7, 'kontakt': 9, 'contato': 9, 'contacto': 9,
+    'enquiry': 6, 'inquiry': 6, 'fale conosco': 9, 'reach us': 6, 'support': 2,
+}
+_KEYWORD_RE = re.compile('|'.join(re.escape(k) for k in sorted(CONTACT_KEYWORDS, key=len, reverse=True)), re.IGNORECASE)
+_LOC_RE = re.compile(r'<loc>\s*([^<\s]+)\s*</loc>', re.IGNORECASE)
+
+SOURCE_BONUS = {'nav': 4, 'footer': 3, 'header': 3, 'body': 0, 'sitemap': 2, 'common_path': 1}
+FORM_BONUS = 20
+
+
+class _LinkCollector(HTMLParser):
+    """Collects <a href> links with their text and whether they sit in nav/header/footer."""
+
+    def __init__(self):
+        super().__init__()
+        self.links = []
+        self._regions = []
+        self._href = None
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('nav', 'header', 'footer'):
+            self._regions.append(tag)
+        elif tag == 'a':
+            self._href = dict(attrs).get('href')
+            self._text = []
+
+    def handle_endtag(self, tag):
+        if tag in ('nav', 'header', 'footer') and tag in self._regions:
+            self._regions.remove(tag)
+        elif tag == 'a' and self._href:
+            region = self._regions[-1] if self._regions else 'body'
+            self.links.append((self._href, ' '.join(self._text).strip(), region))
+            self._href = None
+
+    def handle_data(self, data):
+        if self._href is not None:
+            self._text.append(data.strip())
+
+
+class ContactPageDiscovery:
+    """
+    Finds the contact or quote page for domain-only targets without a browser.
+
+    Candidates come from the homepage nav/header/footer links, sitemap.xml and a
+    list of common paths. They are ranked by keyword and location, the best few
+    are fetched to confirm they contain a form, and the winner is cached per
+    domain with a TTL. A domain with no contact page found is cached for the
+    much shorter `negative_ttl_hours`, as that is often a passing timeout.
+    """
+
+    def __init__(self, concurrency: int = 20, timeout: float = 10.0, cache_path: Optional[Path] = None,
+                 ttl_hours: float = 24 * 7, verify_top: int = 3, user_agent: Optional[str] = None,
+                 negative_ttl_hours: float = 1):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.ttl = ttl_hours * 3600
+        self.negative_ttl = negative_ttl_hours * 3600
+        self.verify_top = verify_top
+        self.user_agent = user_agent or "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+        self._lock = threading.Lock()
+        self._cache = self._load_cache()
+
+    def resolve(self, domains: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Synchronous entry point: domain -> contact page URL (None when nothing was found)."""
+        results = asyncio.run(self.discover_all(list(domains)))
+        return {domain: result['contact_url'] for domain, result in results.items()}
+
+    async def discover_all(self, domains: List[str]) -> Dict[str, Dict]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(follow_redirects=True, timeout=self.timeout, limits=limits,
+                                     headers={'User-Agent': self.user_agent}) as client:
+            async def bounded(domain):
+                async with semaphore:
+                    return await self.discover(client, domain)
+
+            results = await asyncio.gather(*(bounded(domain) for domain in domains))
+        self._save_cache()
+        return dict(zip(domains, results))
+
+    async def discover(self, client: httpx.AsyncClient, domain: str) -> Dict:
+        domain = self.normalize_domain(domain)
+        cached = self._cached(domain)
+        if cached is not None:
+            return {'domain': domain, 'contact_url': cached['contact_url'], 'candidates': [], 'cached': True}
+
+        base_url = f"https://{domain}/"
+        homepage, sitemap = await asyncio.gather(self._get(client, base_url), self._get(client, urljoin(base_url, '/sitemap.xml')))
+        if homepage is not None:
+            base_url = str(homepage.url)
+        # A domain may redirect to another host (rebrand, ccTLD): links on either host count
+        site_host = (urlparse(base_url).hostname or domain).lower()
+
+        candidates: Dict[str, float] = {}
+
+        def add(url: str, score: float):
+            url = url.split('#')[0]
+            if (self._same_site(url, site_host) or self._same_site(url, domain)) and score > 0:
+                candidates[url] = max(candidates.get(url, 0), score)
+
+        if homepage is not None:
+            collector = _LinkCollector()
+            try:
+                collector.feed(homepage.text)
+            except Exception as e:
+                logger.debug(f"Homepage parse stopped early for {domain}: {e}")
+            for href, text, region in collector.links:
+                score = self._keyword_score(f"{text} {urlparse(href).path}")
+                if score:
+                    add(urljoin(base_url, href), score + SOURCE_BONUS[region])
+
+        if sitemap is not None:
+            for loc in _LOC_RE.findall(sitemap.text)[:5000]:
+                score = self._keyword_score(urlparse(loc).path)
+                if score:
+                    add(loc, score + SOURCE_BONUS['sitemap'])
+
+        for path in COMMON_CONTACT_PATHS:
+            add(urljoin(base_url, path), self._keyword_score(path) + SOURCE_BONUS['common_path'])
+
+        ranked = sorted(candidates.items(), key=lambda item: (-item[1], len(item[0])))
+        contact_url = await self._pick(client, ranked)
+        self._store(domain, contact_url)
+        return {'domain': domain, 'contact_url': contact_url, 'candidates': ranked[:10], 'cached': False}
+
+    async def _pick(self, client: httpx.AsyncClient, ranked: List) -> Optional[str]:
+        """Fetch the top candidates; prefer one whose HTML contains a usable form."""
+        top = ranked[:self.verify_top]
+        responses = await asyncio.gather(*(self._get(client, url) for url, _ in top))
+        reachable = []
+        for (url, score), response in zip(top, responses):
+            if response is None:
+                continue
+            has_form = SiteProbe.classify_html(response.text)['status'] in (FORM, CAPTCHA)
+            reachable.append((score + (FORM_BONUS if has_form else 0), str(response.url)))
+        if not reachable:
+            return None
+        return max(reachable, key=lambda item: item[0])[1]
+
+    async def _get(self, client: httpx.AsyncClient, url: str) -> Optional[httpx.Response]:
+        try:
+            response = await client.get(url)
+            return response if response.status_code < 400 else None
+        except httpx.HTTPError as e:
+            logger.debug(f"Discovery fetch failed for {url}: {e}")
+            return None
+
+    @staticmethod
+    def _keyword_score(text: str) -> int:
+        return max((CONTACT_KEYWORDS[m.group(0).lower()] for m in _KEYWORD_RE.finditer(text)), default=0)
+
+    @staticmethod
+    def normalize_domain(domain: str) -> str:
+        domain = domain.strip().lower()
+        if '://' in domain:
+            domain = urlparse(domain).hostname or domain
+        return domain.strip('/')
+
+    @staticmethod
+    def _same_site(url: str, domain: str) -> bool:
+        host = (urlparse(url).hostname or '').lower()
+        strip = lambda h: h[4:] if h.startswith('www.') else h
+        return strip(host) == strip(domain)
+
+    # ---- Per-domain cache with TTL ----
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        if not self.cache_path or not self.cache_path.exists():
+            return {}
+        try:
+            return json.loads(self.cache_path.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable discovery cache {self.cache_path}: {e}")
+            return {}
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        with self._lock:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps(self._cache, indent=2), encoding='utf-8')
+            tmp_path.replace(self.cache_path)
+
+    def _cached(self, domain: str) -> Optional[Dict]:
+        entry = self._cache.get(domain)
+        ttl = self.ttl if entry and entry['contact_url'] else self.negative_ttl
+        if entry and time.time() - entry['resolved_at'] < ttl:
+            return entry
+        return None
+
+    def _store(self, domain: str, contact_url: Optional[str]):
+        with self._lock:
+            self._cache[domain] = {'contact_url': contact_url, 'resolved_at': time.time()}
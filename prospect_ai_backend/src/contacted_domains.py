@@ -0,0 +1,194 @@
+import hashlib
+import math
+import os
+import sqlite3
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from src.form_layout_cache import domain_key
+
+BLOOM_MAGIC = b'PBF1'
+BLOOM_HEADER = struct.Struct('<4sQIQ')  # magic, bits, hash count, entries
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacted_domains (
+    domain TEXT PRIMARY KEY,
+    contacted_at REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    campaign_id TEXT,
+    website TEXT
+)
+"""
+
+
+def canonical_domain(url: str) -> str:
+    """Host without scheme, port, path or www., lower-cased: every URL variant of a company maps to one key."""
+    return domain_key(url.strip()).rstrip('.')
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings; saved as a small header plus the raw bit array."""
+
+    def __init__(self, bits: int, hashes: int, data: Optional[bytearray] = None, count: int = 0):
+        self.bits = max(8, bits)
+        self.hashes = max(1, hashes)
+        self.data = data if data is not None else bytearray((self.bits + 7) // 8)
+        self.count = count
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float = 0.001) -> 'BloomFilter':
+        capacity = max(1, capacity)
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        return cls(bits, round(bits / capacity * math.log(2)))
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.data[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.data[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def save(self, path: Path):
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(BLOOM_HEADER.pack(BLOOM_MAGIC, self.bits, self.hashes, self.count))
+            f.write(self.data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['BloomFilter']:
+        try:
+            with open(path, 'rb') as f:
+                magic, bits, hashes, count = BLOOM_HEADER.unpack(f.read(BLOOM_HEADER.size))
+                data = bytearray(f.read())
+        except (OSError, struct.error):
+            return None
+        if magic != BLOOM_MAGIC or len(data) != (bits + 7) // 8:
+            return None
+        return cls(bits, hashes, data, count)
+
+
+class ContactedDomainIndex:
+    """
+    Every domain contacted by any campaign, with when and how it went, in SQLite,
+    fronted by a Bloom filter file loaded at start-up. A domain the filter has
+    never seen (nearly every new prospect) is cleared without touching the
+    database; hits are confirmed there and blocked while inside `cooldown_days`.
+    """
+
+    def __init__(self, path: Path, cooldown_days: float = 90, expected_domains: int = 1_000_000,
+                 outcomes: Iterable[str] = ('success',)):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.bloom_path = self.path.with_suffix('.bloom')
+        self.cooldown = cooldown_days * 86400
+        self.outcomes = set(outcomes)
+        self.expected_domains = expected_domains
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+        self._bloom = self._load_bloom(expected_domains)
+
+    def seen_filter(self, error_rate: float = 1e-6) -> BloomFilter:
+        """
+        Domains met so far in one run, for filter(). A Bloom filter keeps its size
+        fixed however long the target list; at this error rate a new domain is
+        mistaken for a duplicate about once in a million.
+        """
+        return BloomFilter.for_capacity(self.expected_domains, error_rate)
+
+    def filter(self, websites: List[str], seen: Optional[BloomFilter] = None) -> Tuple[List[str], List[Dict]]:
+        """
+        Split websites into those to contact and those to skip: contacted within the
+        cooldown, or another URL of a domain already in `seen` (pass the same
+        seen_filter() for every chunk of a streamed campaign) or earlier in this list.
+        """
+        keep, skipped = [], []
+        seen = BloomFilter.for_capacity(len(websites), 1e-6) if seen is None else seen
+        suspects = {}
+        for website_url in websites:
+            domain = canonical_domain(website_url)
+            if domain in seen:
+                skipped.append({'website': website_url, 'domain': domain, 'reason': 'duplicate domain in this campaign'})
+                continue
+            seen.add(domain)
+            if domain in self._bloom:
+                suspects[domain] = website_url
+            keep.append(website_url)
+
+        recent = self._recently_contacted(list(suspects))
+        if recent:
+            keep = [url for url in keep if canonical_domain(url) not in recent]
+            for domain, (contacted_at, outcome) in recent.items():
+                day = time.strftime('%Y-%m-%d', time.localtime(contacted_at))
+                skipped.append({'website': suspects[domain], 'domain': domain, 'contacted_at': contacted_at,
+                                'outcome': outcome, 'reason': f"contacted on {day} ({outcome})"})
+        return keep, skipped
+
+    def record(self, website_url: str, outcome: str, campaign_id: Optional[str] = None):
+        """Remember a contact; outcomes outside `outcomes` (e.g. no form found) are not contacts."""
+        if outcome not in self.outcomes:
+            return
+        domain = canonical_domain(website_url)
+        with self._lock:
+            known = self._conn.execute('SELECT 1 FROM contacted_domains WHERE domain = ?', (domain,)).fetchone()
+            self._conn.execute(
+                'INSERT INTO contacted_domains (domain, contacted_at, outcome, campaign_id, website) '
+                'VALUES (?, ?, ?, ?, ?) ON CONFLICT (domain) DO UPDATE SET contacted_at = excluded.contacted_at, '
+                'outcome = excluded.outcome, campaign_id = excluded.campaign_id, website = excluded.website',
+                (domain, time.time(), outcome, campaign_id, website_url)
+            )
+            self._conn.commit()
+            if not known:
+                # Counted once per row, so a saved filter can be checked against the table on load
+                self._bloom.add(domain)
+
+    def save(self):
+        """Write the Bloom filter next to the database (rows are committed as they are recorded)."""
+        with self._lock:
+            self._bloom.save(self.bloom_path)
+
+    def _recently_contacted(self, domains: List[str]) -> Dict[str, Tuple[float, str]]:
+        if not domains or self.cooldown <= 0:
+            return {}
+        cutoff = time.time() - self.cooldown
+        found = {}
+        with self._lock:
+            # Bloom hits are few; check them in batches under SQLite's parameter limit
+            for start in range(0, len(domains), 500):
+                batch = domains[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT domain, contacted_at, outcome FROM contacted_domains "
+                    f"WHERE domain IN ({','.join('?' * len(batch))}) AND contacted_at >= ?", (*batch, cutoff)
+                ).fetchall()
+                found.update({domain: (contacted_at, outcome) for domain, contacted_at, outcome in rows})
+        return found
+
+    def _load_bloom(self, expected_domains: int) -> BloomFilter:
+        """The saved filter when it covers every row; otherwise rebuilt from the database (after a crash)."""
+        started = time.monotonic()
+        rows = self._conn.execute('SELECT COUNT(*) FROM contacted_domains').fetchone()[0]
+        bloom = BloomFilter.load(self.bloom_path)
+        if bloom is not None and bloom.count == rows:
+            logger.debug(f"Loaded contacted-domain filter ({rows} domains) in {time.monotonic() - started:.3f}s")
+            return bloom
+
+        bloom = BloomFilter.for_capacity(max(expected_domains, rows * 2))
+        for (domain,) in self._conn.execute('SELECT domain FROM contacted_domains'):
+            bloom.add(domain)
+        bloom.save(self.bloom_path)
+        logger.info(f"Rebuilt contacted-domain filter from {rows} domains in {time.monotonic() - started:.1f}s")
+        return bloom
@@ -0,0 +1,155 @@
+import re
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+from loguru import logger
+
+from src.form_snapshot import FormSnapshot, compile_selector
+from src.selector_stats import SelectorStats
+
+
+_SIMPLE_SELECTOR_RE = re.compile(
+    r'^(?P<tag>[a-z]+)?(?:'
+    r'#(?P<id>[\w-]+)'
+    r'|\.(?P<cls>[\w-]+)'
+    r'|\[(?P<attr>[\w-]+)(?P<op>\*?=)"(?P<value>[^"]*)"(?:\s+(?P<flag>i))?\]'
+    r')$'
+)
+
+_EMPTY_SNAPSHOT = FormSnapshot()
+
+
+class _Rule:
+    """A single selector from form_selectors, compiled to a regex over one attribute."""
+
+    __slots__ = ('field_type', 'rank', 'selector', 'tag', 'attr', 'pattern', 'exact', 'keyword', 'fallback')
+
+    def __init__(self, field_type: str, rank: int, selector: str):
+        self.field_type = field_type
+        self.rank = rank
+        self.selector = selector
+        self.tag: Optional[str] = None
+        self.attr: Optional[str] = None
+        self.pattern: Optional[Pattern] = None
+        self.exact = False
+        self.keyword = ''
+        self.fallback = None
+
+        match = _SIMPLE_SELECTOR_RE.match(selector)
+        if not match:
+            # Anything beyond tag + one attribute is evaluated by the generic matcher
+            self.fallback = compile_selector(selector)
+            return
+
+        self.tag = match.group('tag')
+        if match.group('id'):
+            self.attr, self.keyword, self.exact = 'id', match.group('id'), True
+            self.pattern = re.compile(re.escape(self.keyword) + r'\Z')
+        elif match.group('cls'):
+            self.attr, self.keyword = 'class', match.group('cls')
+            self.pattern = re.compile(r'(?:^|\s)' + re.escape(self.keyword) + r'(?:\s|$)')
+        else:
+            self.attr, self.keyword = match.group('attr').lower(), match.group('value')
+            flags = re.IGNORECASE if match.group('flag') else 0
+            self.exact = match.group('op') == '='
+            body = re.escape(self.keyword)
+            self.pattern = re.compile(body + r'\Z' if self.exact else body, flags)
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        if self.fallback is not None:
+            return self.fallback(record, _EMPTY_SNAPSHOT)
+        if self.tag and record.get('tag') != self.tag:
+            return False
+        value = record.get('attrs', {}).get(self.attr)
+        if value is None:
+            return False
+        return (self.pattern.match(value) if self.exact else self.pattern.search(value)) is not None
+
+
+class FieldClassifier:
+    """
+    Maps snapshot field records to field types in memory.
+
+    Built once from the automator's form_selectors: every selector becomes a
+    compiled regex over a single attribute (name, id, placeholder, aria-label,
+    autocomplete, type, ...), and the keywords behind them become one label-text
+    pattern per field type. With selector_stats the rules are evaluated most-hit
+    first; every rule keeps its table rank, so the outcome is the same.
+    """
+
+    def __init__(self, form_selectors: Dict[str, List[str]], selector_stats: Optional[SelectorStats] = None):
+        self.field_types = [field_type for field_type in form_selectors if field_type != 'submit']
+        self._rules: List[_Rule] = []
+        self._label_patterns: Dict[str, Pattern] = {}
+        self._label_ranks: Dict[str, int] = {}
+
+        for field_type in self.field_types:
+            selectors = form_selectors[field_type]
+            order = selector_stats.ordered(field_type, selectors) if selector_stats else enumerate(selectors)
+            rules = [_Rule(field_type, rank, selector) for rank, selector in order]
+            self._rules.extend(rules)
+
+            keywords = sorted({rule.keyword.lower() for rule in rules if rule.attr and rule.attr != 'type'
+                               and rule.keyword and '-' not in rule.keyword}, key=len, reverse=True)
+            if keywords:
+                # Whole words (or their plural) only: 'tel' must not match "Tell us about your project"
+                self._label_patterns[field_type] = re.compile(
+                    r'\b(?:' + '|'.join(re.escape(k) for k in keywords) + r')s?\b', re.IGNORECASE)
+            self._label_ranks[field_type] = len(selectors)
+
+        logger.debug(f"FieldClassifier compiled {len(self._rules)} selector rules for {len(self.field_types)} field types")
+
+    def candidates(self, record: Dict[str, Any]) -> List[Tuple[str, int, int]]:
+        """Every (field_type, rank, specificity) the record matches, attribute rules first."""
+        found: Dict[str, Tuple[str, int, int]] = {}
+        for rule in self._rules:
+            if not rule.matches(record):
+                continue
+            # The best (lowest) rank among the hits, whatever order the rules ran in;
+            # the longest keyword across all hits is the specificity. Attribute hits
+            # always outrank label-only hits.
+            specificity = 1000 + len(rule.keyword)
+            previous = found.get(rule.field_type)
+            if previous is None:
+                found[rule.field_type] = (rule.field_type, rule.rank, specificity)
+            else:
+                found[rule.field_type] = (rule.field_type, min(rule.rank, previous[1]), max(specificity, previous[2]))
+
+        label = record.get('label') or ''
+        if label:
+            for field_type, pattern in self._label_patterns.items():
+                if field_type in found:
+                    continue
+                match = pattern.search(label)
+                if match:
+                    found[field_type] = (field_type, self._label_ranks[field_type], len(match.group(0)))
+        return list(found.values())
+
+    def classify(self, record: Dict[str, Any]) -> Optional[str]:
+        """The single most specific field type for a record, or None."""
+        best = self.best_candidate(record)
+        return best[0] if best else None
+
+    def best_candidate(self, record: Dict[str, Any]) -> Optional[Tuple[str, int, int]]:
+        candidates = self.candidates(record)
+        if not candidates:
+            return None
+        # Longest keyword wins ('company' beats 'name' for company_name); ties go to table order
+        return max(candidates, key=lambda c: (c[2], -self.field_types.index(c[0])))
+
+    def classify_fields(self, records: List[Dict[str, Any]]) -> Dict[str, List[Tuple[int, Dict[str, Any]]]]:
+        """Group records by field type as (rank, record) pairs, preserving document order."""
+        grouped: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        for record in records:
+            best = self.best_candidate(record)
+            if best:
+                grouped.setdefault(best[0], []).append((best[1], record))
+        return grouped
+
+    def pick_fields(self, classified: Dict[str, List[Tuple[int, Dict[str, Any]]]]) -> Dict[str, Dict[str, Any]]:
+        """Choose one visible, enabled element per field type: best selector rank, then document order."""
+        chosen = {}
+        for field_type, ranked in classified.items():
+            usable = [(rank, record) for rank, record in ranked if record.get('visible') and record.get('enabled')]
+            if usable:
+                chosen[field_type] = min(usable, key=lambda item: item[0])[1]
+        return chosen
@@ -0,0 +1,184 @@
+import time
+import random
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+from loguru import logger
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.ui import Select
+
+
+# Sets the value (or replays keystrokes) inside the page and fires the events
+# frameworks listen for, all in a single round trip. The native value setter is
+# used so React/Vue controlled inputs notice the change.
+IN_PAGE_FILL_SCRIPT = """
+var el = arguments[0], value = arguments[1], emulateKeys = arguments[2];
+function setNativeValue(target, next) {
+    var proto = target.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype
+        : target.tagName === 'SELECT' ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(target, next);
+}
+function fire(type) { el.dispatchEvent(new Event(type, {bubbles: true})); }
+function key(type, ch) { el.dispatchEvent(new KeyboardEvent(type, {key: ch, bubbles: true, cancelable: true})); }
+function leave() {
+    fire('change');
+    el.dispatchEvent(new FocusEvent('blur'));
+    el.dispatchEvent(new FocusEvent('focusout', {bubbles: true}));
+    el.blur();
+}
+
+el.focus();
+if (el.tagName === 'SELECT') {
+    var wanted = value.trim().toLowerCase(), chosen = null, i;
+    for (i = 0; i < el.options.length && !chosen; i++) {
+        if (el.options[i].text.trim().toLowerCase() === wanted) chosen = el.options[i];
+    }
+    for (i = 0; i < el.options.length && !chosen; i++) {
+        if (el.options[i].text.toLowerCase().indexOf(wanted) !== -1) chosen = el.options[i];
+    }
+    if (!chosen) return false;
+    setNativeValue(el, chosen.value);
+    fire('input');
+    leave();
+    return true;
+}
+
+setNativeValue(el, '');
+if (emulateKeys) {
+    for (var j = 0; j < value.length; j++) {
+        var ch = value[j];
+        key('keydown', ch);
+        key('keypress', ch);
+        setNativeValue(el, el.value + ch);
+        el.dispatchEvent(new InputEvent('input', {bubbles: true, data: ch, inputType: 'insertText'}));
+        key('keyup', ch);
+    }
+} else {
+    setNativeValue(el, value);
+    el.dispatchEvent(new InputEvent('input', {bubbles: true, data: value, inputType: 'insertText'}));
+}
+leave();
+return true;
+"""
+
+
+class FillStrategy(ABC):
+    """Base class for the ways ContactFormAutomator can type into a field."""
+
+    name = 'base'
+
+    @abstractmethod
+    def fill(self, driver, element: WebElement, value: str, field_type: str, tag_name: str):
+        """Put `value` into `element`; `tag_name` is lower-case ('input', 'textarea', 'select')."""
+
+    def pause_between_fields(self):
+        """Hook for pacing between fields; fast strategies do not pause."""
+
+    def describe(self) -> Dict[str, any]:
+        return {'name': self.name}
+
+    @staticmethod
+    def _select_option(element: WebElement, value: str) -> bool:
+        """Select a dropdown option by exact, then partial, visible text."""
+        select = Select(element)
+        try:
+            select.select_by_visible_text(value)
+            logger.debug(f"Selected dropdown option: {value}")
+            return True
+        except Exception:
+            # If exact match fails, try partial match
+            for opt_text in [opt.text for opt in select.options]:
+                if value.lower() in opt_text.lower():
+                    select.select_by_visible_text(opt_text)
+                    logger.debug(f"Selected partial match: {opt_text}")
+                    return True
+        return False
+
+
+class PerCharacterFillStrategy(FillStrategy):
+    """One send_keys call per character with human-like delays (the original behaviour)."""
+
+    name = 'per_character'
+
+    def __init__(self, min_delay: float = 0.05, max_delay: float = 0.15):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+
+    def fill(self, driver, element: WebElement, value: str, field_type: str, tag_name: str):
+        if tag_name == 'select':
+            self._select_option(element, value)
+            return
+
+        # Clear existing value
+        element.clear()
+        time.sleep(0.2)
+
+        # Type the value with human-like delays
+        for char in value:
+            element.send_keys(char)
+            time.sleep(random.uniform(self.min_delay, self.max_delay))
+
+    def pause_between_fields(self):
+        time.sleep(random.uniform(0.5, 1.5))
+
+    def describe(self) -> Dict[str, any]:
+        return {'name': self.name, 'min_delay': self.min_delay, 'max_delay': self.max_delay}
+
+
+class ChunkedFillStrategy(FillStrategy):
+    """Real keyboard input, sent a chunk of characters per send_keys call."""
+
+    name = 'chunked'
+
+    def __init__(self, chunk_size: int = 64):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        self.chunk_size = chunk_size
+
+    def fill(self, driver, element: WebElement, value: str, field_type: str, tag_name: str):
+        if tag_name == 'select':
+            self._select_option(element, value)
+            return
+
+        element.clear()
+        for start in range(0, len(value), self.chunk_size):
+            element.send_keys(value[start:start + self.chunk_size])
+
+    def describe(self) -> Dict[str, any]:
+        return {'name': self.name, 'chunk_size': self.chunk_size}
+
+
+class InPageFillStrategy(FillStrategy):
+    """Sets the value (or emulates keystrokes) inside the browser in one execute_script call."""
+
+    name = 'in_page'
+
+    def __init__(self, emulate_keystrokes: bool = False):
+        self.emulate_keystrokes = emulate_keystrokes
+
+    def fill(self, driver, element: WebElement, value: str, field_type: str, tag_name: str):
+        if not driver.execute_script(IN_PAGE_FILL_SCRIPT, element, value, self.emulate_keystrokes):
+            logger.warning(f"No matching option for {field_type} value: {value}")
+
+    def describe(self) -> Dict[str, any]:
+        return {'name': self.name, 'emulate_keystrokes': self.emulate_keystrokes}
+
+
+FILL_STRATEGIES = {
+    PerCharacterFillStrategy.name: PerCharacterFillStrategy,
+    ChunkedFillStrategy.name: ChunkedFillStrategy,
+    InPageFillStrategy.name: InPageFillStrategy,
+}
+
+
+def get_fill_strategy(name: Optional[str] = None, options: Optional[Dict] = None) -> FillStrategy:
+    """Build a fill strategy from its config name; unknown or missing names fall back to per-character typing."""
+    if name and name not in FILL_STRATEGIES:
+        logger.warning(f"Unknown fill strategy '{name}' (expected one of: {', '.join(FILL_STRATEGIES)}); "
+                       f"falling back to {PerCharacterFillStrategy.name}")
+        name, options = None, None
+    name = name or PerCharacterFillStrategy.name
+    try:
+        return FILL_STRATEGIES[name](**(options or {}))
+    except TypeError as e:
+        raise ValueError(f"Invalid options for fill strategy '{name}': {e}")
@@ -0,0 +1,284 @@
+import html
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+from loguru import logger
+
+
+# Page flavours the corpus cycles through; each one exercises a different detection path
+SITE_KINDS = ('wpcf7', 'gravity', 'custom', 'asterisk_required', 'country_select', 'delayed_js',
+              'captcha', 'captcha_decoy')
+
+# Heading and intro per form type; the intro must not mention another type's keywords
+FORM_TYPE_COPY = {
+    'contact_us': ('Contact Us', 'Get in touch with our sales team.'),
+    'request_quote': ('Request Quote', 'Send us a quote request and we answer within a day.'),
+    'general_inquiry': ('General Inquiry', 'Questions about an order or a product? Write to us.'),
+}
+
+# Fields per kind: (field type, input name, label, tag, required)
+FIELD_LAYOUTS = {
+    'wpcf7': [('name', 'your-name', 'Your name', 'input', True), ('email', 'your-email', 'Your email', 'input', True),
+              ('subject', 'your-subject', 'Subject', 'input', False),
+              ('message', 'your-message', 'Your message', 'textarea', False)],
+    'gravity': [('name', 'input_1', 'Name', 'input', True), ('email', 'input_2', 'Email', 'input', True),
+                ('company', 'input_3', 'Company', 'input', False), ('message', 'input_4', 'Comments', 'textarea', False)],
+    'custom': [('name', 'fullname', 'Full name', 'input', True), ('email', 'email', 'Email', 'input', True),
+               ('phone', 'phone', 'Phone', 'input', False), ('company', 'company', 'Company', 'input', False),
+               ('message', 'message', 'Message', 'textarea', True)],
+    'asterisk_required': [('name', 'contact_name', 'Name', 'input', True), ('email', 'contact_email', 'Email', 'input', True),
+                          ('company', 'org', 'Company', 'input', True), ('message', 'details', 'Message', 'textarea', False)],
+    'country_select': [('name', 'name', 'Name', 'input', True), ('email', 'email', 'Email', 'input', True),
+                       ('country', 'country', 'Country', 'select', True),
+                       ('items_needed', 'items', 'What items do you need?', 'textarea', True)],
+}
+FIELD_LAYOUTS['delayed_js'] = FIELD_LAYOUTS['custom']
+FIELD_LAYOUTS['captcha'] = FIELD_LAYOUTS['custom']
+FIELD_LAYOUTS['captcha_decoy'] = FIELD_LAYOUTS['custom']
+
+COUNTRY_OPTIONS = [('', 'Select a country'), ('DE', 'Germany'), ('US', 'United States'), ('BR', 'Brazil')]
+
+AJAX_SUBMIT_SCRIPT = """
+<script>
+document.addEventListener('submit', function (event) {
+    var form = event.target;
+    event.preventDefault();
+    var output = document.getElementById('response-output');
+    fetch(form.action, {method: 'POST', body: new URLSearchParams(new FormData(form))})
+        .then(function (response) { return response.json(); })
+        .then(function (data) { output.textContent = data.message; form.style.display = data.ok ? 'none' : ''; });
+});
+</script>
+"""
+
+DELAYED_FORM_SCRIPT = """
+<script>
+setTimeout(function () {
+    document.getElementById('form-slot').innerHTML = %s;
+}, %d);
+</script>
+"""
+
+THANK_YOU_PAGE = """<!doctype html><html><head><title>Thanks</title></head>
+<body><h1>Thank you for contacting us</h1><p>We received your message.</p></body></html>"""
+
+ERROR_PAGE = """<!doctype html><html><head><title>Form</title></head>
+<body><h1>Something went wrong</h1><p class="error">Field is required: %s. Please try again.</p></body></html>"""
+
+
+def build_corpus(count: Optional[int] = None, seed: int = 0) -> List[Dict]:
+    """
+    Deterministic site specs with their ground truth. Cycles through SITE_KINDS,
+    varying the form type and whether the form posts classically or via fetch.
+    """
+    rng = random.Random(seed)
+    count = count or len(SITE_KINDS) * 3
+    corpus = []
+    for n in range(count):
+        kind = SITE_KINDS[n % len(SITE_KINDS)]
+        form_type = 'request_quote' if kind == 'country_select' else rng.choice(['contact_us', 'general_inquiry'])
+        fields = [{'type': field_type, 'name': name, 'label': label, 'tag': tag, 'required': required}
+                  for field_type, name, label, tag, required in FIELD_LAYOUTS[kind]]
+        corpus.append({
+            'id': f"site-{n:03d}",
+            'kind': kind,
+            'form_type': form_type,
+            # WPCF7 always answers over fetch; the rest either way
+            'submit_mode': 'ajax' if kind == 'wpcf7' else rng.choice(['classic', 'ajax']),
+            'render_delay_ms': rng.randint(200, 400) if kind == 'delayed_js' else 0,
+            'fields': fields,
+            'expected': {
+                'form_type': form_type,
+                'outcome': 'deferred' if kind == 'captcha' else 'submitted',
+                'fields': {field['type']: field['name'] for field in fields},
+                'probe_status': {'delayed_js': 'inconclusive', 'captcha': 'captcha'}.get(kind, 'form'),
+            },
+        })
+    return corpus
+
+
+def expected_value(field: Dict, contact_data: Dict[str, str]) -> str:
+    """What the server should receive for a field filled with contact_data."""
+    value = contact_data.get(field['type'], '')
+    if field['tag'] == 'select':
+        return next((code for code, text in COUNTRY_OPTIONS if text.lower() == value.lower()), value)
+    return value
+
+
+def _render_field(kind: str, index: int, field: Dict) -> str:
+    name, label, required = field['name'], html.escape(field['label']), field['required']
+    input_type = {'email': 'email', 'phone': 'tel'}.get(field['type'], 'text')
+    if field['tag'] == 'textarea':
+        control = f'<textarea name="{name}" id="f{index}" rows="5"{{attrs}}></textarea>'
+    elif field['tag'] == 'select':
+        options = ''.join(f'<option value="{code}">{text}</option>' for code, text in COUNTRY_OPTIONS)
+        control = f'<select name="{name}" id="f{index}"{{attrs}}>{options}</select>'
+    else:
+        control = f'<input type="{input_type}" name="{name}" id="f{index}"{{attrs}}>'
+
+    if kind == 'wpcf7':
+        attrs = ' class="wpcf7-form-control wpcf7-validates-as-required" aria-required="true"' if required else ' class="wpcf7-form-control"'
+        return (f'<p><label>{label}<br><span class="wpcf7-form-control-wrap">{control.format(attrs=attrs)}'
+                f'</span></label></p>')
+    if kind == 'gravity':
+        css = 'gfield gfield_contains_required' if required else 'gfield'
+        star = '<span class="gfield_required">*</span>' if required else ''
+        attrs = ' aria-required="true"' if required else ''
+        return (f'<li class="{css}"><label class="gfield_label" for="f{index}">{label}{star}</label>'
+                f'<div class="ginput_container">{control.format(attrs=attrs)}</div></li>')
+    if kind == 'asterisk_required':
+        # Required only by the asterisk in the label: no required attribute
+        star = ' *' if required else ''
+        return f'<div class="row"><label for="f{index}">{label}{star}</label>{control.format(attrs="")}</div>'
+    attrs = f' placeholder="{label}"' + (' required' if required else '')
+    return f'<div class="row"><label for="f{index}">{label}</label>{control.format(attrs=attrs)}</div>'
+
+
+def render_form(spec: Dict) -> str:
+    kind, action = spec['kind'], f"/site/{spec['id']}/submit"
+    fields = ''.join(_render_field(kind, i, field) for i, field in enumerate(spec['fields']))
+    if kind == 'wpcf7':
+        return (f'<div class="wpcf7"><form class="wpcf7-form" action="{action}" method="post">{fields}'
+                f'<p><input type="submit" value="Send" class="wpcf7-form-control wpcf7-submit"></p></form></div>')
+    if kind == 'gravity':
+        return (f'<div class="gform_wrapper"><form id="gform_1" action="{action}" method="post">'
+                f'<ul class="gform_fields">{fields}</ul><div class="gform_footer">'
+                f'<input type="submit" id="gform_submit_button_1" class="gform_button button" value="Submit"></div>'
+                f'</form></div>')
+    return (f'<form id="contact-form" action="{action}" method="post">{fields}'
+            f'<button type="submit" class="submit-btn">Send Message</button></form>')
+
+
+def render_page(spec: Dict) -> str:
+    heading, intro = FORM_TYPE_COPY[spec['form_type']]
+    form, scripts = render_form(spec), ''
+    if spec['kind'] == 'delayed_js':
+        # Markup escaped inside the script, as bundlers emit it: no <form> in the static HTML
+        scripts += DELAYED_FORM_SCRIPT % (json.dumps(form).replace('<', '\\u003c'), spec['render_delay_ms'])
+        form = '<div id="form-slot"><p>Loading form…</p></div>'
+    if spec['kind'] == 'captcha':
+        form += ('<div class="g-recaptcha" data-sitekey="farm-site-key" style="width:304px;height:78px">'
+                 '<iframe src="/static/recaptcha/anchor.html" width="304" height="78"></iframe></div>')
+    elif spec['kind'] == 'captcha_decoy':
+        # Invisible reCAPTCHA: present in the page but never blocks the submit
+        form += '<div class="g-recaptcha" data-sitekey="farm-site-key" data-size="invisible"></div>'
+    if spec['submit_mode'] == 'ajax':
+        output_class = 'wpcf7-response-output' if spec['kind'] == 'wpcf7' else 'form-response'
+        form += f'<div id="response-output" class="{output_class}" role="alert"></div>'
+        scripts += AJAX_SUBMIT_SCRIPT
+    return (f'<!doctype html><html><head><meta charset="utf-8"><title>{heading} | Fixture {spec["id"]}</title></head>'
+            f'<body><header><nav><a href="/">Home</a> <a href="/products">Products</a></nav></header>'
+            f'<main><h1>{heading}</h1><p>{intro}</p>{form}</main>'
+            f'<footer><p>Fixture Industries {spec["id"]}</p></footer>{scripts}</body></html>')
+
+
+class FixtureFarm:
+    """
+    Local HTTP server for a corpus from build_corpus: /site/<id>/ serves the page,
+    /site/<id>/submit checks the required fields and records what was posted.
+    Classic forms get a thank-you page (or an error page); fetch submissions get JSON.
+    """
+
+    def __init__(self, corpus: List[Dict], host: str = '127.0.0.1', port: int = 0):
+        self.corpus = corpus
+        self.sites = {spec['id']: spec for spec in corpus}
+        self.submissions: Dict[str, List[Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, spec: Dict) -> str:
+        return f"{self.base_url}/site/{spec['id']}/"
+
+    def start(self) -> 'FixtureFarm':
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fixture-farm", daemon=True)
+        self._thread.start()
+        logger.info(f"Fixture farm serving {len(self.corpus)} sites at {self.base_url}")
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self):
+        with self._lock:
+            self.submissions = {}
+
+    def last_submission(self, site_id: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            posted = self.submissions.get(site_id)
+            return posted[-1] if posted else None
+
+    def __enter__(self) -> 'FixtureFarm':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _record(self, site_id: str, values: Dict[str, str]):
+        with self._lock:
+            self.submissions.setdefault(site_id, []).append(values)
+
+    def _handler_class(self):
+        farm = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: str, content_type: str = 'text/html; charset=utf-8'):
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _site(self) -> Optional[Dict]:
+                parts = self.path.split('?')[0].strip('/').split('/')
+                return farm.sites.get(parts[1]) if len(parts) >= 2 and parts[0] == 'site' else None
+
+            def do_GET(self):
+                if self.path.startswith('/static/recaptcha/'):
+                    return self._send(200, '<html><body><div class="recaptcha-checkbox"></div></body></html>')
+                spec = self._site()
+                if spec is None:
+                    return self._send(404, '<h1>Not found</h1>')
+                if self.path.split('?')[0].rstrip('/').endswith('/thank-you'):
+                    return self._send(200, THANK_YOU_PAGE)
+                self._send(200, render_page(spec))
+
+            def do_POST(self):
+                spec = self._site()
+                if spec is None:
+                    return self._send(404, '<h1>Not found</h1>')
+                length = int(self.headers.get('Content-Length', 0))
+                posted = parse_qs(self.rfile.read(length).decode('utf-8'), keep_blank_values=True)
+                values = {name: posted[name][0] for name in posted}
+                farm._record(spec['id'], values)
+
+                missing = [field['label'] for field in spec['fields']
+                           if field['required'] and not values.get(field['name'], '').strip()]
+                if spec['submit_mode'] == 'ajax':
+                    message = (f"One or more fields have an error: {', '.join(missing)} is required." if missing
+                               else 'Thank you for your message. It has been sent.')
+                    return self._send(400 if missing else 200, json.dumps({'ok': not missing, 'message': message}),
+                                      'application/json')
+                if missing:
+                    return self._send(422, ERROR_PAGE % html.escape(', '.join(missing)))
+                self.send_response(303)
+                self.send_header('Location', f"/site/{spec['id']}/thank-you")
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+        return Handler
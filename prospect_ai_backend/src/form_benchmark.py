@@ -0,0 +1,118 @@
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from src.fixture_farm import FixtureFarm, expected_value
+from src.phase_timer import latency_summary, summarize_phase_timings
+
+
+BENCHMARK_CONTACT_DATA = {
+    'name': 'Jane Doe',
+    'email': 'jane.doe@example.com',
+    'phone': '+1-555-0100',
+    'company': 'Example Corp',
+    'subject': 'Partnership inquiry',
+    'message': 'Hello, we would like to learn more about your products.',
+    'country': 'United States',
+    'items_needed': 'Industrial pumps and seals',
+}
+
+def score_site(spec: Dict, result: Dict, submission: Optional[Dict[str, str]],
+               contact_data: Dict[str, str]) -> Dict:
+    """Compare one automator result and what the farm received with the site's ground truth."""
+    expected = spec['expected']
+    if result.get('deferred'):
+        outcome = 'deferred'
+    else:
+        outcome = 'submitted' if result.get('success') else 'failed'
+    field_errors = []
+    if expected['outcome'] == 'submitted':
+        for field in spec['fields']:
+            received = (submission or {}).get(field['name'])
+            if field['type'] in contact_data and received != expected_value(field, contact_data):
+                field_errors.append(field['type'])
+    return {
+        'site': spec['id'],
+        'kind': spec['kind'],
+        'form_type_ok': result.get('form_type') == expected['form_type'],
+        # Claimed success must match what the server actually accepted
+        'outcome_ok': outcome == expected['outcome'] and (outcome != 'submitted' or submission is not None),
+        'fields_ok': not field_errors,
+        'field_errors': field_errors,
+        'outcome': outcome,
+        'error': result.get('error'),
+    }
+
+
+def run_benchmark(farm: FixtureFarm, automator, contact_data: Optional[Dict[str, str]] = None) -> Dict:
+    """Submit every farm site once with `automator` and report throughput, latency and accuracy."""
+    contact_data = contact_data or BENCHMARK_CONTACT_DATA
+    farm.reset()
+    rows, totals, results = [], [], []
+    started = time.monotonic()
+    for spec in farm.corpus:
+        site_started = time.monotonic()
+        result = automator.submit_contact_form(farm.url_for(spec), dict(contact_data))
+        elapsed = time.monotonic() - site_started
+        totals.append(elapsed)
+        results.append(result)
+        row = score_site(spec, result, farm.last_submission(spec['id']), contact_data)
+        row['seconds'] = round(elapsed, 3)
+        rows.append(row)
+        logger.debug(f"{spec['id']} ({spec['kind']}): {row['outcome']} in {elapsed:.2f}s")
+    wall = time.monotonic() - started
+
+    def rate(key: str, subset: List[Dict]) -> float:
+        return round(sum(1 for row in subset if row[key]) / len(subset), 3) if subset else 0.0
+
+    by_kind = {}
+    for row in rows:
+        by_kind.setdefault(row['kind'], []).append(row)
+    return {
+        'sites': len(rows),
+        'wall_seconds': round(wall, 3),
+        'sites_per_hour': round(len(rows) / wall * 3600, 1) if wall else 0.0,
+        'latency': {**summarize_phase_timings(results), 'total': latency_summary(totals)},
+        'accuracy': {
+            'form_type': rate('form_type_ok', rows),
+            'outcome': rate('outcome_ok', rows),
+            'fields': rate('fields_ok', rows),
+        },
+        'by_kind': {kind: {'outcome': rate('outcome_ok', subset), 'fields': rate('fields_ok', subset)}
+                    for kind, subset in by_kind.items()},
+        'results': rows,
+    }
+
+
+def find_regressions(report: Dict, baseline: Dict, tolerance: float = 0.1) -> List[str]:
+    """
+    Everything that got worse than `baseline`: throughput or any phase's p90 latency
+    by more than `tolerance` (relative), accuracy by any amount.
+    """
+    regressions = []
+    if report['sites_per_hour'] < baseline['sites_per_hour'] * (1 - tolerance):
+        regressions.append(f"sites_per_hour {report['sites_per_hour']} < baseline {baseline['sites_per_hour']}")
+    for metric, value in baseline['accuracy'].items():
+        if report['accuracy'].get(metric, 0) < value - 1e-9:
+            regressions.append(f"accuracy.{metric} {report['accuracy'].get(metric, 0)} < baseline {value}")
+    for phase, values in baseline['latency'].items():
+        current = report['latency'].get(phase)
+        if current and current['p90'] > values['p90'] * (1 + tolerance) and current['p90'] - values['p90'] > 0.05:
+            regressions.append(f"latency.{phase}.p90 {current['p90']}s > baseline {values['p90']}s")
+    return regressions
+
+
+def load_baseline(path: Path) -> Optional[Dict]:
+    path = Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def save_report(report: Dict, path: Path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2), encoding='utf-8')
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from src.form_snapshot import FIELD_QUERY, LOCATOR_FUNCTIONS, SKIPPED_INPUT_TYPES
+
+
+# One round trip: find the stored form, re-compute its signature and resolve
+# every stored field / submit path. Returns null when the form path is gone.
+REPLAY_SCRIPT = LOCATOR_FUNCTIONS + """
+var formPath = arguments[0], paths = arguments[1], fieldQuery = arguments[2], skippedTypes = arguments[3];
+var form = null;
+try { form = document.querySelector(formPath); } catch (e) { return null; }
+if (!form) return null;
+var elements = paths.map(function (path) {
+    try { return document.querySelector(path); } catch (e) { return null; }
+});
+return {signature: formSignature(form, fieldQuery, skippedTypes), elements: elements};
+"""
+
+
+def layout_fingerprint(signature: str) -> str:
+    """Short stable hash of a form's raw signature."""
+    return hashlib.sha1(signature.encode('utf-8')).hexdigest()[:16]
+
+
+def domain_key(url: str) -> str:
+    host = (urlparse(url if '://' in url else f"https://{url}").hostname or url).lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class FormLayoutCache:
+    """
+    Persistent per-domain cache of form layouts that led to a successful submission.
+
+    Each entry is keyed by the domain and the form fingerprint, and holds the CSS
+    paths of the form, the fields of every detected type and the submit button,
+    plus the required fields. Replaying an entry costs one script call; any
+    fingerprint mismatch or missing element means the caller runs full discovery.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_layouts_per_domain: int = 3):
+        self.path = Path(path) if path else None
+        self.max_layouts_per_domain = max_layouts_per_domain
+        self._lock = threading.Lock()
+        self._layouts = self._load()
+
+    def layouts_for(self, url: str) -> List[Dict[str, Any]]:
+        """Cached layouts for the URL's domain, most recently used first."""
+        with self._lock:
+            layouts = list(self._layouts.get(domain_key(url), {}).values())
+        return sorted(layouts, key=lambda layout: layout.get('used_at', 0), reverse=True)
+
+    def replay(self, driver, layout: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a cached layout on the current page. Returns the form, field and
+        submit elements when the live form still has the cached fingerprint.
+        """
+        field_types = list(layout['fields'])
+        paths = [layout['fields'][field_type]['path'] for field_type in field_types] + [layout['submit_path']]
+        try:
+            found = driver.execute_script(REPLAY_SCRIPT, layout['form_path'], paths, FIELD_QUERY, SKIPPED_INPUT_TYPES)
+        except Exception as e:
+            logger.debug(f"Layout replay failed: {e}")
+            return None
+        if not found or layout_fingerprint(found['signature']) != layout['fingerprint']:
+            return None
+
+        elements = list(found['elements'])
+        submit_element = elements.pop()
+        if submit_element is None or any(element is None for element in elements):
+            return None
+        return {'fields': dict(zip(field_types, elements)), 'submit_element': submit_element}
+
+    def store(self, url: str, layout: Dict[str, Any]):
+        """Remember a layout for the URL's domain and persist the cache."""
+        domain = domain_key(url)
+        with self._lock:
+            layouts = self._layouts.setdefault(domain, {})
+            previous = layouts.get(layout['fingerprint'], {})
+            layouts[layout['fingerprint']] = dict(layout, used_at=time.time(), hits=previous.get('hits', 0))
+            if len(layouts) > self.max_layouts_per_domain:
+                oldest = min(layouts, key=lambda key: layouts[key]['used_at'])
+                del layouts[oldest]
+        self.save()
+
+    def mark_used(self, url: str, fingerprint: str):
+        with self._lock:
+            layout = self._layouts.get(domain_key(url), {}).get(fingerprint)
+            if layout:
+                layout['used_at'] = time.time()
+                layout['hits'] = layout.get('hits', 0) + 1
+
+    def forget(self, url: str, fingerprint: str):
+        with self._lock:
+            self._layouts.get(domain_key(url), {}).pop(fingerprint, None)
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps(self._layouts, indent=2), encoding='utf-8')
+            tmp_path.replace(self.path)
+
+    def _load(self) -> Dict[str, Dict[str, Dict]]:
+        if not self.path or not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable form layout cache {self.path}: {e}")
+            return {}
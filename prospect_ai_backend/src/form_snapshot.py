@@ -0,0 +1,352 @@
+import json
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+
+# Elements that may act as the "form" we fill. Plain <form> elements plus the
+# wrapper classes/ids that _find_form_element has always accepted.
+CONTAINER_QUERY = 'form, .contact-form, .quote-form, .inquiry-form, .wpcf7-form, #contact-form, #contactForm'
+FIELD_QUERY = 'input, textarea, select'
+BUTTON_QUERY = 'button, input[type="submit"], input[type="button"], input[type="image"], .submit-btn'
+SKIPPED_INPUT_TYPES = ['hidden', 'submit', 'button', 'image', 'reset']
+
+# Shared by the snapshot and the layout replay: a stable CSS path for an element
+# and the raw signature of a form (tag:type:name:id of each fillable field).
+LOCATOR_FUNCTIONS = """
+function cssPath(el) {
+    var parts = [];
+    for (var node = el; node && node.nodeType === 1 && node !== document.documentElement; node = node.parentElement) {
+        if (node.id && document.getElementById(node.id) === node) {
+            parts.unshift('#' + CSS.escape(node.id));
+            break;
+        }
+        var index = 1;
+        for (var sib = node.previousElementSibling; sib; sib = sib.previousElementSibling) {
+            if (sib.tagName === node.tagName) index++;
+        }
+        parts.unshift(node.tagName.toLowerCase() + ':nth-of-type(' + index + ')');
+    }
+    return parts.join(' > ');
+}
+function formSignature(form, fieldQuery, skippedTypes) {
+    var parts = [];
+    form.querySelectorAll(fieldQuery).forEach(function (el) {
+        var type = (el.getAttribute('type') || '').toLowerCase();
+        if (el.tagName === 'INPUT' && skippedTypes.indexOf(type) !== -1) return;
+        parts.push([el.tagName.toLowerCase(), type, el.getAttribute('name') || '', el.getAttribute('id') || ''].join(':'));
+    });
+    return parts.join('|');
+}
+"""
+
+# One round trip: walk the DOM once, register every interesting element in a
+# page-side array and return a JSON description of all of them.
+SNAPSHOT_SCRIPT = LOCATOR_FUNCTIONS + """
+var containerQuery = arguments[0], fieldQuery = arguments[1], buttonQuery = arguments[2];
+var skippedTypes = arguments[3];
+var registry = [];
+var MAX_VALUE = 200;
+// URLs are kept whole: selectors like form[action*="contact"] may match on any part
+var UNCLIPPED = {action: true, href: true};
+
+function clip(value) {
+    value = (value || '').replace(/\\s+/g, ' ').trim();
+    return value.length > MAX_VALUE ? value.slice(0, MAX_VALUE) : value;
+}
+function visible(el) {
+    if (!el.getClientRects().length) return false;
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' && parseFloat(style.opacity || '1') > 0;
+}
+function attrs(el) {
+    var out = {};
+    for (var i = 0; i < el.attributes.length; i++) {
+        var name = el.attributes[i].name.toLowerCase();
+        out[name] = UNCLIPPED[name] ? el.attributes[i].value : clip(el.attributes[i].value);
+    }
+    return out;
+}
+function classes(el) {
+    return (el.getAttribute('class') || '').split(/\\s+/).filter(Boolean);
+}
+function labelText(el) {
+    var parts = [];
+    if (el.labels) {
+        for (var i = 0; i < el.labels.length; i++) parts.push(el.labels[i].innerText);
+    }
+    var labelledBy = el.getAttribute('aria-labelledby');
+    if (labelledBy) {
+        labelledBy.split(/\\s+/).forEach(function (id) {
+            var node = document.getElementById(id);
+            if (node) parts.push(node.innerText);
+        });
+    }
+    return clip(parts.join(' '));
+}
+function register(el, record) {
+    record.ref = registry.length;
+    registry.push(el);
+    return record;
+}
+
+var containerEls = Array.prototype.slice.call(document.querySelectorAll(containerQuery));
+function containersOf(el) {
+    var refs = [];
+    for (var i = 0; i < containerEls.length; i++) {
+        if (containerEls[i] !== el && containerEls[i].contains(el)) refs.push(containers[i].ref);
+    }
+    return refs;
+}
+
+var containers = containerEls.map(function (el) {
+    var ancestors = [];
+    for (var node = el.parentElement; node && node !== document.body; node = node.parentElement) {
+        ancestors = ancestors.concat(classes(node));
+    }
+    return register(el, {
+        kind: 'container', tag: el.tagName.toLowerCase(), attrs: attrs(el), classes: classes(el),
+        ancestor_classes: ancestors, visible: visible(el),
+        input_count: el.getElementsByTagName('input').length,
+        path: cssPath(el), signature: formSignature(el, fieldQuery, skippedTypes)
+    });
+});
+
+var requiredContainerFirst = new Set();
+containerEls.forEach(function (container) {
+    container.querySelectorAll('[class*="required"]').forEach(function (node) {
+        var first = node.querySelector('input, textarea, select');
+        if (first) requiredContainerFirst.add(first);
+    });
+});
+
+var fields = [];
+document.querySelectorAll(fieldQuery).forEach(function (el) {
+    var type = (el.getAttribute('type') || '').toLowerCase();
+    if (el.tagName === 'INPUT' && skippedTypes.indexOf(type) !== -1) return;
+    var label = labelText(el);
+    var record = {
+        kind: 'field', tag: el.tagName.toLowerCase(), attrs: attrs(el), classes: classes(el),
+        label: label, visible: visible(el), enabled: !el.disabled && !el.readOnly,
+        required: el.required || el.getAttribute('aria-required') === 'true',
+        label_asterisk: label.indexOf('*') !== -1,
+        required_container: requiredContainerFirst.has(el),
+        containers: containersOf(el), path: cssPath(el)
+    };
+    if (el.tagName === 'SELECT') {
+        record.options = Array.prototype.slice.call(el.options, 0, 300).map(function (o) { return clip(o.text); });
+    }
+    fields.push(register(el, record));
+});
+
+var buttons = [];
+document.querySelectorAll(buttonQuery).forEach(function (el) {
+    var text = el.tagName === 'INPUT' ? el.value : el.textContent;
+    buttons.push(register(el, {
+        kind: 'button', tag: el.tagName.toLowerCase(), attrs: attrs(el), classes: classes(el),
+        text: clip(text), visible: visible(el), enabled: !el.disabled,
+        containers: containersOf(el), path: cssPath(el)
+    }));
+});
+
+var labels = [];
+document.querySelectorAll('label').forEach(function (el) {
+    labels.push({
+        kind: 'label', text: clip(el.innerText), 'for': el.getAttribute('for') || '',
+        containers: containersOf(el)
+    });
+});
+
+window.__prospectAiSnapshot = registry;
+return JSON.stringify({url: location.href, containers: containers, fields: fields, buttons: buttons, labels: labels});
+"""
+
+RESOLVE_SCRIPT = """
+var registry = window.__prospectAiSnapshot || [];
+return arguments[0].map(function (ref) {
+    var el = registry[ref];
+    return el && el.isConnected ? el : null;
+});
+"""
+
+
+class FormSnapshot:
+    """
+    In-memory description of every form, field, label and button on a page,
+    captured with a single execute_script call.
+    """
+
+    def __init__(self, payload: Optional[Dict[str, Any]] = None):
+        payload = payload or {}
+        self.url = payload.get('url', '')
+        self.containers: List[Dict[str, Any]] = payload.get('containers', [])
+        self.fields: List[Dict[str, Any]] = payload.get('fields', [])
+        self.buttons: List[Dict[str, Any]] = payload.get('buttons', [])
+        self.labels: List[Dict[str, Any]] = payload.get('labels', [])
+
+    @classmethod
+    def capture(cls, driver) -> 'FormSnapshot':
+        """Take a snapshot of the current page. Returns an empty snapshot on failure."""
+        try:
+            raw = driver.execute_script(SNAPSHOT_SCRIPT, CONTAINER_QUERY, FIELD_QUERY, BUTTON_QUERY, SKIPPED_INPUT_TYPES)
+            snapshot = cls(json.loads(raw) if raw else None)
+            logger.debug(
+                f"Form snapshot: {len(snapshot.containers)} containers, {len(snapshot.fields)} fields, "
+                f"{len(snapshot.buttons)} buttons"
+            )
+            return snapshot
+        except Exception as e:
+            logger.warning(f"Failed to capture form snapshot: {e}")
+            return cls()
+
+    def resolve(self, driver, records: List[Optional[Dict[str, Any]]]) -> List[Optional[Any]]:
+        """Turn snapshot records back into WebElements with one round trip."""
+        refs = [record['ref'] if record else -1 for record in records]
+        if not refs:
+            return []
+        try:
+            return list(driver.execute_script(RESOLVE_SCRIPT, refs))
+        except Exception as e:
+            logger.warning(f"Failed to resolve snapshot elements: {e}")
+            return [None] * len(refs)
+
+    def within(self, container: Dict[str, Any], records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Records that live inside the given container, in document order."""
+        ref = container['ref']
+        return [record for record in records if ref in record.get('containers', [])]
+
+    def fields_in(self, container: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return self.within(container, self.fields)
+
+    def buttons_in(self, container: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return self.within(container, self.buttons)
+
+    def labels_in(self, container: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return self.within(container, self.labels)
+
+    def descendants(self, container: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return self.fields_in(container) + self.buttons_in(container)
+
+
+# ---- CSS selector evaluation against snapshot records ----
+
+Matcher = Callable[[Dict[str, Any], FormSnapshot], bool]
+
+_COMPOUND_RE = re.compile(
+    r'(?P<tag>^[a-zA-Z][\w-]*)'
+    r'|#(?P<id>[\w-]+)'
+    r'|\.(?P<cls>[\w-]+)'
+    r'|\[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[*^$~|]?=)\s*"(?P<value>[^"]*)"\s*(?P<flag>i)?)?\s*\]'
+    r'|:contains\(\s*"(?P<contains>[^"]*)"\s*\)'
+    r'|:has\((?P<has>.+)\)$'
+)
+
+
+def _split_descendants(selector: str) -> List[str]:
+    """Split a selector on descendant combinators, ignoring spaces inside [] / () / quotes."""
+    parts, depth, quoted, current = [], 0, False, ''
+    for char in selector.strip():
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char in '[(':
+            depth += 1
+        elif not quoted and char in '])':
+            depth -= 1
+        if char == ' ' and depth == 0 and not quoted:
+            if current:
+                parts.append(current)
+            current = ''
+            continue
+        current += char
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _attr_test(op: Optional[str], expected: str, ignore_case: bool) -> Callable[[Optional[str]], bool]:
+    if ignore_case:
+        expected = expected.lower()
+
+    def test(actual: Optional[str]) -> bool:
+        if actual is None:
+            return False
+        if op is None:
+            return True
+        if ignore_case:
+            actual = actual.lower()
+        if op == '=':
+            return actual == expected
+        if op == '*=':
+            return bool(expected) and expected in actual
+        if op == '^=':
+            return bool(expected) and actual.startswith(expected)
+        if op == '$=':
+            return bool(expected) and actual.endswith(expected)
+        if op == '~=':
+            return expected in actual.split()
+        if op == '|=':
+            return actual == expected or actual.startswith(expected + '-')
+        return False
+
+    return test
+
+
+def _compile_compound(compound: str) -> Matcher:
+    checks: List[Matcher] = []
+    position = 0
+    while position < len(compound):
+        match = _COMPOUND_RE.match(compound, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Unsupported selector syntax: {compound!r}")
+        position = match.end()
+
+        if match.group('tag'):
+            tag = match.group('tag').lower()
+            checks.append(lambda r, s, tag=tag: r.get('tag') == tag)
+        elif match.group('id'):
+            element_id = match.group('id')
+            checks.append(lambda r, s, element_id=element_id: r.get('attrs', {}).get('id') == element_id)
+        elif match.group('cls'):
+            cls = match.group('cls')
+            checks.append(lambda r, s, cls=cls: cls in r.get('classes', []))
+        elif match.group('attr'):
+            attr = match.group('attr').lower()
+            test = _attr_test(match.group('op'), match.group('value') or '', bool(match.group('flag')))
+            checks.append(lambda r, s, attr=attr, test=test: test(r.get('attrs', {}).get(attr)))
+        elif match.group('contains') is not None:
+            text = match.group('contains')
+            checks.append(lambda r, s, text=text: text in r.get('text', ''))
+        elif match.group('has'):
+            inner = compile_selector(match.group('has'))
+            checks.append(lambda r, s, inner=inner: any(inner(d, s) for d in s.descendants(r)))
+
+    return lambda record, snapshot: all(check(record, snapshot) for check in checks)
+
+
+@lru_cache(maxsize=None)
+def compile_selector(selector: str) -> Matcher:
+    """
+    Compile the subset of CSS used by ContactFormAutomator into a predicate over
+    snapshot records. Only a trailing descendant combinator on an ancestor class
+    is supported (e.g. '.gform_wrapper form'), which covers our selector tables.
+    """
+    try:
+        parts = _split_descendants(selector)
+        target = _compile_compound(parts[-1])
+        ancestor_classes = []
+        for ancestor in parts[:-1]:
+            if not re.fullmatch(r'\.[\w-]+', ancestor):
+                raise ValueError(f"Unsupported ancestor selector: {ancestor!r}")
+            ancestor_classes.append(ancestor[1:])
+    except ValueError as e:
+        logger.debug(f"Selector {selector!r} cannot be evaluated against a snapshot: {e}")
+        return lambda record, snapshot: False
+
+    def matcher(record: Dict[str, Any], snapshot: FormSnapshot) -> bool:
+        if not target(record, snapshot):
+            return False
+        return all(cls in record.get('ancestor_classes', []) for cls in ancestor_classes)
+
+    return matcher
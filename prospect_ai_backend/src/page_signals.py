@@ -0,0 +1,158 @@
+import re
+from typing import Callable, Dict, List, Optional
+
+from loguru import logger
+
+
+# Checked in order; the first form type with a hit wins
+FORM_TYPE_KEYWORDS = {
+    'contact_us': ['contact us', 'contact-us', 'get in touch', 'reach us'],
+    'request_quote': ['request quote', 'quote request', 'get quote', 'rfq'],
+    'general_inquiry': ['inquiry', 'send message', 'contact form'],
+}
+
+SUCCESS_KEYWORDS = [
+    'thank you', 'message sent', 'form submitted', 'success',
+    'confirmation', 'we received your message', 'thank you for contacting',
+    'thank you for your inquiry', 'your request has been submitted',
+    'quote request received', 'we will contact you soon'
+]
+
+ERROR_KEYWORDS = ['error', 'failed', 'invalid', 'required', 'please try again', 'field is required']
+
+# One round trip for everything the page-level checks need: visible text instead of the raw HTML
+PAGE_STATE_SCRIPT = """
+return {
+    title: document.title || '',
+    text: document.body ? document.body.innerText : '',
+    url: location.href,
+    successElements: document.querySelectorAll(
+        '[class*="success"], [class*="thank"], [class*="confirmation"]').length
+};
+"""
+
+
+class PageSignalMatcher:
+    """
+    Finds every form-type, success and error keyword in one pass over the page text.
+
+    All keywords are compiled into a single alternation tried at each position
+    (longest first, inside a lookahead so matches may overlap). A hit on a long
+    keyword also counts for the shorter keywords it contains, so the result is
+    the same as running `keyword in text` for every entry of every table.
+    """
+
+    def __init__(self, form_types: Dict[str, List[str]] = None, success: List[str] = None,
+                 errors: List[str] = None):
+        self.form_types = form_types or FORM_TYPE_KEYWORDS
+        self.success = success or SUCCESS_KEYWORDS
+        self.errors = errors or ERROR_KEYWORDS
+
+        keywords = {k.lower() for k in self.success + self.errors}
+        keywords.update(k.lower() for table in self.form_types.values() for k in table)
+        ordered = sorted(keywords, key=len, reverse=True)
+        self._pattern = re.compile('(?=(' + '|'.join(re.escape(k) for k in ordered) + '))')
+        # keyword -> every keyword found inside it (itself included)
+        self._implied = {k: [other for other in ordered if other in k] for k in ordered}
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """Return the matched form types and success/error keywords, each in table order."""
+        found = set()
+        for match in self._pattern.finditer(text.lower()):
+            keyword = match.group(1)
+            if keyword not in found:
+                found.update(self._implied[keyword])
+
+        return {
+            'form_types': [name for name, table in self.form_types.items() if any(k in found for k in table)],
+            'success': [k for k in self.success if k in found],
+            'errors': [k for k in self.errors if k in found],
+        }
+
+    @staticmethod
+    def form_type(signals: Dict[str, List[str]]) -> str:
+        return signals['form_types'][0] if signals['form_types'] else 'unknown'
+
+
+WRITE_METHODS = ('POST', 'PUT', 'PATCH')
+
+
+def submission_verdict(evidence: Dict, matcher: PageSignalMatcher) -> Optional[Dict]:
+    """
+    Decide a submission from what the page did after the click: confirmation or
+    error text the page added, and the status of the POST/PUT requests it sent.
+    Returns None when the evidence is inconclusive. After a full-page navigation
+    only the new document's HTTP status is used; its text is checked by the caller.
+    """
+    if evidence.get('url_changed'):
+        if evidence.get('navigation_status', 0) >= 400:
+            return {'success': False, 'decided_by': 'navigation_status',
+                    'error': f"Submission page returned HTTP {evidence['navigation_status']}"}
+        return None
+
+    writes = [r for r in evidence.get('responses', []) if r['method'] in WRITE_METHODS and r['status']]
+    http_ok = [r for r in writes if 200 <= r['status'] < 400]
+    http_failed = [r for r in writes if r['status'] >= 400]
+    signals = matcher.scan('\n'.join(evidence.get('added_text', [])))
+
+    if signals['success']:
+        return {'success': True, 'decided_by': 'confirmation_text',
+                'confirmation': f"Confirmation appeared: '{signals['success'][0]}'"}
+    if http_failed and not http_ok:
+        failed = http_failed[-1]
+        return {'success': False, 'decided_by': 'http_status',
+                'error': f"Submission request failed: HTTP {failed['status']} from {failed['url']}"}
+    if signals['errors']:
+        return {'success': False, 'decided_by': 'error_text',
+                'error': f"Error messages appeared after submit: {signals['errors']}"}
+    if http_ok:
+        return {'success': True, 'decided_by': 'http_status',
+                'confirmation': f"Submission request succeeded: HTTP {http_ok[-1]['status']}"}
+    return None
+
+
+SUCCESS_URL_WORDS = ['thank', 'success', 'confirmation', 'submitted']
+
+
+def page_verdict(page: Dict, form_present: Callable[[], bool]) -> Dict:
+    """
+    Fallback check on the settled page after a submit: success text, a thank-you
+    URL, the form gone or a success element; otherwise success unless error text shows.
+    `form_present` is only called when the cheaper checks are inconclusive.
+    """
+    signals = page['signals']
+    if signals['success']:
+        return {'success': True, 'confirmation': f"Found success indicator: '{signals['success'][0]}'"}
+
+    current_url = (page.get('url') or '').lower()
+    if any(word in current_url for word in SUCCESS_URL_WORDS):
+        return {'success': True, 'confirmation': f"Redirected to success page: {current_url}"}
+
+    if not form_present():
+        return {'success': True, 'confirmation': 'Contact form no longer visible (likely submitted successfully)'}
+
+    if page.get('successElements'):
+        return {'success': True, 'confirmation': 'Found success/confirmation element on page'}
+
+    if not signals['errors']:
+        return {'success': True, 'confirmation': 'No error messages found, assuming successful submission'}
+    return {'success': False, 'error': 'Error messages detected on page'}
+
+
+def read_page_state(driver, matcher: PageSignalMatcher) -> Dict:
+    """Fetch title and visible text once and classify them; empty signals if the page can't be read."""
+    try:
+        state = driver.execute_script(PAGE_STATE_SCRIPT) or {}
+    except Exception as e:
+        logger.warning(f"Could not read page text: {e}")
+        state = {}
+    return classify_page_state(state, matcher)
+
+
+def classify_page_state(state: Dict, matcher: PageSignalMatcher) -> Dict:
+    """Fill in defaults for a PAGE_STATE_SCRIPT result and add its keyword signals."""
+    state.setdefault('title', '')
+    state.setdefault('text', '')
+    state.setdefault('successElements', 0)
+    state['signals'] = matcher.scan(f"{state['title']}\n{state['text']}")
+    return state
@@ -0,0 +1,138 @@
+import math
+import random
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+PERCENTILES = (50, 90, 99)
+
+
+class PhaseTimer:
+    """
+    Wall time and browser round trips per phase of one site (navigate, detect,
+    personalize, find_form, fill, submit, verify). Phases may nest; time and
+    round trips go to the innermost open phase, so the phases add up to the total.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, Dict[str, float]] = {}
+        # Most recently entered phase: where a failed site stopped
+        self.last_phase: Optional[str] = None
+        self._stack: List[str] = []
+        self._mark = time.monotonic()
+        self._started = self._mark
+
+    def reset(self):
+        self.phases = {}
+        self.last_phase = None
+        self._stack = []
+        self._mark = self._started = time.monotonic()
+
+    @contextmanager
+    def phase(self, name: str):
+        self._charge()
+        self._stack.append(name)
+        self.last_phase = name
+        self._entry(name)
+        try:
+            yield
+        finally:
+            self._charge()
+            self._stack.pop()
+
+    def note_round_trip(self):
+        """Count one browser command against the open phase ('other' outside any phase)."""
+        self._entry(self._stack[-1] if self._stack else 'other')['round_trips'] += 1
+
+    def count_round_trips(self, driver):
+        """
+        Count every WebDriver command on `driver`. All commands, element ones included,
+        go through driver.execute; shadowing it on the instance sees each round trip.
+        The driver is wrapped once and charges the timer that claimed it last, so an
+        automator rebuilt on the same driver neither double counts nor feeds the old timer.
+        """
+        already_wrapped = hasattr(driver, '_phase_timer')
+        driver._phase_timer = self
+        if already_wrapped:
+            return
+        execute = driver.execute
+
+        def counted(*args, **kwargs):
+            driver._phase_timer.note_round_trip()
+            return execute(*args, **kwargs)
+
+        driver.execute = counted
+
+    def breakdown(self) -> Dict[str, Dict[str, float]]:
+        """Seconds and round trips per phase, plus the total for the site."""
+        self._charge()
+        phases = {name: {'seconds': round(entry['seconds'], 3), 'round_trips': entry['round_trips']}
+                  for name, entry in self.phases.items()}
+        phases['total'] = {'seconds': round(time.monotonic() - self._started, 3),
+                           'round_trips': sum(entry['round_trips'] for entry in self.phases.values())}
+        return phases
+
+    def _entry(self, name: str) -> Dict[str, float]:
+        return self.phases.setdefault(name, {'seconds': 0.0, 'round_trips': 0})
+
+    def _charge(self):
+        now = time.monotonic()
+        if self._stack:
+            self._entry(self._stack[-1])['seconds'] += now - self._mark
+        self._mark = now
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(pct / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def latency_summary(values: List[float]) -> Dict[str, float]:
+    return {f"p{pct}": round(percentile(values, pct), 3) for pct in PERCENTILES}
+
+
+class PhaseTimingStats:
+    """
+    Running per-phase summary of a campaign. Site counts and round trips are
+    totals; percentiles come from a uniform sample of at most `max_samples`
+    timings per phase, so memory stays flat however many sites run.
+    """
+
+    def __init__(self, max_samples: int = 10_000, seed: Optional[int] = None):
+        self.max_samples = max(1, max_samples)
+        self._seconds: Dict[str, List[float]] = {}
+        self._round_trips: Dict[str, int] = {}
+        self._sites: Dict[str, int] = {}
+        self._random = random.Random(seed)
+
+    def add(self, phase_timings: Optional[Dict[str, Dict]]):
+        for name, entry in (phase_timings or {}).items():
+            sites = self._sites[name] = self._sites.get(name, 0) + 1
+            self._round_trips[name] = self._round_trips.get(name, 0) + entry['round_trips']
+            sample = self._seconds.setdefault(name, [])
+            if len(sample) < self.max_samples:
+                sample.append(entry['seconds'])
+            else:
+                # Reservoir sampling: every site so far is equally likely to be in the sample
+                slot = self._random.randrange(sites)
+                if slot < self.max_samples:
+                    sample[slot] = entry['seconds']
+
+    def summary(self) -> Dict[str, Dict]:
+        return {
+            name: {**latency_summary(values), 'mean_round_trips': round(self._round_trips[name] / self._sites[name], 1),
+                   'sites': self._sites[name]}
+            for name, values in self._seconds.items()
+        }
+
+
+def summarize_phase_timings(results: List[Dict]) -> Dict[str, Dict]:
+    """Percentiles of seconds and mean round trips per phase across results that carry phase_timings."""
+    stats = PhaseTimingStats()
+    for result in results:
+        stats.add(result.get('phase_timings'))
+    return stats.summary()
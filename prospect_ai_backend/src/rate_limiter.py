@@ -0,0 +1,163 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from loguru import logger
+
+from src.form_layout_cache import domain_key
+
+# Waits shorter than this are not worth a log line
+LOG_WAIT_SECONDS = 5
+
+
+class TokenBucket:
+    """
+    `capacity` tokens, refilled continuously at `rate` tokens per second.
+    Not thread-safe on its own; SubmissionRateLimiter guards its buckets.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def refill(self, now: float):
+        if now > self._updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until one token is available (0 when one is)."""
+        self.refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float):
+        self.tokens -= 1
+
+
+class SlidingWindow:
+    """
+    At most `limit` events in any `period` seconds, with TokenBucket's interface.
+    Unlike a bucket it holds the cap from the first second: an idle spell does not
+    bank extra submissions.
+    """
+
+    def __init__(self, limit: int, period: float = 3600):
+        self.limit = max(1, int(limit))
+        self.period = period
+        self._events: Deque[float] = deque()
+
+    def wait_time(self, now: float) -> float:
+        while self._events and self._events[0] <= now - self.period:
+            self._events.popleft()
+        return 0.0 if len(self._events) < self.limit else self._events[0] + self.period - now
+
+    def take(self, now: float):
+        self._events.append(now)
+
+
+class SubmissionRateLimiter:
+    """
+    Campaign-wide submission budget shared by every worker thread and async page.
+
+    A submission needs room in the hourly window (`max_submissions_per_hour` in
+    any 60 minutes), a token from the burst bucket if `burst` is set, one from
+    the spacing bucket (one per `delay_between_submissions` seconds) and one from
+    its domain's bucket (`per_domain_per_hour`). Tokens are taken right before
+    the submit click, so sites that fail earlier cost nothing.
+
+    Long waits are meant to happen before a browser touches the site: workers
+    requeue a target while domain_wait() is positive and hold off for
+    preparation_wait(), so the short wait left at the click overlaps with
+    loading and filling the form.
+    """
+
+    def __init__(self, max_submissions_per_hour: int, delay_between_submissions: float = 0,
+                 per_domain_per_hour: Optional[float] = None, burst: Optional[int] = None,
+                 prepare_lead: float = 30):
+        self._global: List = []
+        if max_submissions_per_hour:
+            self._global.append(SlidingWindow(max_submissions_per_hour, 3600))
+            if burst is not None:
+                self._global.append(TokenBucket(max_submissions_per_hour / 3600, burst))
+        if delay_between_submissions:
+            self._global.append(TokenBucket(1 / delay_between_submissions, 1))
+        self.per_domain_per_hour = per_domain_per_hour
+        # Roughly how long loading and filling a form takes
+        self.prepare_lead = prepare_lead
+        self._domains: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.submissions = 0
+        self.total_wait = 0.0
+
+    def reserve(self, url: str) -> float:
+        """Take a token from every bucket of `url` if all have one and return 0; otherwise take none and return the wait."""
+        now = time.monotonic()
+        with self._lock:
+            buckets = self._buckets(url)
+            wait = max((bucket.wait_time(now) for bucket in buckets), default=0.0)
+            if wait <= 0:
+                for bucket in buckets:
+                    bucket.take(now)
+                self.submissions += 1
+            return wait
+
+    def domain_wait(self, url: str) -> float:
+        """Seconds until `url`'s domain has a token (0 without a per-domain limit); takes nothing."""
+        if not self.per_domain_per_hour:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            return self._domain_bucket(url).wait_time(now)
+
+    def preparation_wait(self) -> float:
+        """Seconds to hold off before loading a form, so the global budget is due about when it is filled."""
+        now = time.monotonic()
+        with self._lock:
+            wait = max((bucket.wait_time(now) for bucket in self._global), default=0.0)
+        return max(0.0, wait - self.prepare_lead)
+
+    def acquire(self, url: str) -> float:
+        """Block the calling thread until `url` may be submitted; returns the seconds waited."""
+        started = time.monotonic()
+        while True:
+            wait = self.reserve(url)
+            if wait <= 0:
+                return self._waited(url, started)
+            if wait >= LOG_WAIT_SECONDS:
+                logger.info(f"Submission budget exhausted; waiting {wait:.1f}s before submitting {url}")
+            time.sleep(wait)
+
+    async def acquire_async(self, url: str) -> float:
+        """acquire() for the event loop: other pages keep going while this one waits."""
+        started = time.monotonic()
+        while True:
+            wait = self.reserve(url)
+            if wait <= 0:
+                return self._waited(url, started)
+            if wait >= LOG_WAIT_SECONDS:
+                logger.info(f"Submission budget exhausted; waiting {wait:.1f}s before submitting {url}")
+            await asyncio.sleep(wait)
+
+    def _buckets(self, url: str) -> List:
+        if not self.per_domain_per_hour:
+            return self._global
+        return self._global + [self._domain_bucket(url)]
+
+    def _domain_bucket(self, url: str) -> TokenBucket:
+        domain = domain_key(url)
+        bucket = self._domains.get(domain)
+        if bucket is None:
+            bucket = self._domains[domain] = TokenBucket(self.per_domain_per_hour / 3600, 1)
+        return bucket
+
+    def _waited(self, url: str, started: float) -> float:
+        waited = time.monotonic() - started
+        with self._lock:
+            self.total_wait += waited
+        if waited >= LOG_WAIT_SECONDS:
+            logger.debug(f"Waited {waited:.1f}s for submission budget for {url}")
+        return waited
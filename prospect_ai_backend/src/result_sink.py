@@ -0,0 +1,190 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, TextIO
+
+from loguru import logger
+
+from src.phase_timer import PhaseTimingStats
+
+
+def result_status(result: Dict) -> str:
+    if result.get('skipped'):
+        return 'skipped'
+    if result.get('deferred'):
+        return 'deferred'
+    return 'success' if result['success'] else 'failed'
+
+
+def read_results(path: Path) -> Iterator[Dict]:
+    """Records of a results JSONL file; a line cut short by a crash is skipped."""
+    if not Path(path).exists():
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping unreadable line {line_number} of {path}")
+
+
+def export_json_array(jsonl_path: Path, json_path: Path) -> int:
+    """Write the records of a JSONL file as one indented JSON array (the pre-JSONL format)."""
+    tmp_path = json_path.with_name(json_path.name + '.tmp')
+    count = 0
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for record in read_results(jsonl_path):
+            f.write(',\n' if count else '\n')
+            f.write('\n'.join('  ' + line for line in json.dumps(record, indent=2).split('\n')))
+            count += 1
+        f.write('\n]' if count else ']')
+    os.replace(tmp_path, json_path)
+    return count
+
+
+class ResultSink:
+    """
+    Thread-safe collector for submission results. Appends each result as one line
+    to the per-status JSONL file (contact_submissions_{status}.jsonl) and keeps
+    only running counters for the campaign summary, so neither writing nor
+    remembering a result grows with the number of sites.
+
+    Files are line buffered and fsynced every `fsync_every` results or
+    `fsync_interval` seconds; close() syncs them and, with export_json, writes
+    the legacy contact_submissions_{status}.json arrays. The export rewrites the
+    whole accumulated history, so it is off unless a consumer still needs it.
+    """
+
+    def __init__(self, output_dir: Path, fsync_every: int = 50, fsync_interval: float = 5.0,
+                 export_json: bool = False):
+        self.output_dir = Path(output_dir)
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+        self.export_json = export_json
+        # Counters for the campaign summary; the results themselves live only in the files
+        self.successful = 0
+        self.counts: Dict[str, int] = {}
+        self.retried_attempts = 0
+        self.form_types: Dict[str, Dict[str, int]] = {}
+        self.page_loads = {'sites': 0, 'page_load_time': 0.0, 'transferred_bytes': 0, 'estimated_bytes_saved': 0}
+        self.phase_timings = PhaseTimingStats()
+        self._files: Dict[str, TextIO] = {}
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+
+    def path_for(self, status: str, suffix: str = '.jsonl') -> Path:
+        return self.output_dir / f"contact_submissions_{status}{suffix}"
+
+    def record(self, result: Dict):
+        with self._lock:
+            self._count(result)
+            self._write_result_to_file(result)
+
+    def close(self):
+        """Flush and fsync every open file, then export the legacy JSON arrays if enabled."""
+        with self._lock:
+            self._sync()
+            for f in self._files.values():
+                f.close()
+            statuses = list(self._files)
+            self._files = {}
+        if self.export_json:
+            for status in statuses:
+                count = export_json_array(self.path_for(status), self.path_for(status, '.json'))
+                logger.debug(f"Exported {count} {status} results to {self.path_for(status, '.json')}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _count(self, result: Dict):
+        status = result_status(result)
+        self.counts[status] = self.counts.get(status, 0) + 1
+        if result.get('success'):
+            self.successful += 1
+        self.retried_attempts += result.get('attempts', 1) - 1
+        if status in ('success', 'failed'):
+            stats = self.form_types.setdefault(result.get('form_type', 'unknown'), {'total': 0, 'successful': 0})
+            stats['total'] += 1
+            stats['successful'] += 1 if result['success'] else 0
+        page_load = result.get('page_load')
+        if page_load:
+            self.page_loads['sites'] += 1
+            self.page_loads['page_load_time'] += page_load['page_load_time']
+            self.page_loads['transferred_bytes'] += page_load.get('transferred_bytes', 0)
+            self.page_loads['estimated_bytes_saved'] += page_load['estimated_bytes_saved']
+        self.phase_timings.add(result.get('phase_timings'))
+
+    def _write_result_to_file(self, result: Dict):
+        """Append one submission result to its status file"""
+        status = result_status(result)
+
+        # Prepare enhanced data for JSON storage
+        json_data = {
+            'website': result['website'],
+            'success': result['success'],
+            'form_type': result.get('form_type', 'unknown'),
+            'fill_strategy': result.get('fill_strategy'),
+            'wait_times': result.get('wait_times', []),
+            'page_load': result.get('page_load'),
+            'submission_evidence': result.get('submission_evidence'),
+            'phase_timings': result.get('phase_timings'),
+            'submission_time': result.get('submission_time', time.time()),
+            'contact_data': result.get('form_data', {}),
+            'target': result.get('target_metadata'),
+            'error': result.get('error'),
+            'failure_kind': result.get('failure_kind'),
+            'last_phase': result.get('last_phase'),
+            'submit_clicked': result.get('submit_clicked', False),
+            'attempts': result.get('attempts', 1),
+            'skip_reason': result.get('skip_reason'),
+            'confirmation_message': result.get('confirmation_message'),
+            'required_fields_detected': result.get('required_fields', []),
+            'filled_fields': result.get('filled_fields', [])
+        }
+
+        self._file(status).write(json.dumps(json_data, default=str) + '\n')
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self._sync()
+
+    def _file(self, status: str) -> TextIO:
+        f = self._files.get(status)
+        if f is None:
+            path = self.path_for(status)
+            legacy = self.path_for(status, '.json')
+            if not path.exists() and legacy.exists():
+                self._migrate(legacy, path)
+            # buffering=1: every record reaches the OS as soon as its line is complete
+            f = self._files[status] = open(path, 'a', encoding='utf-8', buffering=1)
+        return f
+
+    @staticmethod
+    def _migrate(legacy: Path, path: Path):
+        """Carry the results of runs before the JSONL format over into the new file, once."""
+        try:
+            with open(legacy, 'r', encoding='utf-8') as f:
+                records = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not migrate {legacy}: {e}")
+            return
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + '\n')
+        logger.info(f"Migrated {len(records)} results from {legacy} to {path}")
+
+    def _sync(self):
+        for f in self._files.values():
+            f.flush()
+            os.fsync(f.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
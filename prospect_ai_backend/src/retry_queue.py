@@ -0,0 +1,169 @@
+import heapq
+import queue
+import random
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+TRANSIENT = 'transient'
+PERMANENT = 'permanent'
+
+# Queue entry marking the end of the fresh targets
+_END = None
+
+# Matched against the lower-cased error; anything unmatched is treated as permanent,
+# so a site that rejected the submission is never contacted twice
+TRANSIENT_PATTERNS = [
+    'timeout', 'timed out', 'crash', 'invalid session', 'no such window', 'disconnected',
+    'session deleted', 'target closed', 'browser has been closed', 'click intercepted',
+    'not clickable', 'javascript click failed', 'stale element', 'net::err_', 'connection refused',
+    'connection reset', 'temporarily unavailable',
+]
+PERMANENT_PATTERNS = [
+    'no contact form found', 'missing required fields', 'no form fields could be filled',
+    'submit button not found', 'captcha',
+]
+
+
+def classify_failure(result: Dict) -> str:
+    """
+    'transient' for failures worth another try (timeouts, crashed sessions, intercepted
+    clicks) before the submit click, else 'permanent'. Once the click was dispatched
+    the site may have the submission, so nothing after it is retried.
+    """
+    if result.get('submit_clicked'):
+        return PERMANENT
+    error = (result.get('error') or '').lower()
+    if any(pattern in error for pattern in PERMANENT_PATTERNS):
+        return PERMANENT
+    return TRANSIENT if any(pattern in error for pattern in TRANSIENT_PATTERNS) else PERMANENT
+
+
+class RetryPolicy:
+    """
+    Which failed sites get another attempt and when: transient failures, up to
+    `max_retries` times, after `base_delay * 2**attempt` seconds (capped at
+    `max_delay`) with the upper half jittered so retries don't arrive in step.
+    """
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 30.0, max_delay: float = 900.0,
+                 rng: Optional[random.Random] = None):
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return delay / 2 + self._rng.uniform(0, delay / 2)
+
+    def delay_for(self, result: Dict, attempt: int) -> Optional[float]:
+        """Seconds until the next attempt of a site whose attempt number `attempt` (0-based) gave `result`; None for no retry."""
+        if result.get('success') or result.get('skipped') or result.get('deferred'):
+            return None
+        result['failure_kind'] = classify_failure(result)
+        if result['failure_kind'] != TRANSIENT or attempt >= self.max_retries:
+            return None
+        return self.backoff(attempt)
+
+
+class RetryQueue:
+    """
+    Work queue for the campaign workers: fresh targets in order, with transient
+    failures rescheduled behind them. A retry that is due is handed out before the
+    next fresh target; one that isn't due yet never holds up the fresh ones.
+    Once the fresh targets run out, workers wait for the remaining retries.
+
+    The targets iterable (which may read files, discover contact pages and probe
+    sites as it goes) is drained by a producer thread into a queue of at most
+    `prefetch` targets, so workers never wait on it while holding the lock.
+    An error raised by the iterable is raised again in every worker.
+    """
+
+    def __init__(self, targets: Iterable[str], policy: RetryPolicy, prefetch: int = 100):
+        self.policy = policy
+        self._fresh: queue.Queue = queue.Queue(maxsize=max(1, prefetch))
+        self._fresh_done = False
+        self._error: Optional[BaseException] = None
+        self._closed = threading.Event()
+        self._delayed: List[Tuple[float, int, str, int]] = []
+        self._in_progress = 0
+        self._cond = threading.Condition()
+        self.retries = 0
+        self._producer = threading.Thread(target=self._produce, args=(targets,), name="target-producer", daemon=True)
+        self._producer.start()
+
+    def next_target(self) -> Optional[Tuple[int, str, int]]:
+        """(index, website, attempt) of the next site to process, or None when the campaign is done."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._delayed and self._delayed[0][0] <= now:
+                    _, i, website_url, attempt = heapq.heappop(self._delayed)
+                    self._in_progress += 1
+                    return i, website_url, attempt
+                if not self._fresh_done:
+                    try:
+                        fresh = self._fresh.get_nowait()
+                    except queue.Empty:
+                        fresh = None
+                    else:
+                        if fresh is _END:
+                            self._fresh_done = True
+                        else:
+                            self._in_progress += 1
+                            return fresh[0], fresh[1], 0
+                if self._fresh_done and not self._delayed and not self._in_progress:
+                    if self._error is not None:
+                        raise self._error
+                    return None
+                # Sleep until a retry is due, a worker reports back or the producer adds a target
+                self._cond.wait(timeout=self._delayed[0][0] - now if self._delayed else None)
+
+    def close(self):
+        """Stop the producer early (the campaign was aborted)."""
+        self._closed.set()
+
+    def report(self, i: int, website_url: str, attempt: int, result: Dict) -> Optional[float]:
+        """Finish an attempt; reschedules transient failures and returns their delay (None when final)."""
+        delay = self.policy.delay_for(result, attempt)
+        with self._cond:
+            self._in_progress -= 1
+            if delay is not None:
+                heapq.heappush(self._delayed, (time.monotonic() + delay, i, website_url, attempt + 1))
+                self.retries += 1
+                logger.info(f"🔁 {website_url} failed transiently ({result.get('error')}); "
+                            f"retry {attempt + 1}/{self.policy.max_retries} in {delay:.0f}s")
+            self._cond.notify_all()
+        return delay
+
+    def defer(self, i: int, website_url: str, attempt: int, delay: float):
+        """Hand back a target that was not started, to be handed out again in `delay` seconds (not a retry)."""
+        with self._cond:
+            self._in_progress -= 1
+            heapq.heappush(self._delayed, (time.monotonic() + delay, i, website_url, attempt))
+            self._cond.notify_all()
+
+    def _produce(self, targets: Iterable[str]):
+        try:
+            for fresh in enumerate(targets):
+                if not self._put(fresh):
+                    return
+        except Exception as e:
+            logger.error(f"Reading campaign targets failed: {e}")
+            self._error = e
+        self._put(_END)
+
+    def _put(self, item) -> bool:
+        # Blocks while `prefetch` targets are waiting, without holding the workers' lock
+        while not self._closed.is_set():
+            try:
+                self._fresh.put(item, timeout=0.5)
+            except queue.Full:
+                continue
+            with self._cond:
+                self._cond.notify_all()
+            return True
+        return False
@@ -0,0 +1,77 @@
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+
+# Recorded when a field was found through its label text rather than a selector
+LABEL_MATCH = 'label'
+
+
+class SelectorStats:
+    """
+    Persistent hit counts for the automator's form_selectors.
+
+    Every detected form counts as one attempt for every field type: the selector
+    that found the field gets a hit, a field type with no match gets a miss.
+    `ordered()` gives the order to evaluate a field type's selectors in, most
+    hits first. Only the evaluation order changes: each selector keeps its
+    position in form_selectors as its rank, which still decides between matches.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict] = self._load()
+
+    def record(self, field_type: str, selector: Optional[str]):
+        """Count one lookup for field_type; selector is None when nothing matched."""
+        with self._lock:
+            stats = self._stats.setdefault(field_type, {'attempts': 0, 'misses': 0, 'hits': {}})
+            stats['attempts'] += 1
+            if selector is None:
+                stats['misses'] += 1
+            else:
+                stats['hits'][selector] = stats['hits'].get(selector, 0) + 1
+
+    def ordered(self, field_type: str, selectors: List[str]) -> List[Tuple[int, str]]:
+        """(rank, selector) pairs sorted by observed hits, most first; ties and unseen selectors by rank."""
+        with self._lock:
+            hits = self._stats.get(field_type, {}).get('hits', {})
+            return sorted(enumerate(selectors), key=lambda item: (-hits.get(item[1], 0), item[0]))
+
+    def hit_rates(self) -> Dict[str, Dict]:
+        """Per field type: attempts, miss rate and every selector's hit count and hit rate."""
+        with self._lock:
+            table = {}
+            for field_type, stats in self._stats.items():
+                attempts = stats['attempts'] or 1
+                table[field_type] = {
+                    'attempts': stats['attempts'],
+                    'miss_rate': round(stats['misses'] / attempts, 3),
+                    'selectors': [
+                        {'selector': selector, 'hits': hits, 'hit_rate': round(hits / attempts, 3)}
+                        for selector, hits in sorted(stats['hits'].items(), key=lambda item: -item[1])
+                    ]
+                }
+            return table
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps(self._stats, indent=2), encoding='utf-8')
+            tmp_path.replace(self.path)
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.path or not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable selector stats {self.path}: {e}")
+            return {}
@@ -0,0 +1,161 @@
+import math
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+# Rough size of a token in English prose; close enough to keep prompts under budget
+CHARS_PER_TOKEN = 4
+DEFAULT_TOKEN_BUDGET = 600
+
+# Sections worth sending to the LLM, in the order they are added to the context
+SECTION_WORDS = {
+    'about': ['about', 'who we are', 'our company', 'our story', 'company'],
+    'products': ['products', 'services', 'solutions', 'what we do', 'industries'],
+}
+
+ORGANIZATION_TYPES = ['Organization', 'Corporation', 'LocalBusiness', 'Store', 'OnlineStore', 'ProfessionalService']
+
+# Everything the prompt needs in one round trip, already trimmed in the page:
+# title, meta description, JSON-LD organizations, H1/H2 and the about/products
+# sections. Nav, header, footer and cookie banners are skipped.
+SITE_CONTEXT_SCRIPT = """
+var sectionWords = arguments[0], orgTypes = arguments[1], maxChars = arguments[2];
+var clean = function (text, limit) {
+    text = (text || '').replace(/\\s+/g, ' ').trim();
+    return text.length > limit ? text.slice(0, limit) : text;
+};
+var boilerplate = function (el) {
+    return !!el.closest('nav, header, footer, aside, [role="navigation"], [role="banner"], [role="contentinfo"], '
+        + '[id*="cookie" i], [class*="cookie" i], [id*="consent" i], [class*="consent" i]');
+};
+var meta = document.querySelector('meta[name="description"], meta[property="og:description"]');
+
+var organizations = [];
+var visit = function (node) {
+    if (!node || typeof node !== 'object' || organizations.length >= 3) return;
+    if (Array.isArray(node)) { node.forEach(visit); return; }
+    var types = [].concat(node['@type'] || []);
+    if (types.some(function (t) { return orgTypes.indexOf(t) >= 0; })) {
+        organizations.push({
+            name: clean(node.name, 200), description: clean(node.description, maxChars),
+            slogan: clean(node.slogan, 200),
+            knowsAbout: [].concat(node.knowsAbout || []).filter(function (k) { return typeof k === 'string'; }).slice(0, 10)
+        });
+    }
+    visit(node['@graph']);
+};
+document.querySelectorAll('script[type="application/ld+json"]').forEach(function (script) {
+    try { visit(JSON.parse(script.textContent)); } catch (e) {}
+});
+
+var headings = [], seen = {};
+document.querySelectorAll('h1, h2').forEach(function (h) {
+    var text = clean(h.innerText, 150);
+    if (text && !seen[text] && headings.length < 15 && !boilerplate(h)) {
+        seen[text] = true;
+        headings.push(text);
+    }
+});
+
+var sections = {};
+var matches = function (text, words) {
+    text = (text || '').toLowerCase();
+    return words.some(function (w) { return text.indexOf(w) >= 0; });
+};
+Object.keys(sectionWords).forEach(function (name) {
+    var words = sectionWords[name];
+    var candidates = Array.prototype.slice.call(document.querySelectorAll('section, article, div[id], div[class], main'))
+        .filter(function (el) { return matches(el.id + ' ' + el.className, words); });
+    document.querySelectorAll('h1, h2, h3').forEach(function (h) {
+        if (matches(h.innerText, words)) candidates.push(h.closest('section, article') || h.parentElement);
+    });
+    for (var i = 0; i < candidates.length; i++) {
+        var el = candidates[i];
+        if (!el || boilerplate(el)) continue;
+        var text = clean(el.innerText, maxChars);
+        if (text.length >= 40) { sections[name] = text; break; }
+    }
+});
+
+return {
+    title: clean(document.title, 200),
+    description: clean(meta && meta.content, maxChars),
+    organizations: organizations,
+    headings: headings,
+    sections: sections
+};
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    """Cut on a word boundary where there is one."""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(' ', 1)[0]
+    return (cut or text[:max_chars]).rstrip() + '…'
+
+
+def context_lines(raw: Dict) -> List[str]:
+    """The SITE_CONTEXT_SCRIPT result as prompt lines, most informative first."""
+    lines = []
+    if raw.get('title'):
+        lines.append(f"Title: {raw['title']}")
+    if raw.get('description'):
+        lines.append(f"Description: {raw['description']}")
+    for organization in raw.get('organizations') or []:
+        parts = [organization.get('name'), organization.get('slogan'), organization.get('description')]
+        if organization.get('knowsAbout'):
+            parts.append('Known for: ' + ', '.join(organization['knowsAbout']))
+        text = ' — '.join(part for part in parts if part)
+        if text:
+            lines.append(f"Organization: {text}")
+    if raw.get('headings'):
+        lines.append('Headings: ' + ' | '.join(raw['headings']))
+    for name in SECTION_WORDS:
+        text = (raw.get('sections') or {}).get(name)
+        if text:
+            lines.append(f"{name.title()}: {text}")
+    return lines
+
+
+def build_site_context(raw: Optional[Dict], token_budget: int = DEFAULT_TOKEN_BUDGET, fallback_text: str = '') -> str:
+    """
+    Prompt context from the extractor's result, cut to `token_budget`. Lines are
+    added in rank order and the last one that doesn't fit is truncated. Pages that
+    yield nothing fall back to the start of their visible text.
+    """
+    max_chars = token_budget * CHARS_PER_TOKEN
+    lines = context_lines(raw or {})
+    if not lines:
+        return _truncate(' '.join(fallback_text.split()), max_chars)
+
+    context, used = [], 0
+    for line in lines:
+        remaining = max_chars - used
+        if remaining < 40:
+            break
+        line = _truncate(line, remaining)
+        context.append(line)
+        used += len(line) + 1
+    return '\n'.join(context)
+
+
+def site_context_args(token_budget: int = DEFAULT_TOKEN_BUDGET) -> List:
+    """Arguments for SITE_CONTEXT_SCRIPT; no single string comes back longer than the whole budget."""
+    return [SECTION_WORDS, ORGANIZATION_TYPES, token_budget * CHARS_PER_TOKEN]
+
+
+def read_site_context(backend, token_budget: int = DEFAULT_TOKEN_BUDGET, fallback_text: str = '') -> str:
+    """Run the extractor through a BrowserBackend and build the prompt context."""
+    try:
+        raw = backend.evaluate(SITE_CONTEXT_SCRIPT, *site_context_args(token_budget))
+    except Exception as e:
+        logger.warning(f"Could not extract site context: {e}")
+        raw = None
+    context = build_site_context(raw, token_budget, fallback_text)
+    logger.debug(f"Site context for personalization: ~{estimate_tokens(context)} tokens")
+    return context
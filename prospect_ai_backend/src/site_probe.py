@@ -0,0 +1,213 @@
+import asyncio
+import time
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+from loguru import logger
+
+
+FORM = 'form'
+CAPTCHA = 'captcha'
+DEAD = 'dead'
+REDIRECT = 'redirect'
+LOGIN = 'login'
+NO_FORM = 'no_form'
+INCONCLUSIVE = 'inconclusive'
+
+# Sites probed as FORM, CAPTCHA or INCONCLUSIVE go to the browser by default; the browser
+# parks CAPTCHA sites in the deferral queue with their state instead of dropping them
+DEFAULT_SKIP_STATUSES = (DEAD, REDIRECT, LOGIN, NO_FORM)
+
+# The page is gone; any other error status (403/429/503 from bot protection and the
+# like) may well load in a real browser, so it is left for the browser to decide
+DEAD_HTTP_STATUSES = (404, 410)
+
+CAPTCHA_MARKERS = ('recaptcha', 'hcaptcha', 'h-captcha', 'g-recaptcha', 'cf-turnstile', 'turnstile')
+# Script loaders (reCAPTCHA v3's api.js?render=...) and invisible reCAPTCHA bound to
+# a submit button never show a challenge, so they don't make a page a CAPTCHA site
+CAPTCHA_LOADER_TAGS = ('script', 'link', 'button', 'input')
+# Forms injected by script at runtime: no <form> in the static HTML, but still fillable
+EMBEDDED_FORM_MARKERS = ('hsforms', 'hbspt.forms', 'wpcf7', 'gform', 'typeform', 'jotform', 'formstack',
+                         'pardot', 'marketo', 'mktoform', 'cognitoforms', 'wufoo')
+TEXT_INPUT_TYPES = ('', 'text', 'email', 'tel', 'url', 'number')
+# Signs that the page builds its markup in the browser, so a missing <form> proves nothing:
+# single-page app mount points, inline scripts that write markup, or a pile of script bundles
+APP_ROOT_IDS = ('root', 'app', '__next', '__nuxt', '___gatsby')
+APP_ROOT_ATTRIBUTES = ('data-reactroot', 'ng-version', 'data-server-rendered')
+DOM_WRITING_CALLS = ('innerhtml', 'insertadjacenthtml', 'createelement', 'document.write')
+SCRIPT_HEAVY_MIN_SCRIPTS = 8
+
+
+class _PageScanner(HTMLParser):
+    """Single streaming pass over the HTML collecting form, login and CAPTCHA signals."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.in_form = False
+        self.form_is_search = False
+        self.form_inputs = 0
+        self.form_password = False
+        self.contact_forms = 0
+        self.login_forms = 0
+        self.captcha = False
+        self.embedded_form = False
+        self.in_script = False
+        self.scripts = 0
+        self.app_root = False
+        self.writes_dom = False
+
+    @property
+    def renders_with_js(self) -> bool:
+        return self.app_root or self.writes_dom or self.scripts >= SCRIPT_HEAVY_MIN_SCRIPTS
+
+    def handle_starttag(self, tag, attrs):
+        attributes = {name: (value or '') for name, value in attrs}
+        markers = ' '.join([attributes.get('class', ''), attributes.get('id', ''), attributes.get('src', ''),
+                            attributes.get('data-sitekey', '')]).lower()
+
+        if self._is_captcha_widget(tag, attributes, markers):
+            self.captcha = True
+        if any(marker in markers for marker in EMBEDDED_FORM_MARKERS):
+            self.embedded_form = True
+        if attributes.get('id', '').lower() in APP_ROOT_IDS or any(name in attributes for name in APP_ROOT_ATTRIBUTES):
+            self.app_root = True
+
+        if tag == 'script':
+            self.in_script = True
+            self.scripts += 1
+        elif tag == 'form':
+            self.in_form = True
+            self.form_inputs = 0
+            self.form_password = False
+            self.form_is_search = attributes.get('role', '').lower() == 'search' or 'search' in markers
+        elif self.in_form and tag == 'textarea':
+            self.form_inputs += 1
+        elif self.in_form and tag in ('input', 'select'):
+            input_type = attributes.get('type', '').lower()
+            if input_type == 'password':
+                self.form_password = True
+            elif input_type == 'search':
+                self.form_is_search = True
+            elif tag == 'select' or input_type in TEXT_INPUT_TYPES:
+                self.form_inputs += 1
+
+    @staticmethod
+    def _is_captcha_widget(tag: str, attributes: Dict[str, str], markers: str) -> bool:
+        """A visible reCAPTCHA v2 / hCaptcha / Turnstile widget, as opposed to a loader or invisible badge."""
+        if tag in CAPTCHA_LOADER_TAGS or attributes.get('data-size', '').lower() == 'invisible':
+            return False
+        return any(marker in markers for marker in CAPTCHA_MARKERS) or 'data-sitekey' in attributes
+
+    def handle_data(self, data):
+        if self.in_script and not self.writes_dom:
+            code = data.lower()
+            self.writes_dom = any(call in code for call in DOM_WRITING_CALLS)
+
+    def handle_endtag(self, tag):
+        if tag == 'script':
+            self.in_script = False
+        elif tag == 'form' and self.in_form:
+            self.in_form = False
+            if self.form_password:
+                self.login_forms += 1
+            elif self.form_inputs >= 2 and not self.form_is_search:
+                self.contact_forms += 1
+
+
+class SiteProbe:
+    """
+    Bulk, browser-free pre-stage for a campaign: fetches every website over HTTP
+    with bounded concurrency and classifies it as form / captcha / dead /
+    redirect / login / no_form, so only promising targets get a Chrome page load.
+    Sites the static fetch cannot judge (bot protection, pages rendered by
+    script) are inconclusive and go to the browser too.
+    """
+
+    def __init__(self, concurrency: int = 20, timeout: float = 10.0, user_agent: Optional[str] = None,
+                 skip_statuses: Iterable[str] = DEFAULT_SKIP_STATUSES, max_bytes: int = 2_000_000):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.user_agent = user_agent or "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+        self.skip_statuses = set(skip_statuses)
+        self.max_bytes = max_bytes
+
+    def run(self, urls: List[str]) -> Dict[str, Dict]:
+        """Synchronous entry point for the campaign manager."""
+        return asyncio.run(self.probe_all(urls))
+
+    async def probe_all(self, urls: List[str]) -> Dict[str, Dict]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(follow_redirects=True, timeout=self.timeout, limits=limits,
+                                     headers={'User-Agent': self.user_agent}) as client:
+            async def bounded(url):
+                async with semaphore:
+                    return await self.probe(client, url)
+
+            results = await asyncio.gather(*(bounded(url) for url in urls))
+        return dict(zip(urls, results))
+
+    async def probe(self, client: httpx.AsyncClient, url: str) -> Dict:
+        started = time.monotonic()
+        result = {'url': url, 'final_url': url, 'http_status': None, 'status': DEAD, 'reason': None}
+        try:
+            async with client.stream('GET', url) as response:
+                result['http_status'] = response.status_code
+                result['final_url'] = str(response.url)
+                if response.status_code >= 400:
+                    result['reason'] = f"HTTP {response.status_code}"
+                    if response.status_code not in DEAD_HTTP_STATUSES:
+                        result['status'] = INCONCLUSIVE
+                    return self._finish(result, started)
+
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body.extend(chunk)
+                    if len(body) >= self.max_bytes:
+                        break
+                html = body.decode(response.encoding or 'utf-8', errors='replace')
+        except httpx.HTTPError as e:
+            result['reason'] = f"{type(e).__name__}: {e}"
+            return self._finish(result, started)
+
+        if self._host(result['final_url']) != self._host(url):
+            result['status'] = REDIRECT
+            result['reason'] = f"Redirected off-site to {result['final_url']}"
+            return self._finish(result, started)
+
+        result.update(self.classify_html(html))
+        return self._finish(result, started)
+
+    @staticmethod
+    def classify_html(html: str) -> Dict:
+        scanner = _PageScanner()
+        try:
+            scanner.feed(html)
+            scanner.close()
+        except Exception as e:
+            logger.debug(f"HTML parse stopped early: {e}")
+
+        if scanner.captcha:
+            return {'status': CAPTCHA, 'reason': 'CAPTCHA widget present'}
+        if scanner.contact_forms or scanner.embedded_form:
+            return {'status': FORM, 'reason': None}
+        if scanner.login_forms:
+            return {'status': LOGIN, 'reason': 'Only login forms found'}
+        if scanner.renders_with_js:
+            return {'status': INCONCLUSIVE, 'reason': 'No form in static HTML, but the page renders with JavaScript'}
+        return {'status': NO_FORM, 'reason': 'No usable form in static HTML'}
+
+    def should_skip(self, result: Dict) -> bool:
+        return result['status'] in self.skip_statuses
+
+    @staticmethod
+    def _host(url: str) -> str:
+        host = (urlparse(url).hostname or '').lower()
+        return host[4:] if host.startswith('www.') else host
+
+    @staticmethod
+    def _finish(result: Dict, started: float) -> Dict:
+        result['elapsed'] = round(time.monotonic() - started, 3)
+        return result
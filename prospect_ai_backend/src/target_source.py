@@ -0,0 +1,141 @@
+import csv
+import json
+import re
+from itertools import chain, islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from loguru import logger
+
+TARGET_FILE_FORMATS = ('.csv', '.jsonl', '.txt')
+
+# Column / key holding the website, first match wins; every other column is metadata
+WEBSITE_COLUMNS = ('website', 'url', 'domain', 'site')
+
+# A host with at least one dot, optionally with scheme, port and path
+WEBSITE_PATTERN = re.compile(r'^(https?://)?[a-z0-9]([a-z0-9-]*[a-z0-9])?(\.[a-z0-9]([a-z0-9-]*[a-z0-9])?)+(:\d+)?([/?#]\S*)?$',
+                             re.IGNORECASE)
+
+
+def normalize_website(raw) -> Optional[str]:
+    """
+    Canonical URL of a website: trimmed, https:// added to a bare domain, scheme and host
+    lower-cased (the path keeps its case). None when the value is empty or not a website.
+    """
+    if not isinstance(raw, str):
+        return None
+    website = raw.strip()
+    if not website or not WEBSITE_PATTERN.match(website):
+        return None
+    if '://' not in website:
+        website = f"https://{website}"
+    parts = urlsplit(website)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, parts.fragment))
+
+
+class TargetSource:
+    """
+    Campaign targets, read lazily: the inline `websites` list, then a CSV, JSONL
+    or plain-text file streamed one row at a time. Each target is a dict with the
+    website and the row's other fields as metadata (company, contact name, ...).
+    Rows without a valid website are logged and skipped as they are read.
+    """
+
+    def __init__(self, websites: Optional[List[str]] = None, targets_file: Optional[Path] = None):
+        self.websites = websites or []
+        self.targets_file = Path(targets_file) if targets_file else None
+        self.read = 0
+        self.invalid = 0
+
+    def describe(self) -> str:
+        if self.targets_file:
+            inline = f"{len(self.websites)} websites plus " if self.websites else ""
+            return f"{inline}targets streamed from {self.targets_file}"
+        return f"{len(self.websites)} websites"
+
+    def __iter__(self) -> Iterator[Dict]:
+        self.read = self.invalid = 0
+        rows = ((f"websites[{n}]", {'website': url}) for n, url in enumerate(self.websites))
+        if self.targets_file:
+            rows = chain(rows, ((f"{self.targets_file.name}:{n}", row) for n, row in self._file_rows()))
+        for line, row in rows:
+            website = normalize_website(row.get('website'))
+            if website is None:
+                self.invalid += 1
+                logger.warning(f"Skipping target {line}: no valid website in {row}")
+                continue
+            self.read += 1
+            metadata = {key: value for key, value in row.items() if key != 'website' and value not in (None, '')}
+            yield {'website': website, 'metadata': metadata}
+
+    def chunks(self, size: int) -> Iterator[List[Dict]]:
+        targets = iter(self)
+        while True:
+            chunk = list(islice(targets, max(1, size)))
+            if not chunk:
+                return
+            yield chunk
+
+    def _file_rows(self) -> Iterator:
+        suffix = self.targets_file.suffix.lower()
+        with open(self.targets_file, 'r', encoding='utf-8', newline='') as f:
+            if suffix == '.csv':
+                yield from self._csv_rows(f)
+            elif suffix == '.jsonl':
+                yield from self._jsonl_rows(f)
+            else:
+                for n, line in enumerate(f, 1):
+                    line = line.strip()
+                    if line and not line.startswith('#'):
+                        yield n, {'website': line}
+
+    @staticmethod
+    def _csv_rows(f) -> Iterator:
+        reader = csv.DictReader(f)
+        columns = {name.strip().lower(): name for name in reader.fieldnames or []}
+        website_column = next((columns[name] for name in WEBSITE_COLUMNS if name in columns), None)
+        if website_column is None:
+            raise ValueError(f"Targets CSV needs one of the columns {list(WEBSITE_COLUMNS)}")
+        for n, row in enumerate(reader, 2):
+            yield n, {('website' if key == website_column else key.strip().lower()): value
+                      for key, value in row.items() if key is not None}
+
+    @staticmethod
+    def _jsonl_rows(f) -> Iterator:
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                row = {}
+            if isinstance(row, str):
+                row = {'website': row}
+            elif isinstance(row, dict):
+                key = next((key for key in WEBSITE_COLUMNS if key in row), None)
+                row = {('website' if k == key else k): v for k, v in row.items()}
+            else:
+                row = {}
+            yield n, row
+
+
+def check_targets_file(path: Path):
+    """Cheap checks for the config validator: the file exists, has a known format and a website column; rows are not read."""
+    path = Path(path)
+    if path.suffix.lower() not in TARGET_FILE_FORMATS:
+        raise ValueError(f"targets_file must be one of {list(TARGET_FILE_FORMATS)} files: {path}")
+    if not path.is_file():
+        raise ValueError(f"targets_file not found: {path}")
+    if path.suffix.lower() == '.csv':
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            header = next(csv.reader(f), [])
+        if not any(column.strip().lower() in WEBSITE_COLUMNS for column in header):
+            raise ValueError(f"targets_file {path} needs one of the columns {list(WEBSITE_COLUMNS)}")
+
+
+def metadata_lines(metadata: Optional[Dict]) -> List[str]:
+    """Per-target metadata as prompt lines, e.g. 'Company: Acme Pumps'."""
+    return [f"{str(key).replace('_', ' ').title()}: {value}" for key, value in (metadata or {}).items()
+            if isinstance(value, (str, int, float))]
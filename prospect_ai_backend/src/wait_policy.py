@@ -0,0 +1,224 @@
+import time
+from typing import Callable, Dict, List, Optional
+
+from loguru import logger
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+# Page-side instrumentation: counts in-flight fetch/XHR requests, keeps the last
+# completed requests with their method and status, and records the time and text
+# of DOM mutations. Safe to run more than once per document.
+INSTRUMENT_SCRIPT = """
+(function () {
+    if (window.__prospectAiWait) return;
+    var MAX_EVENTS = 30, MAX_TEXT = 300;
+    var state = window.__prospectAiWait = {
+        pending: 0, started: 0, lastMutation: Date.now(), lastWrite: 0, responses: [], addedText: []
+    };
+    function push(list, item) {
+        list.push(item);
+        if (list.length > MAX_EVENTS) list.shift();
+    }
+    function begin() { state.pending++; state.started++; }
+    function end() { state.pending = Math.max(0, state.pending - 1); }
+    function record(method, url, status) {
+        method = String(method || 'GET').toUpperCase();
+        var now = Date.now();
+        push(state.responses, {method: method, url: String(url || '').slice(0, MAX_TEXT), status: status, t: now});
+        if (method !== 'GET' && method !== 'HEAD' && method !== 'OPTIONS') state.lastWrite = now;
+    }
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function (input, init) {
+            begin();
+            var method = (init && init.method) || (input && input.method) || 'GET';
+            var url = (input && input.url) || input;
+            var promise = originalFetch.apply(this, arguments);
+            promise.then(function (response) { record(method, url, response.status); end(); },
+                         function () { record(method, url, 0); end(); });
+            return promise;
+        };
+    }
+    var originalOpen = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__prospectAiRequest = [method, url];
+        return originalOpen.apply(this, arguments);
+    };
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        var xhr = this, request = xhr.__prospectAiRequest || ['GET', ''];
+        begin();
+        xhr.addEventListener('loadend', function () { record(request[0], request[1], xhr.status); end(); });
+        return originalSend.apply(this, arguments);
+    };
+    function noteText(node) {
+        var text = (node.nodeType === 3 ? node.nodeValue : node.textContent) || '';
+        text = text.replace(/\\s+/g, ' ').trim();
+        if (text) push(state.addedText, {text: text.slice(0, MAX_TEXT), t: Date.now()});
+    }
+    new MutationObserver(function (mutations) {
+        state.lastMutation = Date.now();
+        for (var i = 0; i < mutations.length && i < 50; i++) {
+            var mutation = mutations[i];
+            if (mutation.type === 'childList') {
+                for (var j = 0; j < mutation.addedNodes.length; j++) {
+                    var node = mutation.addedNodes[j];
+                    if (node.nodeType === 1 && node.tagName !== 'SCRIPT' && node.tagName !== 'STYLE') noteText(node);
+                    else if (node.nodeType === 3) noteText(node);
+                }
+            } else if (mutation.type === 'attributes' && mutation.target.nodeType === 1
+                       && (mutation.target.textContent || '').length < 500 && mutation.target.getClientRects().length) {
+                // Confirmation boxes that already exist and are just revealed
+                noteText(mutation.target);
+            } else if (mutation.type === 'characterData') {
+                noteText(mutation.target);
+            }
+        }
+    }).observe(document, {childList: true, subtree: true, attributes: true, characterData: true,
+                          attributeFilter: ['class', 'style', 'hidden']});
+})();
+"""
+
+STATE_SCRIPT = INSTRUMENT_SCRIPT + """
+var state = window.__prospectAiWait;
+return {
+    readyState: document.readyState,
+    pending: state.pending,
+    started: state.started,
+    lastMutation: state.lastMutation,
+    lastWrite: state.lastWrite,
+    quietFor: (Date.now() - state.lastMutation) / 1000,
+    now: Date.now(),
+    url: location.href
+};
+"""
+
+# Everything observed since a timestamp: completed requests, text added to the
+# DOM, and the HTTP status of the current document (Navigation Timing).
+EVIDENCE_SCRIPT = INSTRUMENT_SCRIPT + """
+var state = window.__prospectAiWait, since = arguments[0];
+var nav = performance.getEntriesByType('navigation')[0] || {};
+return {
+    responses: state.responses.filter(function (r) { return r.t >= since; }),
+    added_text: state.addedText.filter(function (e) { return e.t >= since; }).map(function (e) { return e.text; }),
+    navigation_status: nav.responseStatus || 0,
+    url: location.href
+};
+"""
+
+
+class WaitPolicy:
+    """
+    Event-driven replacement for fixed sleeps. Each wait polls one in-page state
+    script (readyState, pending fetch/XHR count, DOM mutation quiescence, URL) and
+    returns as soon as its condition holds or the step's timeout expires.
+    Every wait is recorded in `timings` with the measured duration.
+    """
+
+    DEFAULT_TIMEOUTS = {'navigate': 15, 'scroll': 2, 'submit': 10, 'verify': 8}
+
+    def __init__(self, driver, timeouts: Optional[Dict[str, float]] = None, quiet_period: float = 0.5,
+                 poll_frequency: float = 0.1, min_ready_state: str = 'complete'):
+        self.driver = driver
+        self.timeouts = {**self.DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.quiet_period = quiet_period
+        # 'interactive' lets an eager page-load strategy continue before subresources finish
+        self.ready_states = ('interactive', 'complete') if min_ready_state == 'interactive' else ('complete',)
+        self.poll_frequency = poll_frequency
+        self.timings: List[Dict[str, any]] = []
+        self._new_document_hook = False
+
+    def reset(self):
+        """Start a new site: clear recorded timings and make sure new documents are instrumented."""
+        self.timings = []
+        if self._new_document_hook or not hasattr(self.driver, 'execute_cdp_cmd'):
+            return
+        try:
+            # Chrome only: instrument every future document before its own scripts run
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': INSTRUMENT_SCRIPT})
+            self._new_document_hook = True
+        except Exception as e:
+            logger.debug(f"CDP instrumentation unavailable, falling back to lazy injection: {e}")
+
+    def page_state(self) -> Dict[str, any]:
+        return self.driver.execute_script(STATE_SCRIPT)
+
+    def wait_for_page_ready(self, step: str) -> bool:
+        return self._wait(step, 'ready_state', lambda s: s['readyState'] in self.ready_states)
+
+    def wait_for_dom_quiet(self, step: str) -> bool:
+        return self._wait(step, 'dom_quiet', lambda s: s['quietFor'] >= self.quiet_period)
+
+    def wait_for_network_idle(self, step: str) -> bool:
+        return self._wait(step, 'network_idle', lambda s: s['pending'] == 0)
+
+    def wait_for_url_change(self, previous_url: str, step: str) -> bool:
+        return self._wait(step, 'url_change', lambda s: s['url'] != previous_url)
+
+    def wait_for_settle(self, step: str) -> bool:
+        """Document loaded, no requests in flight and no DOM mutations for quiet_period."""
+        return self._wait(step, 'settled', self.is_settled)
+
+    def wait_for_submission(self, baseline: Dict[str, any], step: str = 'submit') -> bool:
+        """
+        After a submit click: continue once the URL changed, as soon as the DOM changed
+        after a POST/PUT response arrived, or once the page reacted (a request started
+        or the DOM changed since `baseline`) and then settled.
+        """
+        return self._wait(step, 'submission', self.submission_condition(baseline))
+
+    def submission_condition(self, baseline: Dict[str, any]) -> Callable[[Dict[str, any]], bool]:
+        """The predicate over STATE_SCRIPT results that wait_for_submission polls."""
+        def condition(state):
+            if state['url'] != baseline.get('url'):
+                return state['readyState'] in self.ready_states
+            last_write = state.get('lastWrite', 0)
+            if last_write > baseline.get('now', 0) and state['lastMutation'] >= last_write:
+                return True
+            reacted = state['started'] > baseline.get('started', 0) or state['lastMutation'] > baseline.get('lastMutation', 0)
+            return reacted and self.is_settled(state)
+
+        return condition
+
+    def submission_evidence(self, baseline: Dict[str, any]) -> Optional[Dict[str, any]]:
+        """Requests completed and text added to the page since `baseline`, plus the document's HTTP status."""
+        try:
+            evidence = self.driver.execute_script(EVIDENCE_SCRIPT, baseline.get('now', 0))
+        except WebDriverException as e:
+            logger.debug(f"Could not read submission evidence: {e}")
+            return None
+        if evidence:
+            evidence['url_changed'] = evidence['url'] != baseline.get('url')
+        return evidence
+
+    def mark(self) -> Dict[str, any]:
+        """Capture the page state before an action, for use as a wait baseline."""
+        try:
+            return self.page_state()
+        except WebDriverException:
+            return {}
+
+    def total_wait(self) -> float:
+        return round(sum(timing['waited'] for timing in self.timings), 3)
+
+    def is_settled(self, state: Dict[str, any]) -> bool:
+        return state['readyState'] in self.ready_states and state['pending'] == 0 and state['quietFor'] >= self.quiet_period
+
+    def record(self, step: str, condition: str, waited: float, timeout: float, met: bool):
+        self.timings.append({'step': step, 'condition': condition, 'waited': waited, 'timeout': timeout, 'met': met})
+
+    def _wait(self, step: str, condition: str, predicate: Callable[[Dict[str, any]], bool]) -> bool:
+        timeout = self.timeouts.get(step, max(self.DEFAULT_TIMEOUTS.values()))
+        started = time.monotonic()
+        met = True
+        try:
+            # Script errors while a new document loads are retried on the next poll
+            WebDriverWait(self.driver, timeout, poll_frequency=self.poll_frequency,
+                          ignored_exceptions=(WebDriverException,)).until(lambda d: predicate(self.page_state()))
+        except TimeoutException:
+            met = False
+            logger.debug(f"Wait '{condition}' for step '{step}' timed out after {timeout}s")
+        waited = round(time.monotonic() - started, 3)
+        self.record(step, condition, waited, timeout, met)
+        return met
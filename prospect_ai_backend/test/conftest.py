@@ -0,0 +1,98 @@
+import os
+import sys
+
+# Ensure "src" is importable
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+
+class FakeDriver:
+    """
+    Stand-in for a Selenium WebDriver. execute_script returns the scripted `states`
+    in turn (repeating the last one) or else `script_result`, and raises like a
+    dead session once `alive` is False. Every call is recorded for assertions.
+    """
+
+    def __init__(self, script_result=None, states=None):
+        self.script_result = script_result
+        self.states = list(states or [])
+        self.alive = True
+        self.quit_called = False
+        self.visited = []
+        self.scripts = []
+        self.commands = []
+        self.cookies = []
+
+    def execute_script(self, script, *args):
+        if not self.alive:
+            raise WebDriverException("session deleted")
+        self.scripts.append((script, args))
+        if self.states:
+            return self.states.pop(0) if len(self.states) > 1 else self.states[0]
+        return self.script_result
+
+    def execute(self, command, params=None):
+        self.commands.append(command)
+        return {'value': None}
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def delete_all_cookies(self):
+        pass
+
+    def get_cookies(self):
+        return [{"name": "session", "value": "abc", "sameSite": "Strict"}]
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeElement:
+    """Stand-in for a WebElement that keeps what was typed into it."""
+
+    def __init__(self, tag_name="input", attributes=None):
+        self.tag_name = tag_name
+        self.attributes = attributes or {}
+        self.value = ""
+        self.keys = []
+        self.clicked = 0
+
+    def clear(self):
+        self.value = ""
+
+    def send_keys(self, *values):
+        for value in values:
+            self.keys.append(value)
+            self.value += value
+
+    def click(self):
+        self.clicked += 1
+
+    def get_attribute(self, name):
+        if name == "value":
+            return self.value
+        return self.attributes.get(name)
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+
+@pytest.fixture
+def fake_driver():
+    return FakeDriver()
+
+
+@pytest.fixture
+def fake_element():
+    return FakeElement()
@@ -0,0 +1,77 @@
+import pytest
+
+pytest.importorskip("fastapi")
+
+from conftest import FakeDriver
+from src.api.services import automation_service
+from src.contact_form_manager import ContactFormManager
+from src.contact_page_discovery import ContactPageDiscovery
+from src.result_sink import read_results
+
+
+class FakePool:
+    def __init__(self):
+        self.acquired, self.released = [], []
+
+    def acquire(self):
+        self.acquired.append(FakeDriver())
+        return self.acquired[-1]
+
+    def release(self, driver, reusable=True):
+        self.released.append(driver)
+
+
+class FakeLLMService:
+    class _mgr:
+        _personalizer = None
+
+
+class FakeAutomator:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def submit_contact_form(self, website_url, contact_data, target_metadata=None):
+        self.driver.get(website_url)
+        return {'success': True, 'website': website_url, 'form_data': contact_data}
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    pools = []
+
+    def shared_pool(profile_name=None, size=1):
+        if not pools:
+            pools.append(FakePool())
+        return pools[0]
+
+    monkeypatch.setenv("CONTACT_OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setenv("CONTACT_DELAY_SECONDS", "0")
+    monkeypatch.setattr(automation_service, "get_shared_browser_pool", shared_pool)
+    monkeypatch.setattr(automation_service, "LLMService", FakeLLMService)
+    monkeypatch.setattr(ContactFormManager, "_create_automator",
+                        lambda self, driver, captcha_solver=None: FakeAutomator(driver))
+    monkeypatch.setattr(ContactPageDiscovery, "resolve",
+                        lambda self, domains: {domain: f"https://{self.normalize_domain(domain)}/kontakt"
+                                                   for domain in domains})
+    return automation_service.AutomationService(), pools
+
+
+def test_browser_pool_starts_on_first_job(service):
+    _, pools = service
+    assert pools == []
+
+
+def test_job_runs_through_the_campaign_manager(service, tmp_path):
+    svc, pools = service
+    svc._run_sync("job-1", {"message_template": "Hi {{name}}", "campaign_id": None, "targets": [
+        {"domain": "acme.test", "contact_url": "https://acme.test/contact"},
+        {"domain": "globex.test", "company": "Globex"},
+    ]})
+
+    results = list(read_results(tmp_path / "job-1" / "contact_submissions_success.jsonl"))
+    # The domain-only target went through the manager's contact page discovery
+    assert [r["website"] for r in results] == ["https://acme.test/contact", "https://globex.test/kontakt"]
+    assert results[0]["contact_data"]["message"] == "Hi {{name}}"
+    assert results[1]["target"] == {"company": "Globex"}
+    pool = pools[0]
+    assert pool.released == pool.acquired and len(pool.acquired) == 1
@@ -0,0 +1,131 @@
+import asyncio
+import json
+
+import pytest
+from loguru import logger
+
+from conftest import FakeDriver
+from src.async_campaign import AsyncContactCampaign, selenium_cookies
+from src.browser_backend import AsyncBrowserBackend, BrowserBackend, PlaywrightBackend, SeleniumBackend, wrap_script
+from src.fill_strategies import ChunkedFillStrategy, InPageFillStrategy
+from src.form_snapshot import SNAPSHOT_SCRIPT
+from src.wait_policy import STATE_SCRIPT, WaitPolicy
+
+
+class FakeHandle:
+    def __init__(self, ref):
+        self.ref = ref
+
+    def as_element(self):
+        return self if self.ref is not None else None
+
+
+class FakePage:
+    def __init__(self, snapshot=None, states=None):
+        self.snapshot = snapshot
+        self.states = list(states or [])
+        self.calls = []
+
+    async def evaluate(self, expression, arg):
+        self.calls.append((expression, arg))
+        if SNAPSHOT_SCRIPT in expression:
+            return json.dumps(self.snapshot)
+        if STATE_SCRIPT in expression:
+            return self.states.pop(0)
+        return None
+
+    async def evaluate_handle(self, expression, ref):
+        return FakeHandle(ref if ref < 2 else None)
+
+
+def test_playwright_backend_wraps_selenium_style_scripts():
+    page = FakePage(snapshot={'url': 'https://acme.test/contact', 'fields': [{'ref': 0, 'tag': 'input'}]})
+    backend = PlaywrightBackend(page)
+
+    snapshot = asyncio.run(backend.snapshot())
+    assert snapshot.url == 'https://acme.test/contact'
+    expression, args = page.calls[0]
+    assert expression == wrap_script(SNAPSHOT_SCRIPT)
+    assert args[0].startswith('form')
+
+    elements = asyncio.run(backend.resolve(snapshot, [{'ref': 1}, None, {'ref': 5}]))
+    assert [element.ref if element else None for element in elements] == [1, None, None]
+
+
+def test_selenium_backend_delegates_to_driver_and_fill_strategy():
+    class Strategy:
+        def fill(self, driver, element, value, field_type, tag_name):
+            self.filled = (driver, element, value, field_type, tag_name)
+
+    driver, strategy = FakeDriver('ok'), Strategy()
+    backend = SeleniumBackend(driver, strategy)
+    backend.navigate('https://acme.test')
+    assert backend.evaluate('return 1', 'a') == 'ok'
+    backend.fill('el', 'Jane', 'name', 'input')
+
+    assert driver.visited == ['https://acme.test']
+    assert driver.scripts == [('return 1', ('a',))]
+    assert strategy.filled == (driver, 'el', 'Jane', 'name', 'input')
+
+
+def test_async_wait_polls_state_until_settled():
+    class Planner:
+        signal_matcher = None
+        fill_strategy = InPageFillStrategy()
+
+    settling = {'readyState': 'complete', 'pending': 1, 'quietFor': 0.0}
+    settled = {'readyState': 'complete', 'pending': 0, 'quietFor': 1.0}
+    backend = PlaywrightBackend(FakePage(states=[settling, settling, settled]))
+    policy = WaitPolicy(None, poll_frequency=0.001)
+
+    campaign = AsyncContactCampaign(Planner())
+    assert asyncio.run(campaign._wait(backend, policy, 'navigate', 'settled', policy.is_settled))
+    assert policy.timings[0]['met'] and policy.timings[0]['step'] == 'navigate'
+    assert len(backend.page.states) == 0
+
+    cookies = selenium_cookies([{'name': 'sid', 'value': '1', 'domain': 'acme.test', 'expires': 1893456000.5},
+                                {'name': 'tmp', 'value': '2', 'expires': -1}])
+    assert cookies == [{'name': 'sid', 'value': '1', 'domain': 'acme.test', 'expiry': 1893456000},
+                       {'name': 'tmp', 'value': '2'}]
+
+
+def test_backend_bases_are_abstract():
+    class NavigateOnly(BrowserBackend):
+        def navigate(self, url):
+            pass
+
+    for backend in (BrowserBackend, AsyncBrowserBackend, NavigateOnly):
+        with pytest.raises(TypeError):
+            backend()
+
+
+def test_async_campaign_rejects_fill_strategies_it_cannot_run():
+    class Planner:
+        signal_matcher = None
+        fill_strategy = ChunkedFillStrategy()
+
+    with pytest.raises(ValueError):
+        AsyncContactCampaign(Planner())
+    Planner.fill_strategy = InPageFillStrategy(emulate_keystrokes=True)
+    assert AsyncContactCampaign(Planner()).fill_strategy == 'in_page'
+
+
+def test_failures_of_finished_site_tasks_are_retrieved():
+    async def failing():
+        raise RuntimeError("result sink is full")
+
+    async def ok():
+        return {'success': True}
+
+    async def run():
+        done, _ = await asyncio.wait({asyncio.create_task(failing()), asyncio.create_task(ok())})
+        return AsyncContactCampaign._reap(done), done
+
+    errors = []
+    sink = logger.add(errors.append, level="ERROR")
+    try:
+        processed, _ = asyncio.run(run())
+    finally:
+        logger.remove(sink)
+    assert processed == 2
+    assert len(errors) == 1 and "result sink is full" in errors[0]
@@ -0,0 +1,39 @@
+import threading
+import time
+
+from conftest import FakeDriver
+from src.browser_pool import BrowserPool
+
+
+def test_acquire_returns_warm_sessions_and_refills():
+    started = []
+    replacement_gate = threading.Event()
+
+    def factory():
+        if started:
+            replacement_gate.wait(2)
+        started.append(FakeDriver())
+        return started[-1]
+
+    pool = BrowserPool(factory, size=1)
+    first = pool.acquire()
+    assert first is started[0]
+
+    pool.release(first)
+    assert first.visited == ["about:blank"] and not first.quit_called
+
+    replacement_gate.set()
+    time.sleep(0.1)
+    assert len(started) == 2  # the acquired session was replaced in the background
+    pool.close()
+    assert all(driver.quit_called for driver in started)
+
+
+def test_dead_sessions_are_discarded():
+    drivers = iter([FakeDriver(), FakeDriver()])
+    pool = BrowserPool(lambda: next(drivers), size=1)
+    time.sleep(0.1)
+    pool._idle.queue[0].alive = False
+    driver = pool.acquire()
+    assert driver.alive
+    pool.close()
@@ -0,0 +1,36 @@
+import json
+
+from src.browser_profile import PageLoadMetrics, blocked_category, build_chrome_options, get_browser_profile
+
+
+class MetricsDriver:
+    def __init__(self, log):
+        self.log = log
+
+    def execute_script(self, script):
+        return {"dom_content_loaded": 850, "load_event": 0, "transferred_bytes": 120000}
+
+    def get_log(self, name):
+        entries, self.log = self.log, []
+        return [{"message": json.dumps({"message": entry})} for entry in entries]
+
+
+def test_performance_profile_options():
+    options = build_chrome_options(get_browser_profile("performance"))
+    assert "--headless=new" in options.arguments
+    assert options.page_load_strategy == "eager"
+    assert get_browser_profile("performance", {"headless": False})["headless"] is False
+
+
+def test_blocked_requests_are_counted_per_category():
+    log = [
+        {"method": "Network.requestWillBeSent", "params": {"requestId": "1", "request": {"url": "https://cdn.test/font.woff2?v=3"}}},
+        {"method": "Network.requestWillBeSent", "params": {"requestId": "2", "request": {"url": "https://www.googletagmanager.com/gtm.js"}}},
+        {"method": "Network.loadingFailed", "params": {"requestId": "1", "blockedReason": "inspector"}},
+        {"method": "Network.loadingFailed", "params": {"requestId": "2", "blockedReason": "inspector"}},
+    ]
+    metrics = PageLoadMetrics(MetricsDriver(log)).collect()
+    assert metrics["blocked_requests"] == {"font": 1, "analytics": 1}
+    assert metrics["estimated_bytes_saved"] > 0
+    assert metrics["page_load_time"] == 0.85
+    assert blocked_category("https://acme.test/hero.mp4") == "media"
@@ -0,0 +1,54 @@
+from conftest import FakeDriver
+from src.browser_session import BrowserSession
+
+
+def make_session(**options):
+    released = []
+    session = BrowserSession(FakeDriver(), FakeDriver, lambda driver, reusable=True: released.append(driver),
+                             lambda driver: ("automator", driver), **options)
+    return session, released
+
+
+def test_state_cleared_between_sites_and_recycled_at_limit():
+    session, released = make_session(max_sites=2)
+    first = session.driver
+    for _ in range(2):
+        session.before_site()
+        assert not session.after_site()
+    assert first.visited == ["about:blank"]
+
+    session.before_site()
+    assert released == [first] and session.driver is not first
+    assert session.automator == ("automator", session.driver)
+    assert session.metrics["recycles"] == {"site_limit": 1}
+
+
+def test_dead_session_is_respawned():
+    session, released = make_session()
+    crashed = session.driver
+    crashed.alive = False
+    assert session.after_site()
+    assert session.driver is not crashed and session.driver.alive
+    assert session.metrics["crashes"] == 1 and session.metrics["recycles"] == {"crash": 1}
+
+
+def test_caller_owned_driver_is_swapped_out_but_never_released():
+    session, released = make_session(max_sites=1, owns_driver=False)
+    borrowed = session.driver
+    session.before_site()
+    session.after_site()
+    session.before_site()
+    assert session.driver is not borrowed and released == []
+    assert not borrowed.quit_called
+
+    replacement = session.driver
+    session.close()
+    assert released == [replacement]
+
+
+def test_crashed_caller_owned_driver_is_left_to_the_caller():
+    session, released = make_session(owns_driver=False)
+    borrowed = session.driver
+    borrowed.alive = False
+    assert session.after_site()
+    assert released == [] and session.driver is not borrowed
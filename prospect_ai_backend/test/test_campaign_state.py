@@ -0,0 +1,45 @@
+from src.campaign_state import CampaignState
+
+
+def test_restart_skips_done_targets_and_retries_interrupted_ones(tmp_path):
+    websites = [f"https://site{i}.example/contact" for i in range(5)]
+    state = CampaignState(tmp_path / 'state.sqlite3', 'spring')
+    for url in websites[:3]:
+        state.start(url)
+    state.finish(websites[0], 'success')
+    state.finish(websites[1], 'skipped')
+    state.close()  # the process dies while websites[2] is in flight
+
+    state = CampaignState(tmp_path / 'state.sqlite3', 'spring')
+    assert state.pending(websites) == websites[2:]
+    assert state.status_of(websites[2]) == 'in_flight'
+    assert state.counts() == {'success': 1, 'skipped': 1, 'in_flight': 1}
+
+
+def test_campaigns_are_kept_apart(tmp_path):
+    url = 'https://site.example/contact'
+    CampaignState(tmp_path / 'state.sqlite3', 'spring').finish(url, 'failed')
+    assert CampaignState(tmp_path / 'state.sqlite3', 'autumn').pending([url]) == [url]
+
+
+def test_finished_targets_are_committed_at_once_and_starts_in_batches(tmp_path):
+    websites = [f"https://site{i}.example/contact" for i in range(3)]
+    state = CampaignState(tmp_path / 'state.sqlite3', 'spring', commit_every=3, commit_interval=3600)
+    other = CampaignState(tmp_path / 'state.sqlite3', 'spring')
+    state.start(websites[0])
+    state.start(websites[1])
+    assert other.status_of(websites[0]) is None
+    # A crash right after this must not lose the submission
+    state.finish(websites[0], 'success')
+    assert other.pending(websites) == websites[1:]
+    assert other.status_of(websites[1]) == 'in_flight'
+
+
+def test_pending_checks_only_the_given_targets(tmp_path):
+    state = CampaignState(tmp_path / 'state.sqlite3', 'spring')
+    for i in range(1200):
+        state.finish(f"https://site{i}.example/", 'success')
+    state.flush()
+    chunk = [f"https://site{i}.example/" for i in range(1195, 1205)]
+    assert state.pending(chunk) == chunk[5:]
+    assert state.resumed_done == 5
@@ -0,0 +1,50 @@
+import pytest
+
+from conftest import FakeDriver
+from src.captcha_handler import CaptchaHandler
+from src.captcha_queue import CaptchaDeferralQueue, CaptchaSolver, TokenCaptchaSolver
+
+
+def test_detect_uses_one_script_call():
+    driver = FakeDriver({"present": True, "selector": "div.h-captcha", "site_key": "k", "invisible": False})
+    detection = CaptchaHandler(driver).detect()
+    assert detection["kind"] == "hcaptcha" and detection["blocking"]
+    assert len(driver.scripts) == 1
+
+    invisible = CaptchaHandler(FakeDriver({"present": True, "selector": 'iframe[src*="recaptcha"]', "invisible": True})).detect()
+    assert invisible["present"] and not invisible["blocking"]
+
+
+def test_parked_site_state_round_trips(tmp_path):
+    queue = CaptchaDeferralQueue(tmp_path / "deferred.jsonl")
+    queue.park("https://acme.test/contact", FakeDriver({"local": {"consent": "yes"}, "session": {}}),
+               {"kind": "recaptcha", "url": "https://acme.test/contact?x=1"})
+
+    entry = queue.pending()[0]
+    assert entry["storage"]["local"] == {"consent": "yes"}
+
+    driver = FakeDriver()
+    queue.restore(driver, entry)
+    assert driver.visited == ["https://acme.test/"]
+    assert driver.cookies[0]["name"] == "session"
+
+    queue.replace([])
+    assert queue.pending() == []
+
+
+def test_token_solver_injects_provider_token():
+    driver = FakeDriver(1)
+    solver = TokenCaptchaSolver(lambda entry: "token-for-" + entry["website"])
+    assert solver.solve(driver, {"website": "acme.test", "captcha": {}})
+    assert driver.scripts[0][1] == ("token-for-acme.test",)
+
+
+def test_solver_base_is_abstract():
+    with pytest.raises(TypeError):
+        CaptchaSolver()
+
+    class HalfSolver(CaptchaSolver):
+        name = 'half'
+
+    with pytest.raises(TypeError):
+        HalfSolver()
@@ -0,0 +1,128 @@
+import json
+import threading
+import time
+
+from conftest import FakeDriver
+from src.contact_form_manager import ContactFormManager
+from src.result_sink import read_results
+from src.retry_queue import RetryQueue
+
+
+class FakeAutomator:
+    """Takes the submission token like ContactFormAutomator and records which worker submitted what."""
+
+    def __init__(self, driver, rate_limiter, log):
+        self.driver = driver
+        self.rate_limiter = rate_limiter
+        self.log = log
+
+    def submit_contact_form(self, website_url, contact_data, target_metadata=None):
+        self.driver.get(website_url)
+        if self.rate_limiter:
+            self.rate_limiter.acquire(website_url)
+        self.log.append((website_url, threading.current_thread().name, self.driver, time.monotonic()))
+        return {'success': True, 'website': website_url, 'form_type': 'general_contact',
+                'form_data': contact_data, 'submission_time': time.time()}
+
+
+def run_campaign(tmp_path, websites, **parameters):
+    log = []
+    manager = ContactFormManager(FakeDriver())
+    manager.set_parameters({'name': 'Jane', 'email': 'jane@example.com', 'message': 'Hello',
+                            'websites': websites, 'delay_between_submissions': 0, 'max_submissions_per_hour': 0,
+                            'captcha': {'defer': False}, **parameters}, tmp_path)
+    manager.set_driver_factory(FakeDriver)
+    manager._create_automator = lambda driver, captcha_solver=None: FakeAutomator(driver, manager.rate_limiter, log)
+    manager.start_contact_campaign()
+    return manager, log
+
+
+def test_every_target_is_processed_exactly_once_across_workers(tmp_path):
+    websites = [f"https://site{i}.example/contact" for i in range(24)]
+    manager, log = run_campaign(tmp_path, websites, max_workers=4)
+
+    assert sorted(url for url, _, _, _ in log) == sorted(websites)
+    assert len({thread for _, thread, _, _ in log}) > 1
+    assert len({id(driver) for _, _, driver, _ in log}) > 1
+    assert len(manager.session_metrics) == 4
+
+
+def test_submission_spacing_holds_across_workers(tmp_path):
+    websites = [f"https://site{i}.example/contact" for i in range(6)]
+    _, log = run_campaign(tmp_path, websites, max_workers=3, delay_between_submissions=0.05)
+
+    submitted_at = sorted(at for _, _, _, at in log)
+    assert len(submitted_at) == 6
+    assert all(later - earlier >= 0.045 for earlier, later in zip(submitted_at, submitted_at[1:]))
+
+
+def test_concurrent_workers_write_complete_jsonl(tmp_path):
+    websites = [f"https://site{i}.example/contact" for i in range(60)]
+    run_campaign(tmp_path, websites, max_workers=8)
+
+    path = tmp_path / 'contact_submissions_success.jsonl'
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 60
+    assert sorted(json.loads(line)['website'] for line in lines) == sorted(websites)
+    assert len(list(read_results(path))) == 60
+    # The legacy JSON array export is off by default
+    assert not (tmp_path / 'contact_submissions_success.json').exists()
+
+    summary = json.loads((tmp_path / 'campaign_summary.json').read_text(encoding='utf-8'))
+    assert 'results' not in summary
+    assert summary['campaign_summary']['successful_submissions'] == 60
+    assert summary['campaign_summary']['form_type_breakdown'] == {'general_contact': {'total': 60, 'successful': 60}}
+    assert summary['result_files'] == {'success': str(path)}
+
+
+def test_crashed_site_is_retried_through_the_queue(tmp_path):
+    attempts = []
+
+    class CrashingAutomator(FakeAutomator):
+        def submit_contact_form(self, website_url, contact_data, target_metadata=None):
+            attempts.append(self.driver)
+            if len(attempts) == 1:
+                self.driver.alive = False
+                return {'success': False, 'website': website_url, 'error': 'chrome not reachable'}
+            return super().submit_contact_form(website_url, contact_data, target_metadata)
+
+    log = []
+    manager = ContactFormManager(FakeDriver())
+    borrowed = manager.driver
+    manager.set_parameters({'websites': ['https://acme.test/contact'], 'delay_between_submissions': 0,
+                            'max_submissions_per_hour': 0, 'captcha': {'defer': False}, 'max_retries': 1,
+                            'retry': {'base_delay': 0, 'max_delay': 0}}, tmp_path)
+    manager.set_driver_factory(FakeDriver)
+    manager._create_automator = lambda driver, captcha_solver=None: CrashingAutomator(driver, None, log)
+    manager.start_contact_campaign()
+
+    assert len(attempts) == 2 and attempts[1] is not borrowed
+    assert not borrowed.quit_called
+    result = list(read_results(tmp_path / 'contact_submissions_success.jsonl'))[0]
+    assert result['attempts'] == 2
+
+
+def test_homepage_only_targets_go_to_discovery():
+    assert ContactFormManager._is_domain_only('https://acme.com')
+    assert ContactFormManager._is_domain_only('https://acme.com/')
+    assert not ContactFormManager._is_domain_only('https://acme.com/contact')
+
+
+def test_domain_over_budget_waits_in_the_queue_not_on_a_filled_form(tmp_path):
+    manager = ContactFormManager(FakeDriver())
+    manager.set_parameters({'name': 'Jane', 'email': 'jane@example.com', 'message': 'Hello', 'websites': [],
+                            'max_submissions_per_hour': 0, 'delay_between_submissions': 0,
+                            'rate_limits': {'per_domain_per_hour': 3600}}, tmp_path)  # one per second
+    manager.rate_limiter.reserve('https://acme.example/contact')
+    targets = RetryQueue(['https://acme.example/quote', 'https://beta.example/contact'], manager.retry_policy)
+
+    i, website_url, attempt = targets.next_target()
+    assert manager._held_for_budget(targets, i, website_url, attempt)
+    # The worker moves on to the next target; the held one comes back once its domain has a token
+    assert targets.next_target()[1] == 'https://beta.example/contact'
+    assert not manager._held_for_budget(targets, 1, 'https://beta.example/contact', 0)
+    started = time.monotonic()
+    assert targets.next_target() == (0, 'https://acme.example/quote', 0)
+    assert 0.5 < time.monotonic() - started < 1.5
+    assert targets.retries == 0
+    targets.close()
@@ -0,0 +1,71 @@
+import asyncio
+
+import httpx
+
+from src.contact_page_discovery import ContactPageDiscovery
+
+HOMEPAGE = """
+<html><body>
+  <nav><a href="/about">About</a><a href="/pages/talk-to-us">Contact us</a></nav>
+  <main><a href="https://other.test/contact">Partner contact</a></main>
+  <footer><a href="/support">Support</a></footer>
+</body></html>
+"""
+CONTACT_PAGE = '<form><input name="name"><input type="email" name="email"><textarea name="message"></textarea></form>'
+
+
+def handler(request):
+    if request.url.host == "acme-old.test":
+        return httpx.Response(301, headers={"Location": f"https://acme.de{request.url.path}"})
+    if request.url.host == "down.test":
+        raise httpx.ConnectTimeout("timed out")
+    if request.url.path == "/":
+        return httpx.Response(200, text=HOMEPAGE)
+    if request.url.path == "/pages/talk-to-us":
+        return httpx.Response(200, text=CONTACT_PAGE)
+    if request.url.path == "/sitemap.xml":
+        return httpx.Response(200, text="<urlset><url><loc>https://acme.test/request-a-quote</loc></url></urlset>")
+    if request.url.path == "/request-a-quote":
+        return httpx.Response(200, text="<p>Call us</p>")
+    return httpx.Response(404)
+
+
+def discover(discovery, domain):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True) as client:
+            return await discovery.discover(client, domain)
+    return asyncio.run(run())
+
+
+def test_prefers_nav_link_with_a_form(tmp_path):
+    discovery = ContactPageDiscovery(cache_path=tmp_path / "cache.json")
+    result = discover(discovery, "https://www.acme.test")
+    assert result["contact_url"] == "https://www.acme.test/pages/talk-to-us"
+    assert all("other.test" not in url for url, _ in result["candidates"])
+
+
+def test_results_are_cached_per_domain(tmp_path):
+    discovery = ContactPageDiscovery(cache_path=tmp_path / "cache.json")
+    discover(discovery, "acme.test")
+    discovery._save_cache()
+
+    reloaded = ContactPageDiscovery(cache_path=tmp_path / "cache.json")
+    cached = discover(reloaded, "acme.test")
+    assert cached["cached"] and cached["contact_url"] == "https://acme.test/pages/talk-to-us"
+
+    expired = ContactPageDiscovery(cache_path=tmp_path / "cache.json", ttl_hours=0)
+    assert not discover(expired, "acme.test")["cached"]
+
+
+def test_domain_redirecting_to_another_host_keeps_its_candidates(tmp_path):
+    result = discover(ContactPageDiscovery(cache_path=tmp_path / "cache.json"), "acme-old.test")
+    assert result["contact_url"] == "https://acme.de/pages/talk-to-us"
+
+
+def test_nothing_found_is_cached_only_briefly(tmp_path):
+    discovery = ContactPageDiscovery(cache_path=tmp_path / "cache.json", negative_ttl_hours=1)
+    assert discover(discovery, "down.test")["contact_url"] is None
+    assert discover(discovery, "down.test")["cached"]
+
+    discovery._cache["down.test"]["resolved_at"] -= 2 * 3600
+    assert not discover(discovery, "down.test")["cached"]
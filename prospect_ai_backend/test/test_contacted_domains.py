@@ -0,0 +1,48 @@
+import time
+
+from src.contacted_domains import BloomFilter, ContactedDomainIndex, canonical_domain
+
+
+def test_url_variants_share_one_domain():
+    variants = ['https://www.Acme.com/contact', 'http://acme.com', 'acme.com/', 'https://acme.com:443/about-us?x=1']
+    assert {canonical_domain(url) for url in variants} == {'acme.com'}
+
+
+def test_contacted_domains_are_skipped_within_the_cooldown(tmp_path):
+    index = ContactedDomainIndex(tmp_path / 'contacted.sqlite3', cooldown_days=30, expected_domains=1000)
+    index.record('https://www.acme.com/contact', 'success', 'spring')
+    index.record('https://nothing-sent.com/contact', 'failed')  # not a contact
+    index.save()
+
+    index = ContactedDomainIndex(tmp_path / 'contacted.sqlite3', cooldown_days=30, expected_domains=1000)
+    keep, skipped = index.filter(['http://acme.com/quote', 'https://nothing-sent.com', 'https://new.com',
+                                  'https://www.new.com/contact'])
+    assert keep == ['https://nothing-sent.com', 'https://new.com']
+    assert {entry['website'] for entry in skipped} == {'http://acme.com/quote', 'https://www.new.com/contact'}
+
+    # Past the cooldown the domain may be contacted again
+    index.cooldown = 0
+    assert index.filter(['http://acme.com/quote'])[0] == ['http://acme.com/quote']
+
+
+def test_filter_file_is_rebuilt_when_behind_the_database(tmp_path):
+    index = ContactedDomainIndex(tmp_path / 'contacted.sqlite3', expected_domains=1000)
+    index.save()
+    index.record('https://acme.com', 'success')  # crash: the filter file was never saved again
+    assert BloomFilter.load(index.bloom_path).count == 0
+
+    index = ContactedDomainIndex(tmp_path / 'contacted.sqlite3', expected_domains=1000)
+    assert index.filter(['https://acme.com'])[0] == []
+    assert index.filter(['https://acme.com'])[1][0]['contacted_at'] <= time.time()
+
+
+def test_duplicates_across_chunks_are_caught_by_a_fixed_size_filter(tmp_path):
+    index = ContactedDomainIndex(tmp_path / 'contacted.sqlite3', expected_domains=1000)
+    seen = index.seen_filter()
+    size = len(seen.data)
+    assert index.filter(['https://acme.com', 'https://beta.com'], seen)[0] == ['https://acme.com', 'https://beta.com']
+    keep, skipped = index.filter(['https://www.acme.com/contact', 'https://gamma.com'], seen)
+
+    assert keep == ['https://gamma.com']
+    assert skipped[0]['reason'] == 'duplicate domain in this campaign'
+    assert len(seen.data) == size
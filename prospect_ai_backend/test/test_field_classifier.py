@@ -0,0 +1,47 @@
+import pytest
+
+from src.contact_form_automator import ContactFormAutomator
+from src.field_classifier import FieldClassifier
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    automator = ContactFormAutomator(driver=None)
+    return FieldClassifier(automator.form_selectors)
+
+
+def field(tag="input", label="", visible=True, **attrs):
+    return {"tag": tag, "attrs": attrs, "classes": attrs.get("class", "").split(),
+            "label": label, "visible": visible, "enabled": True}
+
+
+def test_classifies_by_attributes(classifier):
+    assert classifier.classify(field(type="email", name="your-email")) == "email"
+    assert classifier.classify(field(name="telephone")) == "phone"
+    assert classifier.classify(field(tag="textarea", name="your-message")) == "message"
+    assert classifier.classify(field(tag="select", name="billing_country")) == "country"
+
+
+def test_longest_keyword_wins(classifier):
+    assert classifier.classify(field(name="company_name")) == "company"
+    assert classifier.classify(field(name="first_name")) == "name"
+
+
+def test_label_text_is_a_fallback(classifier):
+    assert classifier.classify(field(name="input_7", label="Your Email *")) == "email"
+    assert classifier.classify(field(name="input_8")) is None
+
+
+def test_pick_fields_prefers_visible_elements(classifier):
+    hidden = field(name="email", visible=False)
+    shown = field(name="email_confirm")
+    picked = classifier.pick_fields(classifier.classify_fields([hidden, shown]))
+    assert picked["email"] is shown
+
+
+def test_label_keywords_match_whole_words(classifier):
+    project = field(tag="textarea", name="field_3", label="Tell us about your project")
+    assert "phone" not in [c[0] for c in classifier.candidates(project)]
+    assert "email" not in [c[0] for c in classifier.candidates(field(name="field_4", label="Mailing list"))]
+    assert classifier.classify(field(name="field_5", label="Telephone")) == "phone"
+    assert classifier.classify(field(tag="textarea", name="field_6", label="Comments")) == "message"
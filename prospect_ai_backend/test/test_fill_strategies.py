@@ -0,0 +1,49 @@
+import pytest
+
+from conftest import FakeDriver
+from src.contact_form_automator import ContactFormAutomator
+from src.fill_strategies import (IN_PAGE_FILL_SCRIPT, ChunkedFillStrategy, FillStrategy, InPageFillStrategy,
+                                 PerCharacterFillStrategy, get_fill_strategy)
+
+
+def test_chunked_strategy_sends_value_in_chunks(fake_driver, fake_element):
+    fake_element.value = "old"
+    ChunkedFillStrategy(chunk_size=4).fill(fake_driver, fake_element, "Jane Doe", "name", "input")
+    assert fake_element.keys == ["Jane", " Doe"]
+    assert fake_element.value == "Jane Doe"
+    assert fake_driver.scripts == []
+
+
+def test_in_page_strategy_fills_in_one_script_call(fake_element):
+    driver = FakeDriver(True)
+    InPageFillStrategy(emulate_keystrokes=True).fill(driver, fake_element, "Hello", "message", "textarea")
+    assert driver.scripts == [(IN_PAGE_FILL_SCRIPT, (fake_element, "Hello", True))]
+    assert fake_element.keys == []
+
+
+def test_strategy_is_chosen_from_config():
+    strategy = get_fill_strategy("chunked", {"chunk_size": 16})
+    assert isinstance(strategy, ChunkedFillStrategy) and strategy.describe() == {"name": "chunked", "chunk_size": 16}
+    assert isinstance(get_fill_strategy("in_page"), InPageFillStrategy)
+    assert isinstance(get_fill_strategy(None), PerCharacterFillStrategy)
+    with pytest.raises(ValueError):
+        get_fill_strategy("chunked", {"chunk_size": 0})
+
+
+def test_unknown_strategy_falls_back_to_per_character():
+    assert isinstance(get_fill_strategy("telepathic", {"speed": 11}), PerCharacterFillStrategy)
+
+
+def test_base_strategy_is_abstract():
+    with pytest.raises(TypeError):
+        FillStrategy()
+
+
+def test_strategy_is_recorded_in_results():
+    class UnreachableDriver(FakeDriver):
+        def get(self, url):
+            raise Exception("net::ERR_NAME_NOT_RESOLVED")
+
+    automator = ContactFormAutomator(driver=UnreachableDriver(), fill_strategy=ChunkedFillStrategy())
+    result = automator.submit_contact_form("https://acme.test/contact", {"name": "Jane"})
+    assert not result["success"] and result["fill_strategy"] == "chunked"
@@ -0,0 +1,47 @@
+import httpx
+
+from src.fixture_farm import SITE_KINDS, FixtureFarm, build_corpus
+from src.form_benchmark import BENCHMARK_CONTACT_DATA, find_regressions, score_site
+from src.site_probe import SiteProbe
+
+
+def test_probe_sees_farm_pages_as_ground_truth_says():
+    corpus = build_corpus(seed=3)
+    assert {spec['kind'] for spec in corpus} == set(SITE_KINDS)
+
+    with FixtureFarm(corpus) as farm:
+        results = SiteProbe(concurrency=4).run([farm.url_for(spec) for spec in corpus])
+        for spec in corpus:
+            assert results[farm.url_for(spec)]['status'] == spec['expected']['probe_status'], spec['kind']
+
+
+def test_farm_enforces_required_fields_and_records_posts():
+    corpus = build_corpus(len(SITE_KINDS))
+    classic = next(spec for spec in corpus if spec['submit_mode'] == 'classic')
+    wpcf7 = next(spec for spec in corpus if spec['kind'] == 'wpcf7')
+
+    with FixtureFarm(corpus) as farm, httpx.Client(base_url=farm.base_url) as client:
+        complete = {field['name']: 'x' for field in classic['fields']}
+        response = client.post(f"/site/{classic['id']}/submit", data=complete)
+        assert response.status_code == 303
+        assert farm.last_submission(classic['id']) == complete
+
+        response = client.post(f"/site/{wpcf7['id']}/submit", data={'your-email': 'a@b.c'})
+        assert response.status_code == 400 and not response.json()['ok']
+        assert 'Your name' in response.json()['message']
+
+
+def test_scoring_and_regressions():
+    spec = build_corpus(1)[0]
+    submission = {field['name']: BENCHMARK_CONTACT_DATA[field['type']] for field in spec['fields']}
+    result = {'success': True, 'form_type': spec['form_type']}
+    row = score_site(spec, result, submission, BENCHMARK_CONTACT_DATA)
+    assert row['outcome_ok'] and row['fields_ok'] and row['form_type_ok']
+    # Claimed success without anything reaching the server is wrong
+    assert not score_site(spec, result, None, BENCHMARK_CONTACT_DATA)['outcome_ok']
+
+    baseline = {'sites_per_hour': 1000, 'accuracy': {'fields': 1.0}, 'latency': {'total': {'p90': 1.0}}}
+    report = {'sites_per_hour': 950, 'accuracy': {'fields': 1.0}, 'latency': {'total': {'p90': 1.05}}}
+    assert find_regressions(report, baseline, tolerance=0.1) == []
+    report = {'sites_per_hour': 800, 'accuracy': {'fields': 0.9}, 'latency': {'total': {'p90': 2.0}}}
+    assert len(find_regressions(report, baseline, tolerance=0.1)) == 3
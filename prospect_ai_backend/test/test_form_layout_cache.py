@@ -0,0 +1,47 @@
+from src.form_layout_cache import FormLayoutCache, layout_fingerprint
+
+SIGNATURE = "input:text:name:|input:email:email:|textarea::message:"
+
+
+class ReplayDriver:
+    """Answers the replay script with a fixed form signature and element per path."""
+
+    def __init__(self, signature, missing=()):
+        self.signature = signature
+        self.missing = set(missing)
+
+    def execute_script(self, script, form_path, paths, *args):
+        return {"signature": self.signature,
+                "elements": [None if path in self.missing else f"<{path}>" for path in paths]}
+
+
+def make_layout():
+    return {
+        "fingerprint": layout_fingerprint(SIGNATURE),
+        "form_path": "#contact",
+        "fields": {"name": {"path": "#contact > input:nth-of-type(1)", "tag": "input"},
+                   "message": {"path": "#contact > textarea:nth-of-type(1)", "tag": "textarea"}},
+        "submit_path": "#contact > button:nth-of-type(1)",
+        "required_fields": ["name"],
+    }
+
+
+def test_layouts_persist_per_domain(tmp_path):
+    cache = FormLayoutCache(tmp_path / "layouts.json")
+    cache.store("https://www.acme.test/contact", make_layout())
+
+    reloaded = FormLayoutCache(tmp_path / "layouts.json")
+    assert reloaded.layouts_for("https://acme.test/other")[0]["form_path"] == "#contact"
+    assert reloaded.layouts_for("https://other.test/contact") == []
+
+
+def test_replay_requires_matching_fingerprint_and_elements(tmp_path):
+    cache = FormLayoutCache(tmp_path / "layouts.json")
+    layout = make_layout()
+
+    found = cache.replay(ReplayDriver(SIGNATURE), layout)
+    assert found["fields"]["message"] == "<#contact > textarea:nth-of-type(1)>"
+    assert found["submit_element"] == "<#contact > button:nth-of-type(1)>"
+
+    assert cache.replay(ReplayDriver(SIGNATURE + "|input:tel:phone:"), layout) is None
+    assert cache.replay(ReplayDriver(SIGNATURE, missing=[layout["submit_path"]]), layout) is None
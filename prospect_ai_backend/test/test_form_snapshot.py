@@ -0,0 +1,54 @@
+from src.form_snapshot import FormSnapshot, compile_selector
+
+
+def matches(selector, record, snapshot):
+    return compile_selector(selector)(record, snapshot)
+
+
+def make_snapshot():
+    return FormSnapshot({
+        "containers": [
+            {"ref": 0, "tag": "form", "attrs": {"action": "/contact-us"}, "classes": ["wpcf7-form"],
+             "ancestor_classes": ["gform_wrapper"], "input_count": 2},
+        ],
+        "fields": [
+            {"ref": 1, "tag": "input", "attrs": {"name": "Your-Name", "type": "text"}, "classes": [],
+             "containers": [0], "visible": True, "enabled": True},
+            {"ref": 2, "tag": "input", "attrs": {"id": "email", "type": "email"}, "classes": [],
+             "containers": [0], "visible": True, "enabled": True},
+        ],
+        "buttons": [
+            {"ref": 3, "tag": "button", "attrs": {"type": "submit"}, "text": "Send Message", "classes": [],
+             "containers": [0], "visible": True, "enabled": True},
+        ],
+    })
+
+
+def test_attribute_selectors_respect_case_flag():
+    snap = make_snapshot()
+    name_field = snap.fields[0]
+    assert matches('input[name*="name" i]', name_field, snap)
+    assert not matches('input[name*="name"]', name_field, snap)
+    assert matches('#email', snap.fields[1], snap)
+
+
+def test_form_level_selectors():
+    snap = make_snapshot()
+    form = snap.containers[0]
+    assert matches('form[action*="contact"]', form, snap)
+    assert matches('form:has(input[type="email"])', form, snap)
+    assert matches('.gform_wrapper form', form, snap)
+    assert matches('.wpcf7-form', form, snap)
+    assert not matches('form:has(textarea)', form, snap)
+
+
+def test_contains_selector_matches_button_text():
+    snap = make_snapshot()
+    button = snap.buttons[0]
+    assert matches('button:contains("Send")', button, snap)
+    assert not matches('button:contains("Quote")', button, snap)
+
+
+def test_unsupported_selector_never_matches():
+    snap = make_snapshot()
+    assert not matches('input > span', snap.fields[0], snap)
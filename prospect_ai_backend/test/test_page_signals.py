@@ -0,0 +1,43 @@
+from src.page_signals import ERROR_KEYWORDS, FORM_TYPE_KEYWORDS, SUCCESS_KEYWORDS, PageSignalMatcher, submission_verdict
+
+
+def naive_scan(text):
+    text = text.lower()
+    return {
+        "form_types": [name for name, table in FORM_TYPE_KEYWORDS.items() if any(k in text for k in table)],
+        "success": [k for k in SUCCESS_KEYWORDS if k in text],
+        "errors": [k for k in ERROR_KEYWORDS if k in text],
+    }
+
+
+def test_scan_matches_substring_checks():
+    matcher = PageSignalMatcher()
+    samples = [
+        "Quote Request Received - we will contact you soon",
+        "Thank you for contacting ACME. Contact us again any time.",
+        "This field is required. Please try again.",
+        "Get in touch\nSend message",
+        "",
+    ]
+    for text in samples:
+        assert matcher.scan(text) == naive_scan(text)
+
+
+def test_form_type_follows_table_order():
+    matcher = PageSignalMatcher()
+    assert matcher.form_type(matcher.scan("RFQ form - or contact us")) == "contact_us"
+    assert matcher.form_type(matcher.scan("Submit an RFQ")) == "request_quote"
+    assert matcher.form_type(matcher.scan("About our company")) == "unknown"
+
+
+def test_submission_verdict_from_evidence():
+    matcher = PageSignalMatcher()
+    post_ok = {"method": "POST", "url": "/wp-json/contact", "status": 200, "t": 1}
+    post_failed = {"method": "POST", "url": "/wp-json/contact", "status": 422, "t": 1}
+
+    verdict = submission_verdict({"responses": [post_ok], "added_text": ["Thank you! We will contact you soon."]}, matcher)
+    assert verdict["success"] and verdict["decided_by"] == "confirmation_text"
+    assert not submission_verdict({"responses": [post_failed], "added_text": []}, matcher)["success"]
+    assert submission_verdict({"responses": [post_ok], "added_text": ["This field is required"]}, matcher)["decided_by"] == "error_text"
+    assert submission_verdict({"responses": [post_ok], "added_text": []}, matcher)["decided_by"] == "http_status"
+    assert submission_verdict({"responses": [], "added_text": [], "url_changed": True, "navigation_status": 200}, matcher) is None
@@ -0,0 +1,56 @@
+from conftest import FakeDriver
+from src.phase_timer import PhaseTimer, PhaseTimingStats, percentile, summarize_phase_timings
+
+
+def test_round_trips_go_to_the_innermost_phase():
+    driver = FakeDriver()
+    timer = PhaseTimer()
+    timer.count_round_trips(driver)
+
+    with timer.phase('submit'):
+        driver.execute('executeScript')
+        with timer.phase('verify'):
+            driver.execute('executeScript')
+            driver.execute('getCurrentUrl')
+    driver.execute('deleteAllCookies')
+
+    phases = timer.breakdown()
+    assert driver.commands == ['executeScript', 'executeScript', 'getCurrentUrl', 'deleteAllCookies']
+    assert phases['submit']['round_trips'] == 1
+    assert phases['verify']['round_trips'] == 2
+    assert phases['other']['round_trips'] == 1
+    assert phases['total']['round_trips'] == 4
+    assert phases['submit']['seconds'] + phases['verify']['seconds'] <= phases['total']['seconds'] + 0.001
+
+
+def test_driver_is_wrapped_once_and_charges_the_latest_timer():
+    driver = FakeDriver()
+    old, new = PhaseTimer(), PhaseTimer()
+    old.count_round_trips(driver)
+    new.count_round_trips(driver)
+    new.count_round_trips(driver)
+
+    driver.execute('getCurrentUrl')
+    assert driver.commands == ['getCurrentUrl']
+    assert new.breakdown()['total']['round_trips'] == 1
+    assert old.breakdown()['total']['round_trips'] == 0
+
+
+def test_summary_percentiles_per_phase():
+    results = [{'phase_timings': {'navigate': {'seconds': float(n), 'round_trips': 2}}} for n in range(1, 11)]
+    results.append({'success': False, 'skipped': True})
+
+    summary = summarize_phase_timings(results)
+    assert summary['navigate'] == {'p50': 5.0, 'p90': 9.0, 'p99': 10.0, 'mean_round_trips': 2.0, 'sites': 10}
+    assert percentile([], 90) == 0.0
+
+
+def test_timing_sample_is_bounded():
+    stats = PhaseTimingStats(max_samples=100, seed=1)
+    for n in range(10_000):
+        stats.add({'fill': {'seconds': n / 10_000, 'round_trips': 4}})
+
+    summary = stats.summary()['fill']
+    assert len(stats._seconds['fill']) == 100
+    assert summary['sites'] == 10_000 and summary['mean_round_trips'] == 4.0
+    assert 0.3 < summary['p50'] < 0.7
@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+from src.rate_limiter import SubmissionRateLimiter
+
+
+def test_burst_then_refill_rate():
+    limiter = SubmissionRateLimiter(max_submissions_per_hour=36000, burst=2)  # 10 per second
+    assert limiter.reserve('https://a.example/contact') == 0
+    assert limiter.reserve('https://b.example/contact') == 0
+    assert 0 < limiter.reserve('https://c.example/contact') <= 0.1
+    assert limiter.submissions == 2
+
+
+def test_domain_bucket_blocks_only_its_domain_and_takes_nothing_when_waiting():
+    limiter = SubmissionRateLimiter(max_submissions_per_hour=20, per_domain_per_hour=1, burst=2)
+    assert limiter.reserve('https://www.a.example/contact') == 0
+    # Same domain (www. ignored): about an hour away, and the global token is not spent
+    assert limiter.reserve('https://a.example/quote') > 3000
+    assert limiter.reserve('https://b.example/contact') == 0
+    assert limiter.reserve('https://c.example/contact') > 0
+
+
+def test_concurrent_pages_share_the_spacing():
+    limiter = SubmissionRateLimiter(max_submissions_per_hour=0, delay_between_submissions=0.1)
+
+    async def submit_three():
+        return await asyncio.gather(*(limiter.acquire_async(f"https://site{i}.example") for i in range(3)))
+
+    started = time.monotonic()
+    asyncio.run(submit_three())
+    assert time.monotonic() - started >= 0.19
+    assert limiter.submissions == 3 and limiter.total_wait > 0
+
+
+def test_hourly_cap_holds_from_the_first_minute():
+    limiter = SubmissionRateLimiter(max_submissions_per_hour=3)
+    assert [limiter.reserve(f"https://site{i}.example") for i in range(3)] == [0, 0, 0]
+    # A fresh (or long idle) limiter has no banked tokens beyond the cap
+    assert limiter.reserve('https://site3.example') > 3590
+    assert limiter.submissions == 3
+
+
+def test_long_waits_are_reported_before_a_page_is_loaded():
+    limiter = SubmissionRateLimiter(max_submissions_per_hour=1, per_domain_per_hour=1, prepare_lead=30)
+    assert limiter.domain_wait('https://a.example') == 0 and limiter.preparation_wait() == 0
+    limiter.reserve('https://a.example/contact')
+    assert limiter.domain_wait('https://www.a.example/quote') > 3500
+    assert limiter.domain_wait('https://b.example') == 0
+    assert 3500 < limiter.preparation_wait() < 3600 - 29
@@ -0,0 +1,48 @@
+import json
+
+from src.result_sink import ResultSink, read_results
+
+
+def test_results_are_appended_per_status_and_exported(tmp_path):
+    with ResultSink(tmp_path, fsync_every=2, export_json=True) as sink:
+        sink.record({'website': 'https://a.example', 'success': True})
+        sink.record({'website': 'https://b.example', 'success': False, 'error': 'Submit button not found'})
+        sink.record({'website': 'https://c.example', 'success': False, 'skipped': True, 'skip_reason': 'no_form'})
+        sink.record({'website': 'https://d.example', 'success': True})
+        # Every record is on disk before close()
+        assert [r['website'] for r in read_results(sink.path_for('success'))] == ['https://a.example', 'https://d.example']
+
+    assert sink.successful == 2 and sink.counts == {'success': 2, 'failed': 1, 'skipped': 1}
+    assert [r['website'] for r in json.loads((tmp_path / 'contact_submissions_success.json').read_text())] == \
+        ['https://a.example', 'https://d.example']
+    assert json.loads((tmp_path / 'contact_submissions_skipped.json').read_text())[0]['skip_reason'] == 'no_form'
+    assert not (tmp_path / 'contact_submissions_deferred.json').exists()
+
+
+def test_legacy_arrays_are_migrated_and_torn_lines_skipped(tmp_path):
+    (tmp_path / 'contact_submissions_failed.json').write_text(json.dumps([{'website': 'https://old.example'}]))
+    with ResultSink(tmp_path) as sink:
+        sink.record({'website': 'https://new.example', 'success': False})
+    with open(sink.path_for('failed'), 'a', encoding='utf-8') as f:
+        f.write('{"website": "https://torn.exa')
+
+    assert [r['website'] for r in read_results(sink.path_for('failed'))] == ['https://old.example', 'https://new.example']
+
+
+def test_summary_counters_are_kept_instead_of_results(tmp_path):
+    timings = {'navigate': {'seconds': 1.0, 'round_trips': 3}}
+    with ResultSink(tmp_path) as sink:
+        sink.record({'website': 'https://a.example', 'success': True, 'form_type': 'simple', 'attempts': 2,
+                     'page_load': {'page_load_time': 1.5, 'transferred_bytes': 100, 'estimated_bytes_saved': 40},
+                     'phase_timings': timings})
+        sink.record({'website': 'https://b.example', 'success': False, 'form_type': 'simple',
+                     'page_load': {'page_load_time': 0.5, 'estimated_bytes_saved': 10}, 'phase_timings': timings})
+        sink.record({'website': 'https://c.example', 'success': False, 'deferred': True, 'form_type': 'captcha'})
+
+    assert not hasattr(sink, 'results')
+    assert sink.counts == {'success': 1, 'failed': 1, 'deferred': 1}
+    assert sink.form_types == {'simple': {'total': 2, 'successful': 1}}
+    assert sink.retried_attempts == 1
+    assert sink.page_loads == {'sites': 2, 'page_load_time': 2.0, 'transferred_bytes': 100,
+                               'estimated_bytes_saved': 50}
+    assert sink.phase_timings.summary()['navigate']['sites'] == 2
@@ -0,0 +1,97 @@
+import random
+import threading
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from conftest import FakeDriver, FakeElement
+from src.contact_form_automator import ContactFormAutomator
+from src.retry_queue import PERMANENT, TRANSIENT, RetryPolicy, RetryQueue, classify_failure
+
+
+def test_classification_and_backoff():
+    assert classify_failure({'error': 'Message: timeout: Timed out receiving message from renderer'}) == TRANSIENT
+    assert classify_failure({'error': 'JavaScript click failed: element click intercepted'}) == TRANSIENT
+    assert classify_failure({'error': 'No contact form found'}) == PERMANENT
+    assert classify_failure({'error': "Missing required fields: ['phone']"}) == PERMANENT
+    assert classify_failure({'error': 'Form shows an error'}) == PERMANENT
+
+    policy = RetryPolicy(max_retries=2, base_delay=10, max_delay=25, rng=random.Random(1))
+    assert 5 <= policy.backoff(0) <= 10 and 10 <= policy.backoff(1) <= 20 and 12.5 <= policy.backoff(5) <= 25
+    timeout = {'success': False, 'error': 'page load timeout'}
+    assert policy.delay_for(timeout, 1) is not None and timeout['failure_kind'] == TRANSIENT
+    assert policy.delay_for(timeout, 2) is None
+    assert policy.delay_for({'success': True}, 0) is None
+
+
+def test_failure_after_the_submit_click_is_not_retried():
+    class HangingButton(FakeElement):
+        def click(self):
+            raise TimeoutException("timeout: Timed out receiving message from renderer")
+
+    automator = ContactFormAutomator(driver=FakeDriver({'readyState': 'complete', 'pending': 0, 'quietFor': 1.0}),
+                                     wait_policy_config={'poll_frequency': 0.01})
+    with automator.phase_timer.phase('submit'):
+        result = automator._submit_form(submit_button=HangingButton())
+    result.update(automator._result_metadata())
+
+    assert 'timeout' in result['error'].lower()
+    assert result['submit_clicked'] and result['last_phase'] == 'submit'
+    assert RetryPolicy(max_retries=3).delay_for(result, 0) is None
+    assert result['failure_kind'] == PERMANENT
+
+    before_click = {'success': False, 'error': result['error'], 'last_phase': 'navigate', 'submit_clicked': False}
+    assert RetryPolicy(max_retries=3).delay_for(before_click, 0) is not None
+
+
+def test_retries_interleave_with_fresh_targets():
+    targets = RetryQueue(['a', 'b', 'c'], RetryPolicy(max_retries=1, base_delay=0.05, max_delay=0.05))
+    order = []
+    outcomes = {('a', 0): {'success': False, 'error': 'timeout'}}
+
+    def work():
+        while True:
+            target = targets.next_target()
+            if target is None:
+                return
+            i, website_url, attempt = target
+            order.append((website_url, attempt))
+            targets.report(i, website_url, attempt, outcomes.get((website_url, attempt), {'success': True}))
+
+    worker = threading.Thread(target=work)
+    worker.start()
+    worker.join(timeout=5)
+    # The retry of 'a' waits behind the fresh targets instead of blocking them
+    assert order == [('a', 0), ('b', 0), ('c', 0), ('a', 1)]
+    assert targets.retries == 1
+
+
+def test_slow_target_source_does_not_hold_up_due_retries():
+    release = threading.Event()
+
+    def targets():
+        yield 'a'
+        release.wait(5)
+        yield 'b'
+
+    queue = RetryQueue(targets(), RetryPolicy(max_retries=1, base_delay=0.01, max_delay=0.01))
+    i, website_url, attempt = queue.next_target()
+    queue.report(i, website_url, attempt, {'success': False, 'error': 'timeout'})
+    # The producer is blocked inside the generator; the retry is still handed out
+    assert queue.next_target() == (0, 'a', 1)
+    release.set()
+    queue.report(0, 'a', 1, {'success': True})
+    assert queue.next_target() == (1, 'b', 0)
+    queue.report(1, 'b', 0, {'success': True})
+    assert queue.next_target() is None
+
+
+def test_target_source_errors_reach_the_workers():
+    def targets():
+        yield 'a'
+        raise ValueError("Targets CSV needs one of the columns ['website']")
+
+    queue = RetryQueue(targets(), RetryPolicy(max_retries=0))
+    queue.report(*queue.next_target(), {'success': True})
+    with pytest.raises(ValueError):
+        queue.next_target()
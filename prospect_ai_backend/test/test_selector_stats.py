@@ -0,0 +1,62 @@
+from src.contact_form_automator import ContactFormAutomator
+from src.form_snapshot import FormSnapshot
+from src.selector_stats import SelectorStats
+
+
+def test_hits_persist_across_runs(tmp_path):
+    stats = SelectorStats(tmp_path / "stats.json")
+    stats.record("email", "#email")
+    stats.record("email", "#email")
+    stats.record("email", 'input[name*="email" i]')
+    stats.record("email", None)
+    stats.save()
+
+    reloaded = SelectorStats(tmp_path / "stats.json")
+    table = reloaded.hit_rates()["email"]
+    assert table["attempts"] == 4 and table["miss_rate"] == 0.25
+    assert table["selectors"][0] == {"selector": "#email", "hits": 2, "hit_rate": 0.5}
+
+
+def test_selectors_are_evaluated_most_hit_first():
+    stats = SelectorStats()
+    for _ in range(5):
+        stats.record("submit", 'button:contains("Send")')
+    stats.record("submit", ".submit-btn")
+    selectors = ContactFormAutomator(driver=None).form_selectors["submit"]
+
+    order = stats.ordered("submit", selectors)
+    assert [selector for _, selector in order[:3]] == ['button:contains("Send")', ".submit-btn", 'button[type="submit"]']
+    assert order[0] == (selectors.index('button:contains("Send")'), 'button:contains("Send")')
+
+    automator = ContactFormAutomator(driver=None, selector_stats=stats)
+    assert automator.form_selectors["submit"] == selectors
+    assert automator._submit_order == order
+    email_rules = [rule.selector for rule in automator.field_classifier._rules if rule.field_type == "email"]
+    assert email_rules == automator.form_selectors["email"]
+
+
+def test_reordering_never_changes_which_element_wins(monkeypatch):
+    import src.contact_form_automator as automator_module
+
+    stats = SelectorStats()
+    for _ in range(5):
+        stats.record("submit", 'button:contains("Send")')
+        stats.record("email", 'input[placeholder*="email" i]')
+    snapshot = FormSnapshot({"buttons": [
+        {"ref": 1, "tag": "button", "attrs": {}, "text": "Send", "visible": True, "enabled": True},
+        {"ref": 2, "tag": "button", "attrs": {"type": "submit"}, "text": "Go", "visible": True, "enabled": True},
+    ]})
+    tried = []
+    compile_selector = automator_module.compile_selector
+    monkeypatch.setattr(automator_module, "compile_selector",
+                        lambda selector: tried.append(selector) or compile_selector(selector))
+
+    automator = ContactFormAutomator(driver=None, selector_stats=stats)
+    selector, button = automator._match_submit_button(snapshot)
+    # The most-hit selector ran first, but the better-ranked type="submit" button still wins
+    assert tried[0] == 'button:contains("Send")'
+    assert (selector, button["ref"]) == ('button[type="submit"]', 2)
+
+    field = {"tag": "input", "attrs": {"name": "email", "placeholder": "Your email"}}
+    plain = ContactFormAutomator(driver=None).field_classifier
+    assert automator.field_classifier.candidates(field) == plain.candidates(field)
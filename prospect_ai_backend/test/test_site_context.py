@@ -0,0 +1,28 @@
+from src.site_context import CHARS_PER_TOKEN, build_site_context
+
+
+RAW = {
+    'title': 'Acme Pumps',
+    'description': 'Industrial pumps and seals for the chemical industry.',
+    'organizations': [{'name': 'Acme Pumps GmbH', 'slogan': '', 'description': 'Family-owned since 1950.',
+                       'knowsAbout': ['pumps', 'mechanical seals']}],
+    'headings': ['Pumps that last', 'Our products'],
+    'sections': {'products': 'Centrifugal pumps ' * 200, 'about': 'We build pumps in Bavaria.'},
+}
+
+
+def test_context_is_ranked_and_within_budget():
+    context = build_site_context(RAW, token_budget=100)
+    lines = context.split('\n')
+    assert lines[0] == 'Title: Acme Pumps'
+    assert lines[2].startswith('Organization: Acme Pumps GmbH — Family-owned since 1950. — Known for: pumps')
+    # About ranks above products; the long products section is cut to fit
+    assert lines[4] == 'About: We build pumps in Bavaria.'
+    assert lines[5].startswith('Products: Centrifugal') and lines[5].endswith('…')
+    assert len(context) <= 100 * CHARS_PER_TOKEN + 1
+
+
+def test_falls_back_to_page_text_when_nothing_is_extracted():
+    empty = {'title': '', 'description': '', 'organizations': [], 'headings': [], 'sections': {}}
+    assert build_site_context(empty, 10, fallback_text='Welcome   to\nAcme') == 'Welcome to Acme'
+    assert len(build_site_context(None, 10, fallback_text='word ' * 100)) <= 10 * CHARS_PER_TOKEN + 1
@@ -0,0 +1,75 @@
+import asyncio
+
+import httpx
+
+from src.site_probe import SiteProbe
+
+CONTACT_PAGE = """
+<html><body>
+  <form role="search"><input type="search" name="q"></form>
+  <form action="/contact"><input name="name"><input type="email" name="email"><textarea name="message"></textarea></form>
+</body></html>
+"""
+LOGIN_PAGE = '<form><input name="user"><input type="password" name="pass"></form>'
+CAPTCHA_PAGE = CONTACT_PAGE + '<div class="g-recaptcha" data-sitekey="abc"></div>'
+EMBEDDED_PAGE = '<div id="hubspot"></div><script src="//js.hsforms.net/forms/v2.js"></script>'
+RECAPTCHA_V3_PAGE = CONTACT_PAGE + '<script src="https://www.google.com/recaptcha/api.js?render=abc"></script>'
+INVISIBLE_PAGE = CONTACT_PAGE + '<button class="g-recaptcha" data-sitekey="abc" data-callback="submit">Send</button>'
+
+
+def test_classify_html():
+    assert SiteProbe.classify_html(CONTACT_PAGE)["status"] == "form"
+    assert SiteProbe.classify_html(LOGIN_PAGE)["status"] == "login"
+    assert SiteProbe.classify_html(CAPTCHA_PAGE)["status"] == "captcha"
+    assert SiteProbe.classify_html(EMBEDDED_PAGE)["status"] == "form"
+    assert SiteProbe.classify_html('<form role="search"><input type="search"></form>')["status"] == "no_form"
+
+
+def test_only_visible_captcha_widgets_count():
+    assert SiteProbe.classify_html(RECAPTCHA_V3_PAGE)["status"] == "form"
+    assert SiteProbe.classify_html(INVISIBLE_PAGE)["status"] == "form"
+    assert SiteProbe.classify_html(CONTACT_PAGE + '<div class="h-captcha" data-sitekey="abc"></div>')["status"] == "captcha"
+    # CAPTCHA sites still go to the browser, which parks them in the deferral queue
+    assert not SiteProbe().should_skip({"status": "captcha"})
+
+
+def test_probe_statuses_over_http():
+    def handler(request):
+        if request.url.host == "gone.test":
+            return httpx.Response(404)
+        if request.url.host == "shielded.test":
+            return httpx.Response(int(request.url.path.strip("/")), text="Just a moment...")
+        if request.url.host == "moved.test":
+            return httpx.Response(301, headers={"Location": "https://parked.example/"})
+        if request.url.host == "parked.example":
+            return httpx.Response(200, text=CONTACT_PAGE)
+        return httpx.Response(200, text=CONTACT_PAGE)
+
+    async def run():
+        probe = SiteProbe()
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True) as client:
+            return {url: await probe.probe(client, url) for url in
+                    ("https://www.acme.test/contact", "https://gone.test/", "https://moved.test/",
+                     "https://shielded.test/403", "https://shielded.test/429", "https://shielded.test/503")}
+
+    results = asyncio.run(run())
+    probe = SiteProbe()
+    assert results["https://www.acme.test/contact"]["status"] == "form"
+    assert not probe.should_skip(results["https://www.acme.test/contact"])
+    assert results["https://gone.test/"]["status"] == "dead"
+    assert results["https://moved.test/"]["status"] == "redirect"
+    assert probe.should_skip(results["https://moved.test/"])
+
+    # Bot protection answers a real browser differently: not dead, left for the browser
+    for code in (403, 429, 503):
+        assert results[f"https://shielded.test/{code}"]["status"] == "inconclusive"
+        assert not probe.should_skip(results[f"https://shielded.test/{code}"])
+
+
+def test_pages_rendered_by_script_are_inconclusive():
+    spa = '<div id="root"></div><script src="/static/js/main.js"></script>'
+    injected = '<div id="slot"></div><script>document.getElementById("slot").innerHTML = "<form>";</script>'
+    bundles = ''.join(f'<script src="/chunk{i}.js"></script>' for i in range(8))
+    for html in (spa, injected, bundles):
+        assert SiteProbe.classify_html(html)["status"] == "inconclusive"
+    assert SiteProbe.classify_html('<p>About us</p><script src="/analytics.js"></script>')["status"] == "no_form"
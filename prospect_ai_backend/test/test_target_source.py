@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from src.target_source import TargetSource, check_targets_file, metadata_lines
+
+
+def test_csv_rows_carry_metadata_and_invalid_rows_are_skipped(tmp_path):
+    path = tmp_path / 'targets.csv'
+    path.write_text('Company,URL,Contact_Name\n'
+                    'Acme Pumps, https://acme.com/contact ,Jane Doe\n'
+                    'Broken,not a website,\n'
+                    'Beta,beta.io,\n')
+    source = TargetSource(['https://inline.example'], path)
+    targets = list(source)
+    assert [target['website'] for target in targets] == ['https://inline.example', 'https://acme.com/contact', 'https://beta.io']
+    assert targets[1]['metadata'] == {'company': 'Acme Pumps', 'contact_name': 'Jane Doe'}
+    assert source.read == 3 and source.invalid == 1
+    assert metadata_lines(targets[1]['metadata']) == ['Company: Acme Pumps', 'Contact Name: Jane Doe']
+
+
+def test_bare_domain_column_becomes_canonical_urls(tmp_path):
+    path = tmp_path / 'targets.csv'
+    path.write_text('company,domain\nAcme,Acme.COM\nBeta,WWW.Beta.io/Contact-Us\nGamma,HTTP://gamma.dev\n')
+    assert [target['website'] for target in TargetSource(targets_file=path)] == \
+        ['https://acme.com', 'https://www.beta.io/Contact-Us', 'http://gamma.dev']
+
+
+def test_jsonl_and_txt_are_streamed_in_chunks(tmp_path):
+    jsonl = tmp_path / 'targets.jsonl'
+    jsonl.write_text('\n'.join(json.dumps(row) for row in [
+        {'website': 'a.com', 'company': 'A'}, 'b.com', {'url': 'https://c.com', 'tier': 1}, ['bad']]) + '\n')
+    assert [target['metadata'] for target in TargetSource(targets_file=jsonl)] == [{'company': 'A'}, {}, {'tier': 1}]
+
+    txt = tmp_path / 'targets.txt'
+    txt.write_text('# prospects\n' + '\n'.join(f"site{i}.com" for i in range(10)) + '\n')
+    source = TargetSource(targets_file=txt)
+    chunks = source.chunks(4)
+    assert [target['website'] for target in next(chunks)] == [f"https://site{i}.com" for i in range(4)]
+    assert source.read == 4  # nothing past the first chunk has been read
+    assert [len(chunk) for chunk in chunks] == [4, 2]
+
+
+def test_targets_file_checks(tmp_path):
+    (tmp_path / 'no_column.csv').write_text('company,email\nAcme,a@acme.com\n')
+    with pytest.raises(ValueError):
+        check_targets_file(tmp_path / 'no_column.csv')
+    with pytest.raises(ValueError):
+        check_targets_file(tmp_path / 'targets.xlsx')
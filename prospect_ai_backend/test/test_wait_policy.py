@@ -0,0 +1,44 @@
+from conftest import FakeDriver
+from src.wait_policy import WaitPolicy
+
+
+def state(ready="complete", pending=0, started=0, last=0, quiet=1.0, url="https://a.test/contact"):
+    return {"readyState": ready, "pending": pending, "started": started, "lastMutation": last,
+            "quietFor": quiet, "url": url}
+
+
+def test_settle_returns_as_soon_as_page_is_idle():
+    driver = FakeDriver(states=[state(ready="loading"), state(pending=2), state()])
+    policy = WaitPolicy(driver, poll_frequency=0.01)
+    assert policy.wait_for_settle("navigate")
+    assert len(driver.scripts) == 3
+    assert policy.timings[0]["step"] == "navigate" and policy.timings[0]["met"]
+
+
+def test_timeout_is_recorded_without_raising():
+    policy = WaitPolicy(FakeDriver(states=[state(pending=1)]), timeouts={"verify": 0.05}, poll_frequency=0.01)
+    assert not policy.wait_for_settle("verify")
+    assert policy.timings[-1]["met"] is False
+
+
+def test_submission_waits_for_a_reaction_before_settling():
+    baseline = state(started=3, last=100)
+    driver = FakeDriver(states=[state(started=3, last=100), state(started=4, last=100, pending=1), state(started=4, last=150)])
+    policy = WaitPolicy(driver, poll_frequency=0.01)
+    assert policy.wait_for_submission(baseline)
+    assert len(driver.scripts) == 3
+
+
+def test_submission_accepts_url_change():
+    driver = FakeDriver(states=[state(url="https://a.test/thank-you")])
+    policy = WaitPolicy(driver, poll_frequency=0.01)
+    assert policy.wait_for_submission(state())
+
+
+def test_submission_returns_once_page_reacts_to_a_post_response():
+    baseline = dict(state(last=100), now=1000, lastWrite=0)
+    driver = FakeDriver(states=[dict(state(last=100, quiet=0.0, pending=1), lastWrite=0),
+                         dict(state(last=1250, quiet=0.0, pending=3), lastWrite=1200)])
+    policy = WaitPolicy(driver, poll_frequency=0.01)
+    assert policy.wait_for_submission(baseline)
+    assert len(driver.scripts) == 2